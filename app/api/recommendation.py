@@ -1,72 +1,280 @@
-# app/api/recommendation.py  (hanya fungsi create_recommendation di‑update)
-from typing import List, Dict
-from fastapi import APIRouter, HTTPException, status
-from math import pow
-
-from app.schemas.recommendation import RecommendationRequest, RecommendationResponse, RecommendationDay
-from app.schemas.exercise import ExerciseOut
-from app.services.csv_loader import load_exercises
-from app.services.exercise_filter import build_daily_pool
-from app.services.genetic_optimizer import run_ga_schedule
-from app.rules.rule_engine import FitnessRuleEngine, UserInput   # ← UserInput = Fact
+# app/api/recommendation.py
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.config import (
+    BATCH_MAX_ITEMS, DETERMINISTIC, GA_RETRY_AFTER, METRICS_ENABLED, RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+)
+from app.schemas.recommendation import (
+    RecommendationDay, RecommendationRequest, RecommendationResponse, RegenerateDayRequest,
+    SwapExerciseRequest,
+)
+from app.services import metrics, profiler
+from app.services.cache import LRUCache
+from app.services.csv_loader import dataset_version
+from app.services.executor import QueueFullError, ga_executor
+from app.services.recommender import (
+    CatalogChangedError, PlanEditError, PlanHeader, build_recommendation, build_recommendation_batch,
+    normalize_request, plan_day, plan_header, regenerate_day, regenerate_key, request_key,
+    request_seed, swap_exercise,
+)
+from app.services.serialization import (
+    PreEncodedJSONResponse, batch_json, day_event, end_event, error_event, response_json,
+)
 
 router = APIRouter()
 
-def _bmi_category(b: float) -> str:
-    return ("Underweight" if b < 18.5 else
-            "Normal"      if b < 25   else
-            "Overweight"  if b < 30   else
-            "Obese I"     if b < 35   else
-            "Obese II"    if b < 40   else
-            "Obese III")
+# Cache respons utuh; hanya dipakai di mode deterministik. Kunci =
+# (versi katalog, request_key): respons disimpan di bawah versi katalog
+# yang benar‑benar dipakai worker, dicari dengan versi file saat ini.
+_response_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
 
-@router.post("/", response_model=RecommendationResponse, status_code=status.HTTP_201_CREATED)
-def create_recommendation(req: RecommendationRequest):
-    # 1️⃣  Hitung BMI
-    bmi = round(req.weight_kg / pow(req.height_cm / 100, 2), 2)
-    bmi_cat = _bmi_category(bmi)
-
-    # 2️⃣  Jalankan Rule‑Based Engine (versi notebook)
-    engine = FitnessRuleEngine()
-    engine.reset()
-    engine.declare(UserInput(
-        gender=req.gender,
-        bmi=bmi,
-        injuries=req.injuries,
-        available_days=req.available_days,
-        preferred_body_part=req.preferred_body_part,
-    ))
-    engine.run()
-    split_type, schedule = engine.get_result()   # schedule dict {day_1: 'upper', ...}
-
-    # 3️⃣  Build exercise pool & GA
-    df = load_exercises()
-    daily_pool = build_daily_pool(
-        schedule=schedule,
-        df_all=df,
-        injuries=req.injuries,
-        preferred_equipment=req.preferred_equipment,
-    )
-    daywise = run_ga_schedule(
-        schedule,
-        daily_pool,
-        injured_body_parts=req.injuries,
-        preferred_body_parts=req.preferred_body_part,
-        bmi=bmi,
+
+def response_cache_info() -> dict:
+    return _response_cache.stats()
+
+
+metrics.register_collector("fitness_response_cache", response_cache_info)
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "Recommendation workers are busy, retry shortly",
+        headers={"Retry-After": str(GA_RETRY_AFTER)},
     )
-    if not daywise:
+
+
+async def _run_pipeline(req: RecommendationRequest, seed, response: Response,
+                        profile: Optional[Dict[str, Any]] = None) -> RecommendationResponse:
+    result = await _execute(response, build_recommendation, req, seed, profile=profile)
+    if result is None:
+        raise HTTPException(404, "Unable to build workout plan", headers=_profile_headers(response))
+    return result
+
+
+def _profile_headers(response: Response) -> Optional[Dict[str, str]]:
+    """X-Profile-Id yang dipasang `_execute`, dibawa ke respons error (profil tetap ditulis)."""
+    profile_id = response.headers.get("X-Profile-Id")
+    return {"X-Profile-Id": profile_id} if profile_id else None
+
+
+async def _execute(response: Response, fn: Callable[..., Any], *args,
+                   profile: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Jalankan `fn` di executor GA; catat metrics + header antrean/Server-Timing.
+    Dengan `profile`, `fn` dijalankan di bawah sampling profiler di worker.
+    """
+    if profile is not None:
+        fn, args = profiler.profiled, (profile, fn, *args)
+        response.headers["X-Profile-Id"] = profile["id"]
+    try:
+        result, queue_wait, traces = await ga_executor.run(fn, *args)
+    except QueueFullError:
+        raise _busy()
+    except PlanEditError as exc:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, str(exc), headers=_profile_headers(response))
+    response.headers["X-Queue-Wait-Ms"] = f"{queue_wait * 1000:.1f}"
+    if METRICS_ENABLED:
+        trace = traces[0] if traces else None
+        if trace is not None:
+            metrics.record(trace, queue_wait)
+        response.headers["Server-Timing"] = metrics.server_timing(trace, queue_wait)
+    return result
+
+
+def _send(result: Any, response: Response, status_code: int = status.HTTP_201_CREATED) -> PreEncodedJSONResponse:
+    """
+    Kirim JSON yang sudah dirakit worker (lihat `app.services.serialization`);
+    `response_model` tetap dipakai untuk dokumentasi OpenAPI saja.
+    """
+    out = PreEncodedJSONResponse(response_json(result), status_code=status_code)
+    out.headers.update(response.headers)      # X-Queue-Wait-Ms, Server-Timing
+    return out
+
+
+@router.post("/", response_model=RecommendationResponse, status_code=status.HTTP_201_CREATED)
+async def create_recommendation(req: RecommendationRequest, request: Request, response: Response):
+    profile = None
+    reason = profiler.should_profile(request.headers.get(profiler.PROFILE_HEADER))
+    if reason is not None:
+        profile = profiler.new_profile(reason, "recommendation", normalize_request(req).model_dump())
+
+    if not DETERMINISTIC:
+        return _send(await _run_pipeline(req, None, response, profile), response)
+
+    # Mode deterministik: request sama → rencana sama → boleh di‑cache.
+    # Request dengan token profil selalu menjalankan pipeline (dan tetap
+    # mengisi cache); request yang hanya tersampel dilayani cache tanpa profil.
+    req = normalize_request(req)
+    key = request_key(req)
+    cached = _response_cache.get((dataset_version(), key)) if reason != "token" else None
+    if cached is not None:
+        if METRICS_ENABLED:
+            metrics.record_cache_hit()
+            response.headers["Server-Timing"] = 'cache;desc="hit"'
+        return _send(cached, response)
+    result = await _run_pipeline(req, request_seed(key), response, profile)
+    if not result.budget_exhausted:       # hasil yang dipotong budget bergantung waktu → tidak di‑cache
+        _response_cache.put((result._catalog_version, key), result)
+    return _send(result, response)
+
+
+@router.post(
+    "/batch",
+    response_model=List[Optional[RecommendationResponse]],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_recommendation_batch(reqs: List[RecommendationRequest] = Body(...)):
+    """
+    Banyak profil sekaligus; hasil mengikuti urutan input (null jika
+    rencana tidak bisa disusun). Request identik hanya dihitung sekali,
+    dan sisanya dibagi rata ke worker GA.
+    """
+    if len(reqs) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            f"Batch is limited to {BATCH_MAX_ITEMS} requests",
+        )
+
+    if DETERMINISTIC:
+        reqs = [normalize_request(r) for r in reqs]
+        keys = [request_key(r) for r in reqs]
+    else:
+        keys = [r.model_dump_json() for r in reqs]
+
+    results: Dict[str, Optional[RecommendationResponse]] = {}
+    todo: Dict[str, RecommendationRequest] = {}
+    version = dataset_version() if DETERMINISTIC else ""
+    for key, req in zip(keys, reqs):
+        if key in results or key in todo:
+            continue
+        cached = _response_cache.get((version, key)) if DETERMINISTIC else None
+        if cached is not None:
+            results[key] = cached
+        else:
+            todo[key] = req
+
+    if todo:
+        todo_keys = list(todo)
+        n_chunks = max(1, min(len(todo_keys), ga_executor.workers))
+        chunks = [todo_keys[i::n_chunks] for i in range(n_chunks)]
+        try:
+            outputs = await asyncio.gather(*[
+                ga_executor.run(
+                    build_recommendation_batch,
+                    [todo[k] for k in chunk],
+                    [request_seed(k) if DETERMINISTIC else None for k in chunk],
+                )
+                for chunk in chunks
+            ])
+        except QueueFullError:
+            raise _busy()
+
+        for chunk, (chunk_results, queue_wait, traces) in zip(chunks, outputs):
+            for trace in traces:
+                metrics.record(trace, queue_wait)
+            for key, result in zip(chunk, chunk_results):
+                results[key] = result
+                if DETERMINISTIC and result is not None and not result.budget_exhausted:
+                    _response_cache.put((result._catalog_version, key), result)
+
+    return PreEncodedJSONResponse(batch_json([results[k] for k in keys]),
+                                  status_code=status.HTTP_201_CREATED)
+
+
+# ─── Streaming NDJSON: header dulu, lalu tiap hari begitu selesai ──
+@router.post(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}},
+                     "description": "Baris `header`, satu baris `day` per hari, lalu `end`"}},
+)
+async def stream_recommendation(req: RecommendationRequest, response: Response):
+    """
+    Rencana yang sama dengan `POST /` sebagai NDJSON: header (BMI, split,
+    jadwal) segera setelah rule engine, lalu satu event `day` (isi sama
+    dengan `days[i]`) untuk tiap hari begitu GA hari itu selesai — urutan
+    selesai, bukan urutan hari — dan `end` dengan `budget_exhausted`.
+    Tiap hari adalah task executor sendiri, jadi hari‑hari bisa berjalan
+    paralel di worker yang berbeda.
+    """
+    seed = None
+    if DETERMINISTIC:
+        req = normalize_request(req)
+        seed = request_seed(request_key(req))
+    header: Optional[PlanHeader] = await _execute(response, plan_header, req, seed)
+    if header is None:
         raise HTTPException(404, "Unable to build workout plan")
 
-    # 4️⃣  Format response
-    days_out: List[RecommendationDay] = []
-    for i, (dk, info) in enumerate(daywise.items(), 1):
-        ex_out = [ExerciseOut.model_validate(e) for e in info["exercises"]]
-        days_out.append(RecommendationDay(day=i, day_focus=info["focus"], exercises=ex_out))
-
-    return RecommendationResponse(
-        bmi=bmi,
-        bmi_category=bmi_cat,
-        split_type=split_type,
-        schedule=schedule,
-        days=days_out,
-    )
\ No newline at end of file
+    out = StreamingResponse(_stream_days(req, seed, header), media_type="application/x-ndjson")
+    out.headers.update(response.headers)          # X-Queue-Wait-Ms, Server-Timing tahap header
+    return out
+
+
+async def _stream_days(req: RecommendationRequest, seed: Optional[int],
+                       header: PlanHeader) -> AsyncIterator[bytes]:
+    yield header.event
+    for day in header.ready:                        # pustaka rencana: semua hari sudah jadi
+        yield day_event(day)
+    # paling banyak satu hari per worker: hari pertama selesai secepat satu GA,
+    # bukan berebut CPU dengan hari lain (terutama GA_WORKERS=0 / threadpool)
+    slots = asyncio.Semaphore(max(1, ga_executor.workers))
+
+    async def run_day(day: int, day_key: str):
+        async with slots:
+            return await _execute(Response(), plan_day, req, seed, header.schedule, day, day_key,
+                                  header.day_budget_ms, header.catalog_version)
+
+    tasks = [asyncio.ensure_future(run_day(day, day_key)) for day, day_key in header.days]
+    exhausted = False
+    try:
+        for done in asyncio.as_completed(tasks):
+            try:
+                day, day_exhausted = await done
+            except HTTPException as exc:            # antrean penuh
+                yield error_event(exc.detail)
+                return
+            except CatalogChangedError as exc:      # katalog berganti di tengah stream
+                yield error_event(str(exc))
+                return
+            if day is None:
+                yield error_event("Unable to build workout day")
+                continue
+            exhausted = exhausted or day_exhausted
+            yield day_event(day)
+        yield end_event(exhausted)
+    finally:
+        for task in tasks:                          # klien putus: batalkan hari yang belum jalan
+            task.cancel()
+
+
+# ─── Edit satu hari: reroll / ganti satu latihan ───────────────
+@router.post("/day/regenerate", response_model=RecommendationDay)
+async def regenerate_recommendation_day(req: RegenerateDayRequest, response: Response):
+    """
+    Susun ulang satu hari dari rencana yang sudah ada (fokus + latihan
+    saat ini); hari lain dan rule engine tidak dijalankan ulang.
+    """
+    req = normalize_request(req)
+    seed = request_seed(regenerate_key(req)) if DETERMINISTIC else None
+    result = await _execute(response, regenerate_day, req, seed)
+    if result is None:
+        raise HTTPException(404, "Unable to build workout day")
+    return _send(result, response, status.HTTP_200_OK)
+
+
+@router.post("/day/swap", response_model=RecommendationDay)
+async def swap_recommendation_exercise(req: SwapExerciseRequest, response: Response):
+    """
+    Ganti `exercise_id` dengan latihan terbaik dari pool hari itu; latihan
+    lain di hari tersebut tetap.
+    """
+    result = await _execute(response, swap_exercise, req)
+    if result is None:
+        raise HTTPException(404, "No replacement exercise available")
+    return _send(result, response, status.HTTP_200_OK)
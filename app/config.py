@@ -0,0 +1,120 @@
+"""
+Konfigurasi runtime, dibaca sekali dari environment variable.
+"""
+
+import os
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, "1" if default else "0").lower() in {"1", "true", "yes"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# ─── Katalog latihan ───────────────────────────────────────────
+CATALOG_PATH = os.getenv("CATALOG_PATH", "data/fitness_dataset.csv")
+# Artefak biner hasil `scripts.compile_catalog`; kosong = <CATALOG_PATH>.frscat.
+# Dipakai jika ada dan versinya cocok dengan CSV, selain itu CSV di‑parse.
+CATALOG_BINARY_PATH = os.getenv("CATALOG_BINARY_PATH", "")
+# Interval (detik) cek perubahan file katalog di background; 0 = tanpa reload
+CATALOG_RELOAD_INTERVAL = _env_int("CATALOG_RELOAD_INTERVAL", 30)
+# Segmen katalog bersama (`app.services.catalog_shared`): katalog + indeks +
+# fitur GA + fragmen JSON ditulis sekali per versi oleh proses loader, lalu
+# di‑mmap read‑only oleh tiap worker. Direktori kosong = /dev/shm (tmpfs).
+CATALOG_SHARED = _env_bool("CATALOG_SHARED", False)
+CATALOG_SHM_DIR = os.getenv("CATALOG_SHM_DIR", "")
+
+# ─── Cache pool harian (exercise_filter) ───────────────────────
+POOL_CACHE_SIZE = _env_int("POOL_CACHE_SIZE", 256)     # 0 = nonaktif
+
+# ─── Mode deterministik + cache respons ────────────────────────
+# Request dinormalisasi, seed GA diturunkan dari request, dan respons
+# utuh disimpan di LRU+TTL in‑process.
+DETERMINISTIC = _env_bool("RECOMMENDATION_DETERMINISTIC")
+RESPONSE_CACHE_SIZE = _env_int("RESPONSE_CACHE_SIZE", 1024)
+RESPONSE_CACHE_TTL = _env_int("RESPONSE_CACHE_TTL", 600)  # detik
+
+# ─── Executor GA (process pool) ────────────────────────────────
+# GA_WORKERS=0 → pipeline dijalankan di threadpool Starlette (tanpa proses).
+GA_WORKERS = _env_int("GA_WORKERS", os.cpu_count() or 1)
+GA_QUEUE_DEPTH = _env_int("GA_QUEUE_DEPTH", 64)         # antrean di luar worker aktif
+GA_RETRY_AFTER = _env_int("GA_RETRY_AFTER", 1)          # detik, header Retry-After saat penuh
+
+# ─── Paralelisme GA per hari (di dalam satu request) ───────────
+# "serial" | "threads" | "processes". Jika GA_WORKERS > 0 (pipeline sudah
+# di worker proses), "processes" otomatis dijalankan sebagai "threads" di
+# worker agar tidak membuat pool bersarang. Batas engine pygad di "threads":
+# run ber‑seed (seed request / RECOMMENDATION_DETERMINISTIC) memakai RNG
+# global sehingga tetap dijalankan satu per satu; run tanpa seed paralel.
+# Engine numpy tidak terkena batas ini.
+GA_DAY_PARALLELISM = os.getenv("GA_DAY_PARALLELISM", "serial").lower()
+GA_DAY_WORKERS = _env_int("GA_DAY_WORKERS", 5)
+
+# ─── Rule engine ───────────────────────────────────────────────
+# "table" = decision table terkompilasi, "experta" = engine asli (Rete).
+RULE_ENGINE = os.getenv("RULE_ENGINE", "table").lower()
+
+# ─── Endpoint batch ────────────────────────────────────────────
+BATCH_MAX_ITEMS = _env_int("BATCH_MAX_ITEMS", 1000)
+
+# ─── Engine GA ─────────────────────────────────────────────────
+# "pygad" (default) atau "numpy" (app.services.ga_engine, tanpa pygad).
+GA_ENGINE = os.getenv("GA_ENGINE", "pygad").lower()
+
+# ─── Profil GA & budget waktu ──────────────────────────────────
+# Profil default "fast" | "balanced" | "quality" (lihat GA_PROFILES di
+# genetic_optimizer); request boleh memilih profil lain lewat `ga_profile`.
+GA_PROFILE = os.getenv("GA_PROFILE", "balanced").lower()
+# Batas atas budget GA per request (ms) untuk seluruh deployment; 0 = hanya
+# budget profil / request yang berlaku.
+GA_TIME_BUDGET_MS = _env_int("GA_TIME_BUDGET_MS", 0)
+
+# ─── Optimizer per hari ────────────────────────────────────────
+# "ga" (default) atau "search" (branch‑and‑bound / local search).
+OPTIMIZER = os.getenv("OPTIMIZER", "ga").lower()
+# Exact search jika C(ukuran pool, jumlah gene) ≤ batas ini, selain itu local search
+EXACT_SEARCH_LIMIT = _env_int("EXACT_SEARCH_LIMIT", 10_000)
+# Memo skor fitness per run GA (kunci = gene terurut); matikan untuk perbandingan
+GA_FITNESS_MEMO = _env_bool("GA_FITNESS_MEMO", True)
+# Warm‑start: elite per kunci pool (jumlah kunci, 0 = nonaktif) dan porsi
+# populasi awal (%) yang diisi elite. Hanya untuk run tanpa seed.
+GA_WARM_START_SIZE = _env_int("GA_WARM_START_SIZE", 1024)
+GA_WARM_START_SHARE = _env_int("GA_WARM_START_SHARE", 25)
+
+# ─── Pustaka rencana (precompute offline) ──────────────────────
+# Hasil `scripts.build_plan_library`; kosong = <CATALOG_PATH tanpa ekstensi>.plans.
+# Dicari lebih dulu jika ada dan versi katalognya cocok; miss → GA live.
+PLAN_LIBRARY = _env_bool("PLAN_LIBRARY", True)
+PLAN_LIBRARY_PATH = os.getenv("PLAN_LIBRARY_PATH", "")
+
+# ─── Warm‑up saat startup ──────────────────────────────────────
+# Selain memuat katalog + indeks, jalankan satu rencana pemanasan (impor
+# engine GA, JIT cache pool, dsb.) sebelum /health melapor siap.
+WARMUP_PLAN = _env_bool("WARMUP_PLAN", True)
+
+# ─── Metrics ───────────────────────────────────────────────────
+# Timer per tahap, header Server-Timing, dan isi /metrics. Mati = tanpa biaya.
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", False)
+
+# ─── Profiling request (app.services.profiler) ─────────────────
+# Sebagian request (PROFILE_SAMPLE_RATE, 0..1) dan request dengan header
+# X-Profile-Token = PROFILE_TOKEN dijalankan di bawah sampling profiler.
+# Stack collapsed + parameter request ditulis ke PROFILE_DIR; paling banyak
+# PROFILE_MAX_FILES profil, yang terlama dihapus. Rate 0 + token kosong = mati.
+PROFILE_SAMPLE_RATE = _env_float("PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = _env_int("PROFILE_MAX_FILES", 50)
+PROFILE_INTERVAL_MS = _env_int("PROFILE_INTERVAL_MS", 5)
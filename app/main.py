@@ -1,13 +1,58 @@
+from contextlib import asynccontextmanager
+import asyncio
+import time
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.api.v1.api import api_router
+from app.services import metrics
+from app.services.exercise_catalog import catalog_store
+from app.services.executor import ga_executor
+from app.services.genetic_optimizer import shutdown_day_executor
+from app.services.recommender import warm_up
+
+
+# ─── Lifespan: start/stop worker GA + warm‑up ──────────────────
+# /health baru 200 setelah warm‑up selesai (katalog, indeks, satu rencana).
+_readiness = {"status": "starting", "warmup_ms": None, "error": None}
+
+
+async def _warm_up() -> None:
+    start = time.perf_counter()
+    try:
+        if ga_executor.workers == 0:
+            await run_in_threadpool(warm_up)    # pipeline jalan in‑process: katalog + reload di sini
+        else:
+            await ga_executor.ping()            # tiap worker menjalankan warm_up() di initializer
+    except Exception as exc:
+        _readiness.update(status="error", error=repr(exc))
+        print(f"[startup] warm‑up gagal: {exc!r}")
+        return
+    _readiness.update(status="ok", warmup_ms=round((time.perf_counter() - start) * 1000, 1))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ga_executor.start()
+    warmup = asyncio.create_task(_warm_up())
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        ga_executor.shutdown()
+        shutdown_day_executor()
+        catalog_store.stop()
+
 
 app = FastAPI(
     title="Fitness‑RS API",
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # ─── CORS: sesuaikan origins jika perlu ────────────────────────
@@ -23,7 +68,17 @@ app.add_middleware(
 app.include_router(api_router, prefix="/api/v1")
 
 
-# ─── Simple health‑check ───────────────────────────────────────
+# ─── Health / readiness ────────────────────────────────────────
 @app.get("/health", tags=["infra"])
 def healthcheck():
-    return {"status": "ok"}
\ No newline at end of file
+    body = {k: v for k, v in _readiness.items() if v is not None}
+    return JSONResponse(body, status_code=200 if _readiness["status"] == "ok" else 503)
+
+
+# ─── Prometheus metrics ────────────────────────────────────────
+metrics.register_collector("fitness_executor", ga_executor.stats)
+
+
+@app.get("/metrics", tags=["infra"], response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -0,0 +1,82 @@
+# app/rules/decision_table.py
+"""
+Versi terkompilasi `FitnessRuleEngine.decide_recommendation`.
+
+Aturan di engine experta sebenarnya tabel keputusan kecil atas
+(gender, bmi ≥ 25, available_days) ditambah ranking fokus dari preferensi
+& cedera. Tabel dibangun sekali saat import, jadi evaluasi per request
+hanya beberapa lookup dict — tanpa Rete network, reset(), atau scan facts.
+
+Hasil `decide()` identik dengan engine experta untuk semua input; lihat
+`scripts/check_rule_table.py`.
+"""
+
+from typing import Dict, List, Tuple, Union
+
+FEMALE_FOCUS_OPTIONS = ("glutes", "quadriceps", "hamstrings", "abs")
+MALE_FOCUS_OPTIONS = ("chest", "biceps", "triceps", "shoulders", "back", "abs")
+
+_PRIORITY = {
+    "female": {"glutes": 0, "quadriceps": 1, "hamstrings": 2, "abs": 3},
+    "male": {"chest": 1, "shoulders": 2, "biceps": 3, "triceps": 4, "back": 5, "abs": 6},
+}
+
+# Slot jadwal: str = fokus tetap, int = fokus peringkat ke‑n
+Slot = Union[str, int]
+
+# (available_days, bmi >= 25) -> (split, slot per hari)
+_SCHEDULE_TABLE: Dict[Tuple[int, bool], Tuple[str, Tuple[Slot, ...]]] = {
+    (1, False): ("fullbody", ("fullbody",)),
+    (1, True): ("fullbody", ("cardio",)),
+    (2, False): ("upperlower", ("upper", "lower")),
+    (2, True): ("upperlower", ("upper", "cardio")),
+    (3, False): ("ppl", ("push", "pull", "legs")),
+    (3, True): ("upperlower", ("upper", "lower", "cardio")),
+    (4, False): ("upperlower", ("upper", "lower", "upper", "lower")),
+    (4, True): ("upperlower", ("upper", "cardio", "lower", "cardio")),
+    (5, False): ("ppl+focus", ("push", "pull", "legs", 0, 1)),
+    (5, True): ("upperlower+focus", ("upper", "cardio", 0, "cardio", "lower")),
+}
+_DEFAULT = ("fullbody", ())
+
+# gender.lower() -> (opsi fokus, penalti prioritas per opsi)
+_FOCUS_TABLE: Dict[str, Tuple[Tuple[str, ...], Tuple[int, ...]]] = {
+    gender: (options, tuple(_PRIORITY.get(gender, {}).get(f, 100) for f in options))
+    for gender, options in (
+        ("female", FEMALE_FOCUS_OPTIONS),
+        ("male", MALE_FOCUS_OPTIONS),
+        ("other", MALE_FOCUS_OPTIONS),
+    )
+}
+
+
+def _rank_focus(gender: str, injuries: List[str], preferred: List[str]) -> List[str]:
+    g = gender.lower()
+    options, priority = _FOCUS_TABLE[g if g in _FOCUS_TABLE else "other"]
+
+    scores = []
+    for f, prio in zip(options, priority):
+        score = (5 if f in preferred else 0) + (-100 if f in injuries else 0)
+        if not preferred:
+            score -= prio
+        scores.append(score)
+
+    # sort stabil, sama dengan sorted(..., reverse=True) di engine
+    order = sorted(range(len(options)), key=lambda i: scores[i], reverse=True)
+    return [options[i] for i in order]
+
+
+def decide(gender: str, bmi: float, injuries: List[str], available_days: int,
+           preferred_body_part: List[str]) -> Tuple[str, Dict[str, str]]:
+    """Mengembalikan (split_type, schedule) seperti `FitnessRuleEngine.get_result()`."""
+    split, slots = _SCHEDULE_TABLE.get((available_days, bmi >= 25.0), _DEFAULT)
+
+    ranking = None
+    schedule: Dict[str, str] = {}
+    for day, slot in enumerate(slots, 1):
+        if isinstance(slot, int):
+            if ranking is None:
+                ranking = _rank_focus(gender, injuries or [], preferred_body_part or [])
+            slot = ranking[slot]
+        schedule[f"day_{day}"] = slot
+    return split, schedule
@@ -1,7 +1,8 @@
 # app/schemas/recommendation.py
-from typing import List, Dict
-from pydantic import BaseModel, Field
+from typing import List, Dict, Optional
+from pydantic import BaseModel, Field, PrivateAttr
 from app.schemas.exercise import ExerciseOut
+from app.services.exercise_catalog import FOCUS_NAMES
 
 class RecommendationRequest(BaseModel):
     # input body
@@ -12,11 +13,38 @@ class RecommendationRequest(BaseModel):
     available_days: int = Field(..., ge=1, le=5)
     preferred_body_part: List[str] = []
     preferred_equipment: List[str] = []
+    # kualitas vs latensi GA; default dari GA_PROFILE
+    ga_profile: Optional[str] = Field(None, pattern="^(fast|balanced|quality)$")
+    # budget waktu GA (ms) untuk seluruh jadwal; hanya bisa memperketat profil
+    time_budget_ms: Optional[int] = Field(None, gt=0, le=60_000)
+
+class DayEditRequest(BaseModel):
+    # profil yang sama dengan request rencana awal
+    gender: str = Field(..., pattern="male|female")
+    height_cm: float = Field(..., gt=0)
+    weight_kg: float = Field(..., gt=0)
+    injuries: List[str] = []
+    preferred_body_part: List[str] = []
+    preferred_equipment: List[str] = []
+    # hari yang diedit, dari respons rencana (`days[i]`)
+    day: int = Field(..., ge=1)
+    day_focus: str = Field(..., pattern=f"^({'|'.join(sorted(FOCUS_NAMES))})$")
+    exercise_ids: List[str] = Field(..., min_length=1)
+
+class RegenerateDayRequest(DayEditRequest):
+    ga_profile: Optional[str] = Field(None, pattern="^(fast|balanced|quality)$")
+    time_budget_ms: Optional[int] = Field(None, gt=0, le=60_000)
+
+class SwapExerciseRequest(DayEditRequest):
+    exercise_id: str                  # latihan yang diganti; harus ada di exercise_ids
+    exclude: List[str] = []           # kandidat yang sudah ditolak user
 
 class RecommendationDay(BaseModel):
     day: int
     day_focus: str
     exercises: List[ExerciseOut]
+    # JSON siap kirim untuk endpoint edit hari (app.services.serialization)
+    _json: Optional[bytes] = PrivateAttr(None)
 
 class RecommendationResponse(BaseModel):
     # meta
@@ -25,4 +53,11 @@ class RecommendationResponse(BaseModel):
     split_type: str
     schedule: Dict[str, str]          # {"day_1":"upper", ...}
     # detail
-    days: List[RecommendationDay]
\ No newline at end of file
+    days: List[RecommendationDay]
+    # profil GA yang dipakai & apakah GA hari mana pun dihentikan budget waktu
+    ga_profile: str
+    budget_exhausted: bool
+    # versi katalog yang dipakai (tidak diserialisasi; kunci cache respons)
+    _catalog_version: str = PrivateAttr("")
+    # JSON siap kirim, dirakit dari fragmen per latihan (app.services.serialization)
+    _json: Optional[bytes] = PrivateAttr(None)
\ No newline at end of file
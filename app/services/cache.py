@@ -0,0 +1,74 @@
+"""
+LRU cache kecil, thread‑safe, dengan counter hit/miss/eviction yang bisa
+dibaca saat runtime. TTL opsional (detik) per entri.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+import time
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._expires: Dict[Hashable, float] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING and self.ttl is not None \
+                    and self._expires[key] <= time.monotonic():
+                del self._data[key], self._expires[key]
+                self.expirations += 1
+                value = _MISSING
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            while len(self._data) > self.maxsize:
+                old_key, _ = self._data.popitem(last=False)
+                self._expires.pop(old_key, None)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self._expires.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
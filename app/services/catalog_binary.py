@@ -0,0 +1,243 @@
+"""
+Format biner katalog latihan (hasil kompilasi CSV).
+
+Layout file:
+  8 byte   magic  b"FRSCAT01"
+  8 byte   panjang header (uint64 little endian)
+  header   JSON utf‑8: versi sumber, jumlah baris, urutan kolom, dan
+           lokasi (offset, dtype, panjang) tiap array
+  array    data kolom, masing‑masing rata 64 byte
+
+Jenis kolom:
+  int / float  satu array numerik
+  str          dictionary‑encoded: `codes` int32 per baris (‑1 = kosong)
+               + kamus (`dict_data` utf‑8 + `dict_offsets` int64)
+  list         multi‑value "a|b": `codes` int32 datar + `offsets` int64
+               (n_rows + 1) + kamus seperti kolom str
+
+File dibuka lewat mmap read‑only sehingga array hanya berupa view ke
+halaman file (dibagi antar proses oleh page cache).
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import io
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MAGIC = b"FRSCAT01"
+ALIGN = 64
+LIST_COLUMNS = ("equipment", "primary_muscle", "secondary_muscle")
+
+
+def artifact_path(csv_path: str) -> str:
+    """Lokasi default artefak untuk sebuah CSV: nama sama, ekstensi .frscat."""
+    return os.path.splitext(csv_path)[0] + ".frscat"
+
+
+# ────────────────────────────────────────────────────────────────
+# Encoding
+def encode_strings(values: List[str]) -> Dict[str, np.ndarray]:
+    """String berurutan sebagai kamus (`dict_data` utf‑8 + `dict_offsets`); entri ke‑i = values[i]."""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return {"dict_data": np.frombuffer(b"".join(encoded), dtype=np.uint8), "dict_offsets": offsets}
+
+
+def _encode_dictionary(values: List[str]) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+    vocab = sorted(set(values))
+    index = {v: i for i, v in enumerate(vocab)}
+    parts = encode_strings(vocab)
+    return index, parts["dict_data"], parts["dict_offsets"]
+
+
+def _encode_str(series: "pd.Series") -> Dict[str, np.ndarray]:
+    present = series.notna().to_numpy()
+    values = series.astype(str).to_numpy()
+    index, data, offsets = _encode_dictionary(values[present].tolist())
+    codes = np.full(len(series), -1, dtype=np.int32)
+    codes[present] = [index[v] for v in values[present]]
+    return {"codes": codes, "dict_data": data, "dict_offsets": offsets}
+
+
+def _encode_list(series: "pd.Series") -> Dict[str, np.ndarray]:
+    rows = list(series)
+    flat = [item for row in rows for item in row]
+    index, data, offsets = _encode_dictionary(flat)
+    row_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    row_offsets[1:] = np.cumsum([len(r) for r in rows])
+    return {
+        "codes": np.asarray([index[v] for v in flat], dtype=np.int32),
+        "offsets": row_offsets,
+        "dict_data": data,
+        "dict_offsets": offsets,
+    }
+
+
+def encode_columns(df: "pd.DataFrame") -> Tuple[List[Dict[str, Any]], List[Tuple[str, np.ndarray]]]:
+    """(spesifikasi kolom untuk header, array bernama) dari DataFrame `read_exercises`."""
+    import pandas as pd
+
+    columns: List[Dict[str, Any]] = []
+    arrays: List[Tuple[str, np.ndarray]] = []
+    for name in df.columns:
+        series = df[name]
+        if name in LIST_COLUMNS:
+            kind, parts = "list", _encode_list(series)
+        elif pd.api.types.is_integer_dtype(series):
+            kind, parts = "int", {"values": series.to_numpy(dtype=np.int64)}
+        elif pd.api.types.is_float_dtype(series):
+            kind, parts = "float", {"values": series.to_numpy(dtype=np.float64)}
+        else:
+            kind, parts = "str", _encode_str(series)
+        columns.append({"name": name, "kind": kind, "arrays": list(parts)})
+        arrays += [(f"{name}.{part}", arr) for part, arr in parts.items()]
+    return columns, arrays
+
+
+def write_arrays(out_path: str, header: Dict[str, Any], arrays: List[Tuple[str, np.ndarray]],
+                 magic: bytes = MAGIC) -> None:
+    """
+    Tulis header JSON + array (rata ALIGN byte) secara atomik. Lokasi tiap
+    array ditambahkan ke header sebagai "arrays"; array > 1 dimensi
+    menyimpan "shape".
+    """
+    # offset array dihitung relatif terhadap awal blok data
+    layout: Dict[str, Dict[str, Any]] = {}
+    cursor = 0
+    for key, arr in arrays:
+        cursor = -(-cursor // ALIGN) * ALIGN
+        layout[key] = {"offset": cursor, "dtype": arr.dtype.newbyteorder("<").str, "length": int(arr.size)}
+        if arr.ndim > 1:
+            layout[key]["shape"] = list(arr.shape)
+        cursor += arr.nbytes
+
+    encoded = json.dumps({**header, "arrays": layout}).encode("utf-8")
+    data_start = -(-(len(magic) + 8 + len(encoded)) // ALIGN) * ALIGN
+
+    tmp_path = f"{out_path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as fh:
+        fh.write(magic + struct.pack("<Q", len(encoded)) + encoded)
+        for key, arr in arrays:
+            fh.seek(data_start + layout[key]["offset"])
+            fh.write(np.ascontiguousarray(arr, dtype=layout[key]["dtype"]).tobytes())
+    os.replace(tmp_path, out_path)        # atomic: pembaca/reloader tidak melihat file setengah jadi
+
+
+def compile_csv(csv_path: str, out_path: Optional[str] = None) -> str:
+    """Kompilasi CSV ke artefak biner; mengembalikan path artefak."""
+    # impor lokal: csv_loader memakai modul ini untuk memuat artefak
+    from app.services.csv_loader import content_version, read_exercises
+
+    out_path = out_path or artifact_path(csv_path)
+    with open(csv_path, "rb") as fh:
+        raw = fh.read()
+    df = read_exercises(io.BytesIO(raw))     # kolom list sudah di‑split
+
+    columns, arrays = encode_columns(df)
+    write_arrays(out_path, {
+        "format": 1,
+        "version": content_version(raw),
+        "source": os.path.basename(csv_path),
+        "rows": len(df),
+        "columns": columns,
+    }, arrays)
+    return out_path
+
+
+# ────────────────────────────────────────────────────────────────
+# Decoding
+class CompiledCatalog:
+    """Artefak yang di‑mmap; `array(key)` adalah view read‑only ke file."""
+
+    def __init__(self, path: str, magic: bytes = MAGIC):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(magic)] != magic:
+            raise ValueError(f"{path}: bukan artefak katalog")
+        (header_len,) = struct.unpack_from("<Q", self._mmap, len(magic))
+        start = len(magic) + 8
+        self.header = json.loads(self._mmap[start:start + header_len].decode("utf-8"))
+        self._data_start = -(-(start + header_len) // ALIGN) * ALIGN
+        self.version: str = self.header["version"]
+        self.rows: int = self.header["rows"]
+
+    def array(self, key: str) -> np.ndarray:
+        spec = self.header["arrays"][key]
+        if spec["length"] == 0:
+            return np.empty(spec.get("shape", 0), dtype=np.dtype(spec["dtype"]))
+        arr = np.frombuffer(self._mmap, dtype=np.dtype(spec["dtype"]), count=spec["length"],
+                            offset=self._data_start + spec["offset"])
+        return arr.reshape(spec["shape"]) if "shape" in spec else arr
+
+    def string(self, prefix: str, code: int) -> str:
+        """Satu entri kamus (`<prefix>.dict_data` / `.dict_offsets`) tanpa decode seluruh kamus."""
+        offsets = self.array(f"{prefix}.dict_offsets")
+        return bytes(self.array(f"{prefix}.dict_data")[offsets[code]:offsets[code + 1]]).decode("utf-8")
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Satu baris sebagai dict, setara satu elemen `df.to_dict("records")`."""
+        out: Dict[str, Any] = {}
+        for column in self.header["columns"]:
+            name, kind = column["name"], column["kind"]
+            if kind in ("int", "float"):
+                out[name] = self.array(f"{name}.values")[row].item()
+            elif kind == "str":
+                code = int(self.array(f"{name}.codes")[row])
+                out[name] = self.string(name, code) if code >= 0 else float("nan")
+            else:
+                offsets = self.array(f"{name}.offsets")
+                codes = self.array(f"{name}.codes")[offsets[row]:offsets[row + 1]]
+                out[name] = [self.string(name, int(c)) for c in codes]
+        return out
+
+    def dictionary(self, column: str) -> np.ndarray:
+        data = self.array(f"{column}.dict_data").tobytes()
+        offsets = self.array(f"{column}.dict_offsets")
+        return np.array([data[offsets[i]:offsets[i + 1]].decode("utf-8")
+                         for i in range(len(offsets) - 1)], dtype=object)
+
+    def _column(self, column: Dict[str, Any]) -> Any:
+        name, kind = column["name"], column["kind"]
+        if kind in ("int", "float"):
+            return np.array(self.array(f"{name}.values"))
+        vocab = self.dictionary(name)
+        codes = self.array(f"{name}.codes")
+        if kind == "str":
+            values = np.empty(len(codes), dtype=object)
+            present = codes >= 0
+            values[present] = vocab[codes[present]]
+            values[~present] = np.nan
+            return values
+        # list: string per item dipakai bersama (satu objek per nilai kamus)
+        items = vocab[codes].tolist()
+        offsets = self.array(f"{name}.offsets").tolist()
+        return [items[offsets[i]:offsets[i + 1]] for i in range(self.rows)]
+
+    def column(self, name: str) -> Optional[List[Any]]:
+        """Nilai satu kolom untuk semua baris (list Python); None jika tidak ada."""
+        for column in self.header["columns"]:
+            if column["name"] == name:
+                values = self._column(column)
+                return values if isinstance(values, list) else values.tolist()
+        return None
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """
+        DataFrame setara `csv_loader.read_exercises` atas CSV sumber. Hanya
+        untuk verifikasi/alat; katalog layanan memakai `BinaryCatalog`.
+        """
+        import pandas as pd
+
+        return pd.DataFrame({c["name"]: self._column(c) for c in self.header["columns"]})
+
+    def close(self) -> None:
+        self._mmap.close()
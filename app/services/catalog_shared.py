@@ -0,0 +1,236 @@
+"""
+Segmen katalog bersama antar proses worker.
+
+Tanpa segmen, tiap proses (worker uvicorn, juga worker GA) memegang
+DataFrame, dict per baris, model `ExerciseOut`, dan fragmen JSON milik
+sendiri. Dengan CATALOG_SHARED, semuanya disimpan sebagai array dalam
+satu file (layout `catalog_binary`, magic FRSSEG01) di tmpfs:
+
+  kolom katalog      hasil `encode_columns`
+  indeks baris       body part / fokus / alat: baris tergabung + offsets
+  exercise_id        kamus per baris + id terurut untuk searchsorted
+  field terdaftar    struktur turunan milik modul lain
+                     (`register_shared`: fitur GA, fragmen JSON)
+
+File ditulis sekali per versi katalog oleh proses loader terpisah
+(`python -m app.services.catalog_shared`) di bawah file lock, sehingga
+worker yang start bersamaan tidak membangunnya berulang dan tidak ada
+proses yang menanggung DataFrame. Tiap proses lalu meng‑mmap file itu
+read‑only: halamannya dibagi lewat page cache, dan objek Python dibuat
+hanya untuk latihan yang benar‑benar dikirim (record & `ExerciseOut`
+dibuat lazy lalu di‑memo). Perbandingan RSS per worker: README.
+"""
+
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from app.config import CATALOG_SHM_DIR
+from app.services.catalog_binary import CompiledCatalog, encode_strings, write_arrays
+from app.services.csv_loader import source_version
+from app.services.exercise_catalog import BinaryCatalog, ExerciseCatalog, load_catalog
+
+SEGMENT_MAGIC = b"FRSSEG01"
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ────────────────────────────────────────────────────────────────
+# Field turunan yang ikut disimpan di segmen
+class SharedField(NamedTuple):
+    attach: Callable[["SharedCatalog"], Any]
+    # katalog penuh → array bernama; None = tidak ada array (dibangun lazy dari field lain)
+    export: Optional[Callable[[ExerciseCatalog], Dict[str, np.ndarray]]]
+
+
+_fields: Dict[str, SharedField] = {}
+
+
+def register_shared(key: str, attach: Callable[["SharedCatalog"], Any],
+                    export: Optional[Callable[[ExerciseCatalog], Dict[str, np.ndarray]]] = None) -> None:
+    """
+    Daftarkan struktur `catalog.derived(key, ...)` untuk segmen: `export`
+    dijalankan di proses loader atas katalog penuh, `attach` di tiap worker
+    (membaca array lewat `SharedCatalog.field_arrays(key)`).
+    """
+    _fields[key] = SharedField(attach, export)
+
+
+# ────────────────────────────────────────────────────────────────
+# Menulis segmen
+def _concat(parts: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(p) for p in parts])
+    rows = np.concatenate(parts).astype(np.int64) if parts else np.empty(0, dtype=np.int64)
+    return rows, offsets
+
+
+def export_segment(catalog: ExerciseCatalog, out_path: str) -> None:
+    """Tulis katalog penuh (beserta field terdaftar) sebagai segmen, atomik."""
+    columns, arrays = catalog.encoded_columns()
+    arrays += [("all_rows", catalog.all_rows), ("body_code", catalog.body_code)]
+
+    indexes: Dict[str, List[str]] = {}
+    for name, index in (("body_part", catalog.body_part_index), ("focus", catalog.focus_index),
+                        ("equipment", catalog.equipment_index)):
+        keys = sorted(index)
+        rows, offsets = _concat([index[k] for k in keys])
+        indexes[name] = keys
+        arrays += [(f"index.{name}.rows", rows), (f"index.{name}.offsets", offsets)]
+
+    ids = catalog.exercise_ids(catalog.all_rows)
+    arrays += [(f"ids.{part}", arr) for part, arr in encode_strings(ids).items()]
+    # id duplikat: baris pertama yang dipakai (sama dengan `_build_id_index`)
+    encoded = np.array([eid.encode("utf-8") for eid in ids], dtype=bytes)
+    order = np.argsort(encoded, kind="stable")
+    arrays += [("ids.sorted", encoded[order]), ("ids.order", order.astype(np.int64))]
+
+    fields: Dict[str, List[str]] = {}
+    for key, field in _fields.items():
+        if field.export is None:
+            continue
+        parts = field.export(catalog)
+        fields[key] = list(parts)
+        arrays += [(f"{key}.{name}", arr) for name, arr in parts.items()]
+
+    write_arrays(out_path, {
+        "format": 1,
+        "version": catalog.version,
+        "rows": catalog.size,
+        "columns": columns,
+        "body_part_names": list(catalog.body_part_names),
+        "indexes": indexes,
+        "fields": fields,
+    }, arrays, magic=SEGMENT_MAGIC)
+
+
+# ────────────────────────────────────────────────────────────────
+# Katalog di atas segmen
+class SharedCatalog(BinaryCatalog):
+    """
+    `ExerciseCatalog` yang indeks & datanya view read‑only ke segmen.
+    Tidak ada DataFrame (`df` None); record dibaca per baris.
+    """
+
+    def __init__(self, path: str):
+        self.segment = self.compiled = CompiledCatalog(path, magic=SEGMENT_MAGIC)
+        header = self.segment.header
+        self.path = path
+        self.df = None
+        self.version = self.segment.version
+        self.size = self.segment.rows
+        self.all_rows = self.segment.array("all_rows")
+        self.body_part_names = tuple(header["body_part_names"])
+        self.body_code = self.segment.array("body_code")
+        self.body_part_index = self._index("body_part")
+        self.focus_index = self._index("focus")
+        self.equipment_index = self._index("equipment")
+        self._ids_sorted = self.segment.array("ids.sorted")
+        self._ids_order = self.segment.array("ids.order")
+        self._derived = {}
+        self._derived_lock = RLock()
+
+    def _index(self, name: str) -> Dict[str, np.ndarray]:
+        rows = self.segment.array(f"index.{name}.rows")
+        offsets = self.segment.array(f"index.{name}.offsets")
+        return {key: rows[offsets[i]:offsets[i + 1]]
+                for i, key in enumerate(self.segment.header["indexes"][name])}
+
+    def field_arrays(self, key: str) -> Dict[str, np.ndarray]:
+        return {name: self.segment.array(f"{key}.{name}") for name in self.segment.header["fields"][key]}
+
+    # ──────────────────────────────────────────────────────────
+    # Akses data (record & kolom: `BinaryCatalog`)
+    def exercise_ids(self, rows: Iterable[int]) -> List[str]:
+        return [self.segment.string("ids", int(i)) for i in rows]
+
+    def rows_for_ids(self, exercise_ids: Iterable[str]) -> np.ndarray:
+        out = []
+        for eid in exercise_ids:
+            key = str(eid).encode("utf-8")
+            pos = int(np.searchsorted(self._ids_sorted, key))
+            if pos == len(self._ids_sorted) or self._ids_sorted[pos] != key:
+                raise KeyError(str(eid))
+            out.append(self._ids_order[pos])
+        return np.array(out, dtype=np.int64)
+
+    def derived(self, key: str, builder: Callable[[ExerciseCatalog], Any]) -> Any:
+        # field terdaftar dipasang dari segmen; sisanya dibangun seperti biasa
+        field = _fields.get(key)
+        if field is None or (field.export is not None and key not in self.segment.header["fields"]):
+            return super().derived(key, builder)
+        return super().derived(key, lambda catalog: field.attach(catalog))
+
+
+# ────────────────────────────────────────────────────────────────
+# Lokasi segmen + loader
+def segment_dir() -> str:
+    if CATALOG_SHM_DIR:
+        return CATALOG_SHM_DIR
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def _stem(path: str) -> str:
+    return "frs-" + os.path.splitext(os.path.basename(path))[0]
+
+
+def segment_path(path: str, version: str) -> str:
+    return os.path.join(segment_dir(), f"{_stem(path)}-{version}.seg")
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    import fcntl    # POSIX saja; modul ini tetap bisa diimpor di Windows tanpa CATALOG_SHARED
+    with open(path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def load_shared(path: str) -> SharedCatalog:
+    """
+    Katalog bersama untuk dataset `path`. Bila segmen versi ini belum ada,
+    proses loader dijalankan (sekali untuk semua worker, dijaga file lock).
+    """
+    seg = segment_path(path, source_version(path))
+    if not os.path.exists(seg):
+        os.makedirs(os.path.dirname(seg), exist_ok=True)
+        with _file_lock(seg + ".lock"):
+            if not os.path.exists(seg):
+                env = dict(os.environ)
+                env["PYTHONPATH"] = os.pathsep.join(filter(None, [_ROOT, env.get("PYTHONPATH")]))
+                subprocess.run([sys.executable, "-m", "app.services.catalog_shared", path, seg],
+                               env=env, cwd=os.getcwd(), check=True)
+    return SharedCatalog(seg)
+
+
+def build_segment(path: str, out_path: str) -> SharedCatalog:
+    """Bangun katalog penuh dari `path`, tulis segmennya, hapus segmen versi lama."""
+    # impor lokal: mendaftarkan semua field (fitur GA, fragmen JSON)
+    import app.services.recommender  # noqa: F401
+
+    export_segment(load_catalog(path), out_path)
+    for old in glob.glob(os.path.join(os.path.dirname(out_path), _stem(path) + "-*.seg")):
+        if old != out_path:
+            # worker yang masih memegang mmap lama tetap bisa membacanya
+            for stale in (old, old + ".lock"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+    return SharedCatalog(out_path)
+
+
+if __name__ == "__main__":
+    # lewat nama modul, bukan __main__: registry field diisi oleh modul yang diimpor
+    from app.services.catalog_shared import build_segment as _build
+
+    catalog = _build(sys.argv[1], sys.argv[2])
+    print(f"[catalog] segmen {sys.argv[2]}: versi {catalog.version}, {catalog.size} latihan, "
+          f"{os.path.getsize(sys.argv[2]) / 2 ** 20:.1f} MiB")
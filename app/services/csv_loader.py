@@ -1,8 +1,21 @@
 # app/services/csv_loader.py
-from functools import lru_cache
-import pandas as pd
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+import hashlib
+import io
+import os
 import math
 
+from app.config import CATALOG_BINARY_PATH, CATALOG_PATH
+from app.services.catalog_binary import CompiledCatalog, artifact_path
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DATASET_PATH = CATALOG_PATH
+
+Stamp = Tuple[Tuple[int, int], ...]
+
 
 def _split(val):
     if val is None or (isinstance(val, float) and math.isnan(val)) or str(val).strip() == "":
@@ -10,13 +23,100 @@ def _split(val):
     return [v.strip() for v in str(val).split("|") if v.strip()]
 
 
-@lru_cache
-def load_exercises() -> pd.DataFrame:
-    df = pd.read_csv("data/fitness_dataset.csv")
+def read_exercises(source: Union[str, io.BytesIO] = DATASET_PATH) -> "pd.DataFrame":
+    """Baca + parse CSV tanpa cache (path atau buffer)."""
+    import pandas as pd     # impor berat (~0,4 s); hanya saat katalog di‑parse
+
+    df = pd.read_csv(source)
 
     # ubah kolom multi‑value menjadi list
     for col in ["equipment", "primary_muscle", "secondary_muscle"]:
         if col in df.columns:
             df[col] = df[col].apply(_split)
 
-    return df
\ No newline at end of file
+    return df
+
+
+def content_version(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:12]
+
+
+def file_version(path: str) -> str:
+    with open(path, "rb") as fh:
+        return content_version(fh.read())
+
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) — pemeriksaan murah sebelum hashing ulang."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+# ────────────────────────────────────────────────────────────────
+# Dataset = CSV + artefak biner opsional
+def binary_path(path: str) -> str:
+    if path == DATASET_PATH and CATALOG_BINARY_PATH:
+        return CATALOG_BINARY_PATH
+    return artifact_path(path)
+
+
+def source_stamp(path: str) -> Stamp:
+    """Stamp CSV dan artefak (yang ada); berubah jika salah satunya berubah."""
+    return tuple(file_stamp(p) for p in (path, binary_path(path)) if os.path.exists(p))
+
+
+def source_version(path: str) -> str:
+    """Versi dataset = hash isi CSV; tanpa CSV, versi yang tercatat di artefak."""
+    if os.path.exists(path):
+        return file_version(path)
+    return CompiledCatalog(binary_path(path)).version
+
+
+def open_artifact(path: str) -> Optional[CompiledCatalog]:
+    """Artefak biner `path` bila ada dan dikompilasi dari isi CSV yang sama; selain itu None."""
+    artifact = binary_path(path)
+    if not os.path.exists(artifact):
+        return None
+    compiled = CompiledCatalog(artifact)
+    if os.path.exists(path) and compiled.version != file_version(path):
+        print(f"[catalog] {artifact} usang (CSV berubah) — memakai CSV")
+        return None
+    return compiled
+
+
+def read_dataset(path: str = DATASET_PATH) -> Tuple["pd.DataFrame", str]:
+    """
+    (DataFrame, versi). Artefak biner dipakai bila ada dan dikompilasi dari
+    isi CSV yang sama; selain itu CSV di‑parse. Versi selalu hash CSV
+    sumber, jadi kedua jalur memberi versi yang sama. Katalog layanan
+    (`exercise_catalog.load_catalog`) membaca artefak tanpa DataFrame.
+    """
+    compiled = open_artifact(path)
+    if compiled is not None:
+        return compiled.to_dataframe(), compiled.version
+    with open(path, "rb") as fh:
+        data = fh.read()
+    return read_exercises(io.BytesIO(data)), content_version(data)
+
+
+def load_exercises() -> "pd.DataFrame":
+    """Baca dataset CATALOG_PATH; cache ada di `exercise_catalog.catalog_store`."""
+    return read_dataset(DATASET_PATH)[0]
+
+
+_version_lock = Lock()
+_version_memo: Tuple[Stamp, str] = ((), "")
+
+
+def dataset_version() -> str:
+    """
+    Hash isi dataset saat ini; dipakai sebagai kunci invalidasi cache
+    turunan. Hash dihitung ulang hanya jika mtime/ukuran file berubah.
+    """
+    global _version_memo
+    stamp = source_stamp(DATASET_PATH)
+    if stamp != _version_memo[0]:
+        with _version_lock:
+            if stamp != _version_memo[0]:
+                _version_memo = (stamp, source_version(DATASET_PATH))
+    return _version_memo[1]
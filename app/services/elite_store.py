@@ -0,0 +1,59 @@
+"""
+Warm‑start GA: elite terbaru per kunci pool.
+
+Pasangan (fokus, pool) yang sama diselesaikan berulang kali. Setelah
+tiap run GA, beberapa solusi terbaik disimpan sebagai tuple
+`exercise_id` (bukan posisi di pool). Run berikutnya dengan kunci yang
+sama mengisi sebagian `initial_population` dari elite tersebut dan
+sisanya acak agar populasi tetap beragam.
+
+Kunci = kunci cache pool harian (versi katalog + fokus, cedera, alat,
+min_required; lihat `exercise_filter.daily_pool_keys`) + konteks skor
+(fokus, cedera, preferensi, bonus cardio BMI, jumlah gene): elite hanya
+relevan jika pool dan fungsi fitness‑nya sama. Kunci dibentuk tanpa
+menyentuh isi pool, jadi murah untuk pool sebesar apa pun. Store hidup
+per proses (worker).
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from app.config import GA_WARM_START_SIZE
+from app.services.cache import LRUCache
+
+PoolKey = Tuple[Hashable, str, Tuple[str, ...], Tuple[str, ...], bool, int]
+Elite = Tuple[float, Tuple[str, ...]]          # (skor tanpa noise, id latihan terurut)
+
+ELITES_PER_KEY = 5
+
+
+def pool_key(pool: Hashable, focus: str, injured: Sequence[str], preferred: Sequence[str],
+             cardio_bonus: bool, num_genes: int) -> PoolKey:
+    return (pool, focus.lower(), tuple(sorted(injured)), tuple(sorted(preferred)),
+            cardio_bonus, num_genes)
+
+
+class EliteStore:
+    def __init__(self, maxsize: int, per_key: int = ELITES_PER_KEY):
+        self._cache = LRUCache(maxsize=maxsize)
+        self.per_key = per_key
+
+    def get(self, key: PoolKey) -> List[Elite]:
+        return self._cache.get(key) or []
+
+    def add(self, key: PoolKey, elites: Sequence[Elite]) -> None:
+        """Gabungkan elite baru dengan yang tersimpan; simpan `per_key` terbaik yang unik."""
+        merged: Dict[Tuple[str, ...], float] = dict((ids, score) for score, ids in self.get(key))
+        for score, ids in elites:
+            if score > merged.get(ids, float("-inf")):
+                merged[ids] = score
+        best = sorted(((s, ids) for ids, s in merged.items()), reverse=True)[:self.per_key]
+        self._cache.put(key, best)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+
+elite_store: Optional[EliteStore] = EliteStore(GA_WARM_START_SIZE) if GA_WARM_START_SIZE > 0 else None
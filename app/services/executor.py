@@ -0,0 +1,143 @@
+"""
+Menjalankan pipeline GA di luar thread request.
+
+Pekerjaan dikirim ke `ProcessPoolExecutor` (worker memuat katalog sekali
+saat start) dengan batas jumlah task yang boleh menunggu. Bila penuh,
+`QueueFullError` dilempar agar router bisa membalas 503 + Retry‑After
+alih‑alih menumpuk antrean tanpa batas.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import multiprocessing
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import GA_QUEUE_DEPTH, GA_WORKERS
+from app.services import metrics
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+def _init_worker() -> None:
+    from app.services.genetic_optimizer import mark_ga_worker
+    from app.services.recommender import warm_up
+    mark_ga_worker()
+    warm_up()
+
+
+def _timed_call(fn: Callable, submitted_at: float, *args) -> Tuple[float, Any, List[metrics.Trace]]:
+    # time.time() karena dibandingkan lintas proses
+    wait = time.time() - submitted_at
+    result = fn(*args)
+    # trace metrics ikut dikirim balik bersama hasil (kosong jika mati)
+    return wait, result, metrics.collect()
+
+
+class GAExecutor:
+    def __init__(self, workers: int, queue_depth: int):
+        self.workers = workers
+        self.max_pending = max(workers, 1) + queue_depth
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_last = 0.0
+
+    def start(self) -> None:
+        if self.workers > 0 and self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            # submit pertama memicu spawn semua worker sekarang, bukan saat request
+            self._pool.submit(int)
+
+    async def ping(self) -> None:
+        """
+        Selesai setelah satu worker menjalankan task. Initializer
+        (`warm_up`) selalu selesai sebelum worker mengambil task, jadi
+        worker yang menerima request pasti sudah hangat.
+        """
+        if self.workers > 0:
+            self.start()
+            await asyncio.wrap_future(self._pool.submit(int))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _release(self, _fut: Any = None) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        # worker mati (OOM, dll.) — tutup pool rusak, bangun ulang untuk request berikutnya
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable, *args) -> Tuple[Any, float, List[metrics.Trace]]:
+        """Mengembalikan (hasil, waktu tunggu antrean dalam detik, trace metrics)."""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(f"{self.pending} GA tasks pending")
+            self.pending += 1
+        submitted_at = time.time()
+        if self.workers > 0:
+            self.start()
+            pool = self._pool
+            try:
+                fut = pool.submit(_timed_call, fn, submitted_at, *args)
+            except BaseException as exc:
+                self._release()
+                if isinstance(exc, BrokenProcessPool):
+                    self._discard_pool(pool)
+                raise
+            # slot dilepas saat task benar‑benar selesai di worker, bukan saat
+            # coroutine dibatalkan (client putus): backpressure tetap akurat
+            fut.add_done_callback(self._release)
+            try:
+                wait, result, traces = await asyncio.wrap_future(fut)
+            except BrokenProcessPool:
+                self._discard_pool(pool)
+                raise
+        else:
+            # run_in_threadpool menunggu thread selesai walau dibatalkan
+            try:
+                wait, result, traces = await run_in_threadpool(_timed_call, fn, submitted_at, *args)
+            finally:
+                self._release()
+
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += wait
+            self.queue_wait_last = wait
+        return result, wait, traces
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_last_ms": round(self.queue_wait_last * 1000, 3),
+            "queue_wait_avg_ms": round(self.queue_wait_total / self.completed * 1000, 3)
+            if self.completed else 0.0,
+        }
+
+
+ga_executor = GAExecutor(workers=GA_WORKERS, queue_depth=GA_QUEUE_DEPTH)
@@ -0,0 +1,348 @@
+"""
+Katalog latihan ter‑indeks.
+
+Dibangun dari file CATALOG_PATH oleh `catalog_store`, yang memuat ulang
+katalog di background saat file berubah. Bila artefak biner valid ada,
+indeks dibangun langsung dari array kolomnya (`BinaryCatalog`, tanpa
+DataFrame); selain itu CSV di‑parse. Semua filter harian (cedera,
+fokus, alat) cukup berupa operasi himpunan di atas array indeks baris
+yang sudah terurut, sehingga pool harian hanyalah `np.ndarray` indeks ke
+katalog — bukan salinan DataFrame.
+"""
+
+from threading import Event, Lock, RLock, Thread
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from app.config import CATALOG_RELOAD_INTERVAL, CATALOG_SHARED
+from app.services.catalog_binary import CompiledCatalog, encode_columns
+from app.services.csv_loader import (
+    DATASET_PATH, Stamp, open_artifact, read_dataset, source_stamp, source_version,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ================= Grup body part per fokus hari =================
+FOCUS_GROUPS: Dict[str, frozenset] = {
+    "upper": frozenset({"chest", "biceps", "triceps", "back", "shoulders", "forearms", "neck", "abs"}),
+    "lower": frozenset({"quadriceps", "glutes", "calves", "hamstrings"}),
+    "push": frozenset({"chest", "triceps", "shoulders"}),
+    "pull": frozenset({"back", "biceps", "forearms", "neck"}),
+    "legs": frozenset({"quadriceps", "glutes", "calves", "hamstrings"}),
+    "male_focus": frozenset({"chest", "shoulders", "biceps", "triceps", "back", "abs"}),
+    "female_focus": frozenset({"glutes", "quadriceps", "hamstrings", "abs"}),
+}
+
+# Semua fokus hari yang dikenali `rows_for_focus`: grup di atas, fullbody,
+# dan fokus satu body part (termasuk cardio)
+FOCUS_NAMES: frozenset = frozenset(FOCUS_GROUPS).union({"fullbody", "cardio"}, *FOCUS_GROUPS.values())
+
+# Di atas jumlah baris ini `BinaryCatalog.records` men‑decode per kolom, bukan per baris
+_ROW_RECORDS_LIMIT = 256
+
+_EMPTY = np.empty(0, dtype=np.int64)
+_EMPTY.setflags(write=False)
+
+
+def _frozen(rows) -> np.ndarray:
+    arr = np.asarray(rows, dtype=np.int64)
+    arr.setflags(write=False)
+    return arr
+
+
+def _union(arrays: Iterable[np.ndarray]) -> np.ndarray:
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return _EMPTY
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+class ExerciseCatalog:
+    """
+    Indeks baris (array int terurut) per body part, per fokus gabungan,
+    dan per item alat. Baris = posisi di DataFrame sumber.
+    `version` mengikuti isi dataset agar cache turunan bisa diinvalidasi.
+    """
+
+    def __init__(self, df: "pd.DataFrame", version: str = ""):
+        self.df = df
+        self.version = version
+        self.size = len(df)
+        self.all_rows = _frozen(np.arange(self.size))
+
+        body_parts = df["body_part"].str.lower().to_numpy()
+        names = tuple(sorted(set(body_parts)))
+        codes = {bp: i for i, bp in enumerate(names)}
+        self._index_body_parts(names, np.array([codes[bp] for bp in body_parts], dtype=np.int64))
+
+        equipment_rows: Dict[str, List[int]] = {}
+        for row, items in enumerate(df["equipment"]):
+            for eq in set(items):
+                equipment_rows.setdefault(eq, []).append(row)
+        self.equipment_index: Dict[str, np.ndarray] = {
+            eq: _frozen(rows) for eq, rows in equipment_rows.items()
+        }
+
+        self._records: List[Dict[str, Any]] = df.to_dict("records")
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = RLock()        # builder boleh memakai derived() lain
+
+    def _index_body_parts(self, names: tuple, body_code: np.ndarray) -> None:
+        self.body_part_names: tuple = names
+        self.body_code = _frozen(body_code)
+        self.body_part_index: Dict[str, np.ndarray] = {
+            bp: _frozen(np.flatnonzero(self.body_code == code)) for code, bp in enumerate(names)
+        }
+        self.focus_index: Dict[str, np.ndarray] = {
+            focus: self.rows_for_body_parts(parts) for focus, parts in FOCUS_GROUPS.items()
+        }
+
+    # ──────────────────────────────────────────────────────────
+    # Lookup indeks
+    def rows_for_body_parts(self, parts: Iterable[str]) -> np.ndarray:
+        return _union(self.body_part_index.get(p, _EMPTY) for p in parts)
+
+    def rows_for_focus(self, focus: str) -> np.ndarray:
+        focus = focus.lower()
+        if focus == "fullbody":
+            return self.all_rows
+        if focus in self.focus_index:
+            return self.focus_index[focus]
+        # fallback: fokus spesifik body part (termasuk cardio)
+        return self.body_part_index.get(focus, _EMPTY)
+
+    def rows_with_equipment(self, items: Iterable[str]) -> np.ndarray:
+        return _union(self.equipment_index.get(eq, _EMPTY) for eq in items)
+
+    # ──────────────────────────────────────────────────────────
+    # Akses data
+    def records(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        return [dict(self._records[i]) for i in rows]
+
+    def column(self, name: str) -> Optional[List[Any]]:
+        """Nilai satu kolom untuk semua baris; None jika kolom tidak ada."""
+        return self.df[name].tolist() if name in self.df else None
+
+    def encoded_columns(self) -> Tuple[List[Dict[str, Any]], List[Tuple[str, np.ndarray]]]:
+        """Kolom dalam layout `catalog_binary` (untuk segmen bersama)."""
+        return encode_columns(self.df)
+
+    def exercise_ids(self, rows: Iterable[int]) -> List[str]:
+        """exercise_id per baris (urutan input)."""
+        ids = self.derived("id_array", _build_id_array)
+        return ids[np.asarray(rows, dtype=np.int64)].tolist()
+
+    def rows_for_ids(self, exercise_ids: Iterable[str]) -> np.ndarray:
+        """Baris katalog per exercise_id (urutan input); KeyError untuk id yang tidak dikenal."""
+        index = self.derived("id_rows", _build_id_index)
+        return np.array([index[str(eid)] for eid in exercise_ids], dtype=np.int64)
+
+    def derived(self, key: str, builder: Callable[["ExerciseCatalog"], Any]) -> Any:
+        """
+        Memo struktur turunan (mis. fitur GA) per instance katalog, agar
+        dihitung sekali dan ikut terbuang saat katalog diganti.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = builder(self)
+                    self._derived[key] = value
+        return value
+
+
+def _build_id_array(catalog: "ExerciseCatalog") -> np.ndarray:
+    return np.array([str(eid) for eid in catalog.column("exercise_id")], dtype=object)
+
+
+def _build_id_index(catalog: "ExerciseCatalog") -> Dict[str, int]:
+    index: Dict[str, int] = {}
+    for row, eid in enumerate(catalog.derived("id_array", _build_id_array)):
+        index.setdefault(eid, row)
+    return index
+
+
+class BinaryCatalog(ExerciseCatalog):
+    """
+    `ExerciseCatalog` di atas artefak biner yang di‑mmap. Indeks dibangun
+    dari array kode kolom (`body_part`, `equipment`); tidak ada DataFrame
+    (`df` None) dan record dibaca per baris.
+    """
+
+    def __init__(self, compiled: CompiledCatalog):
+        self.compiled = compiled
+        self.df = None
+        self.version = compiled.version
+        self.size = compiled.rows
+        self.all_rows = _frozen(np.arange(self.size))
+
+        # kamus body part hanya belasan entri: lowercase per entri, lalu petakan kode baris
+        vocab = [bp.lower() for bp in compiled.dictionary("body_part")]
+        names = tuple(sorted(set(vocab)))
+        codes = {bp: i for i, bp in enumerate(names)}
+        lookup = np.array([codes[bp] for bp in vocab], dtype=np.int64)
+        self._index_body_parts(names, lookup[compiled.array("body_part.codes")])
+
+        # equipment: pasangan (item, baris) diurutkan per item; item kembar dalam satu baris dibuang
+        items = compiled.array("equipment.codes").astype(np.int64)
+        rows = np.repeat(np.arange(self.size), np.diff(compiled.array("equipment.offsets")))
+        order = np.lexsort((rows, items))
+        items, rows = items[order], rows[order]
+        keep = np.ones(len(items), dtype=bool)
+        keep[1:] = (items[1:] != items[:-1]) | (rows[1:] != rows[:-1])
+        items, rows = items[keep], rows[keep]
+        bounds = np.flatnonzero(np.diff(items)) + 1
+        equipment = compiled.dictionary("equipment")
+        self.equipment_index: Dict[str, np.ndarray] = {
+            equipment[group[0]]: _frozen(group_rows)
+            for group, group_rows in zip(np.split(items, bounds), np.split(rows, bounds)) if len(group)
+        }
+
+        self._derived = {}
+        self._derived_lock = RLock()
+
+    def records(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) <= _ROW_RECORDS_LIMIT:
+            return [self.compiled.record(int(i)) for i in rows]
+        # banyak baris (mis. semua model `ExerciseOut`): decode per kolom sekaligus
+        names = [c["name"] for c in self.compiled.header["columns"]]
+        columns = [self.compiled.column(name) for name in names]
+        picked = rows.tolist()
+        return [dict(zip(names, values)) for values in zip(*([col[i] for i in picked] for col in columns))]
+
+    def column(self, name: str) -> Optional[List[Any]]:
+        return self.compiled.column(name)
+
+    def encoded_columns(self) -> Tuple[List[Dict[str, Any]], List[Tuple[str, np.ndarray]]]:
+        # array artefak sudah dalam layout yang sama: salin apa adanya
+        columns = self.compiled.header["columns"]
+        return columns, [(f"{c['name']}.{part}", self.compiled.array(f"{c['name']}.{part}"))
+                         for c in columns for part in c["arrays"]]
+
+
+def load_catalog(path: str) -> ExerciseCatalog:
+    """Katalog dataset `path`: dari artefak biner bila valid, selain itu dari CSV."""
+    compiled = open_artifact(path)
+    if compiled is not None:
+        return BinaryCatalog(compiled)
+    df, version = read_dataset(path)
+    return ExerciseCatalog(df, version=version)
+
+
+# ================= Store katalog + hot reload =================
+class CatalogStore:
+    """
+    Memegang katalog aktif untuk satu dataset (CSV + artefak biner
+    opsional). Thread background memeriksa mtime/ukuran file tiap
+    `interval` detik; bila isinya berubah (hash berbeda), katalog baru dibangun + di‑warm di thread itu juga, lalu
+    referensinya ditukar sekaligus. Request yang sedang berjalan tetap
+    memakai objek katalog yang sudah dipegangnya.
+    """
+
+    def __init__(self, path: str, interval: int = 0):
+        self.path = path
+        self.interval = interval
+        self._catalog: Optional[ExerciseCatalog] = None
+        self._stamp: Optional[Stamp] = None
+        self._lock = Lock()
+        self._warmers: List[Callable[[ExerciseCatalog], Any]] = []
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        self.reloads = 0
+        self.failures = 0
+
+    def on_load(self, fn: Callable[[ExerciseCatalog], Any]) -> None:
+        """Daftarkan builder struktur turunan yang dijalankan sebelum swap."""
+        self._warmers.append(fn)
+
+    def get(self) -> ExerciseCatalog:
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._catalog, self._stamp = self._build()
+                catalog = self._catalog
+        return catalog
+
+    def _build(self) -> Tuple[ExerciseCatalog, Stamp]:
+        # stat sebelum baca: jika file berubah saat dibaca, cek berikutnya memuat ulang
+        stamp = source_stamp(self.path)
+        catalog = None
+        if CATALOG_SHARED:
+            # impor lokal: catalog_shared memakai ExerciseCatalog dari modul ini
+            from app.services.catalog_shared import load_shared
+            try:
+                catalog = load_shared(self.path)
+            except Exception as exc:
+                print(f"[catalog] segmen bersama {self.path} gagal, dibangun di proses ini: {exc!r}")
+        if catalog is None:
+            catalog = load_catalog(self.path)
+        for warm in self._warmers:
+            warm(catalog)
+        return catalog, stamp
+
+    def check(self) -> bool:
+        """Muat ulang jika isi file berubah; True jika katalog ditukar."""
+        if self._catalog is None:
+            self.get()
+            return False
+        stamp = None
+        try:
+            stamp = source_stamp(self.path)
+            if stamp == self._stamp:
+                return False
+            with self._lock:
+                if source_version(self.path) == self._catalog.version:
+                    self._stamp = stamp           # di‑touch tanpa perubahan isi
+                    return False
+                catalog, stamp = self._build()
+                self._catalog, self._stamp = catalog, stamp
+                self.reloads += 1
+        except Exception as exc:                  # file sedang ditulis / rusak: pakai yang lama
+            if stamp is not None:
+                self._stamp = stamp               # coba lagi setelah file berubah lagi
+            self.failures += 1
+            print(f"[catalog] reload {self.path} gagal: {exc!r}")
+            return False
+        print(f"[catalog] {self.path} dimuat ulang, versi {catalog.version} ({catalog.size} latihan)")
+        return True
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._watch, name="catalog-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stats(self) -> Dict[str, Any]:
+        catalog = self._catalog
+        return {
+            "version": catalog.version if catalog else "",
+            "size": catalog.size if catalog else 0,
+            "reloads": self.reloads,
+            "failures": self.failures,
+        }
+
+
+catalog_store = CatalogStore(DATASET_PATH, interval=CATALOG_RELOAD_INTERVAL)
+
+
+def get_catalog() -> ExerciseCatalog:
+    """Snapshot katalog aktif; pegang referensinya selama satu request."""
+    return catalog_store.get()
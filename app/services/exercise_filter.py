@@ -4,10 +4,16 @@ tanpa mengubah perhitungan apa pun. Semua print diganti _log() agar
 bisa dimatikan di production.
 """
 
-from typing import Dict, List, Set
-import pandas as pd
+from typing import Dict, FrozenSet, List, Set, Tuple
+from threading import Lock
+import numpy as np
 import os
 
+from app.config import POOL_CACHE_SIZE
+from app.services.cache import LRUCache
+from app.services.exercise_catalog import ExerciseCatalog, FOCUS_GROUPS
+from app.services import metrics
+
 # Toggle debug log via env var DEBUG=1
 DEBUG = os.getenv("DEBUG", "0") == "1"
 def _log(*args, **kwargs):
@@ -63,48 +69,11 @@ def is_exercise_focus(exercise_body_part: str, day_focus: str) -> bool:
     bp = exercise_body_part.lower()
     focus = day_focus.lower()
 
-    neck = {"neck"}
-    shoulders = {"shoulders"}
-    chest = {"chest"}
-    back = {"back"}
-    abs_ = {"abs"}
-    biceps = {"biceps"}
-    triceps = {"triceps"}
-    forearms = {"forearms"}
-    glutes = {"glutes"}
-    quads = {"quadriceps"}
-    hams = {"hamstrings"}
-    calves = {"calves"}
-    cardio = {"cardio"}
-
-    upper = chest | biceps | triceps | back | shoulders | forearms | neck | abs_
-    lower = quads | glutes | calves | hams
-    push = chest | triceps | shoulders
-    pull = back | biceps | forearms | neck
-    legs = quads | glutes | calves | hams
-
-    male_focus = chest | shoulders | biceps | triceps | back | abs_
-    female_focus = glutes | quads | hams | abs_
-
-    if focus == "upper":
-        return bp in upper
-    if focus == "lower":
-        return bp in lower
-    if focus == "push":
-        return bp in push
-    if focus == "pull":
-        return bp in pull
-    if focus == "legs":
-        return bp in legs
     if focus == "fullbody":
         return True
-    if focus == "cardio":
-        return bp == "cardio"
-    if focus == "male_focus":
-        return bp in male_focus
-    if focus == "female_focus":
-        return bp in female_focus
-    # fallback: fokus spesifik body part
+    if focus in FOCUS_GROUPS:
+        return bp in FOCUS_GROUPS[focus]
+    # fallback: fokus spesifik body part (termasuk cardio)
     return bp == focus
 
 
@@ -122,85 +91,139 @@ def _map_injury_to_body_parts(injuries: List[str]) -> Set[str]:
     return mapped
 
 
-# =============== Filter util ===============
-def _equipment_filter(eq_list: List[str], preferred: List[str]) -> bool:
-    # Selalu izinkan body weight
-    return ("body weight" in eq_list) or any(eq in preferred for eq in eq_list)
-
-
-def _filter_by_focus(df: pd.DataFrame, focus: str) -> pd.DataFrame:
-    if focus.lower() == "cardio":
-        return df[df["body_part"].str.lower() == "cardio"]
-    return df[df["body_part"].str.lower().apply(lambda bp: is_exercise_focus(bp, focus))]
-
-
 # =============== Core: get_daily_exercise =================
 def _get_daily_exercise(
-    df: pd.DataFrame,
+    catalog: ExerciseCatalog,
     focus: str,
     injuries: Set[str],
     preferred_equipment: List[str],
     min_required: int,
-) -> pd.DataFrame:
+) -> np.ndarray:
     preferred_equipment = preferred_equipment or []
 
     # 1. Hindari cedera
     if injuries:
-        df_filtered = df[~df["body_part"].str.lower().isin(injuries)]
+        rows_filtered = np.setdiff1d(
+            catalog.all_rows, catalog.rows_for_body_parts(injuries), assume_unique=True
+        )
     else:
-        df_filtered = df
+        rows_filtered = catalog.all_rows
 
     # 2. Fokus hari
-    df_focus = _filter_by_focus(df_filtered, focus)
+    rows_focus = np.intersect1d(rows_filtered, catalog.rows_for_focus(focus), assume_unique=True)
 
-    # 3. Filter alat kecuali body weight
+    # 3. Filter alat kecuali body weight (selalu diizinkan)
     if preferred_equipment:
-        df_focus_eq = df_focus[
-            df_focus["equipment"].apply(lambda eq: _equipment_filter(eq, preferred_equipment))
-        ]
+        allowed = catalog.rows_with_equipment({*preferred_equipment, "body weight"})
+        rows_focus_eq = np.intersect1d(rows_focus, allowed, assume_unique=True)
     else:
-        df_focus_eq = df_focus
+        rows_focus_eq = rows_focus
 
     # 4. Fallback bertingkat
-    if len(df_focus_eq) >= min_required:
-        return df_focus_eq.reset_index(drop=True)
+    if len(rows_focus_eq) >= min_required:
+        return rows_focus_eq
+
+    rows_bodyweight = np.intersect1d(
+        rows_focus, catalog.rows_with_equipment(["body weight"]), assume_unique=True
+    )
+    if len(rows_bodyweight) >= min_required:
+        return rows_bodyweight
+
+    if len(rows_focus) >= min_required:
+        return rows_focus
+
+    if len(rows_filtered) >= min_required:
+        return rows_filtered
+
+    return catalog.all_rows
+
+
+# =============== Cache pool harian =================
+# Pool hanya bergantung pada (fokus, body part cedera, set alat,
+# min_required) dan versi dataset — aman dipakai ulang antar request.
+PoolKey = Tuple[str, FrozenSet[str], FrozenSet[str], int]
+
+_pool_cache = LRUCache(maxsize=POOL_CACHE_SIZE)
+_pool_cache_version = None
+_pool_cache_lock = Lock()
+
 
-    df_bodyweight = df_focus[df_focus["equipment"].apply(lambda eq: "body weight" in eq)]
-    if len(df_bodyweight) >= min_required:
-        return df_bodyweight.reset_index(drop=True)
+def _pool_key(focus: str, injuries: Set[str], preferred_equipment: List[str],
+              min_required: int) -> PoolKey:
+    return (
+        focus.lower(),
+        frozenset(injuries),
+        frozenset(preferred_equipment or []),
+        min_required,
+    )
 
-    if len(df_focus) >= min_required:
-        return df_focus.reset_index(drop=True)
 
-    if len(df_filtered) >= min_required:
-        return df_filtered.reset_index(drop=True)
+def _cached_daily_exercise(catalog: ExerciseCatalog, key: PoolKey) -> np.ndarray:
+    global _pool_cache_version
+    if _pool_cache_version != catalog.version:
+        with _pool_cache_lock:
+            if _pool_cache_version != catalog.version:
+                _pool_cache.clear()
+                _pool_cache_version = catalog.version
 
-    return df.reset_index(drop=True)
+    versioned_key = (catalog.version,) + key
+    rows = _pool_cache.get(versioned_key)
+    metrics.count("pool_cache_hit" if rows is not None else "pool_cache_miss")
+    if rows is None:
+        focus, injuries, preferred_equipment, min_required = key
+        rows = _get_daily_exercise(catalog, focus, set(injuries),
+                                   sorted(preferred_equipment), min_required)
+        rows.setflags(write=False)       # dibagi antar request
+        _pool_cache.put(versioned_key, rows)
+    return rows
+
+
+def pool_cache_info() -> Dict[str, int]:
+    """Counter cache pool (size, hits, misses, evictions, invalidations)."""
+    return _pool_cache.stats()
+
+
+def clear_pool_cache() -> None:
+    _pool_cache.clear()
+
+
+def daily_pool_keys(
+    schedule: dict,
+    catalog: ExerciseCatalog,
+    injuries: List[str],
+    preferred_equipment: List[str],
+    min_required: int = 5,
+) -> Dict[str, Tuple]:
+    """
+    Kunci cache (termasuk versi katalog) pool tiap hari dari `build_daily_pool`
+    dengan argumen yang sama; identitas pool tanpa menyentuh isinya.
+    """
+    injured_parts = _map_injury_to_body_parts(injuries)
+    return {
+        day_key: (catalog.version,) + _pool_key(focus, injured_parts, preferred_equipment, min_required)
+        for day_key, focus in schedule.items()
+    }
 
 
 # =============== Public API: build_daily_pool =================
 def build_daily_pool(
     schedule: dict,
-    df_all: pd.DataFrame,
+    catalog: ExerciseCatalog,
     injuries: List[str],
     preferred_equipment: List[str],
     min_required: int = 5,
-) -> Dict[str, pd.DataFrame]:
+) -> Dict[str, np.ndarray]:
     """
-    Menghasilkan dict {day_key: DataFrame-pool} untuk setiap hari
-    sesuai hasil Rule‑Based Engine.
+    Menghasilkan dict {day_key: array indeks baris katalog} untuk setiap
+    hari sesuai hasil Rule‑Based Engine. Pool diambil dari cache LRU bila
+    kombinasi filter yang sama sudah pernah dihitung.
     """
     injured_parts = _map_injury_to_body_parts(injuries)
-    daily_pool: Dict[str, pd.DataFrame] = {}
+    daily_pool: Dict[str, np.ndarray] = {}
 
     for day_key, focus in schedule.items():
         _log(f"[FILTER] {day_key=}, {focus=}")
-        daily_pool[day_key] = _get_daily_exercise(
-            df=df_all,
-            focus=focus,
-            injuries=injured_parts,
-            preferred_equipment=preferred_equipment,
-            min_required=min_required,
-        )
+        key = _pool_key(focus, injured_parts, preferred_equipment, min_required)
+        daily_pool[day_key] = _cached_daily_exercise(catalog, key)
 
-    return daily_pool
\ No newline at end of file
+    return daily_pool
@@ -0,0 +1,195 @@
+"""
+Engine GA NumPy murni sebagai alternatif pygad.
+
+Masalah kita kecil (3–6 gene, populasi 20, ±25 generasi), sehingga
+overhead per generasi pygad (callback per solusi, loop perbaikan gene
+duplikat, bookkeeping) mendominasi. Di sini populasi adalah matriks int
+(n_solusi x n_gene) dan semua operator — seleksi turnamen, crossover
+uniform, mutasi random, perbaikan gene duplikat — berjalan sebagai
+operasi array. Semantik mengikuti konfigurasi pygad yang dipakai
+`run_ga_schedule`:
+
+  elitism          seperti pygad 3.x: `keep_elitism` (default 1) solusi
+                   terbaik populasi dibawa ke generasi berikutnya;
+                   `keep_parents` hanya berlaku bila `keep_elitism=0`
+  saturate_N       dicek setelah generasi ke‑N selesai, membandingkan
+                   fitness terbaik populasi generasi (selesai − N) dan
+                   (selesai − 1), persis seperti pygad
+  on_generation    mengembalikan "stop" menghentikan run
+
+Operatornya setara secara distribusi, bukan identik per seed: RNG dan
+urutan pengambilan angka acak berbeda dengan pygad.
+"""
+
+from typing import Any, Callable, List, Optional, Sequence
+import numpy as np
+
+# fitness(populasi, generasi_selesai) -> skor per baris
+BatchFitness = Callable[[np.ndarray, int], np.ndarray]
+
+# Di atas ukuran ini perbaikan duplikat memakai rejection sampling per baris
+_DENSE_REPAIR_LIMIT = 4096
+
+
+def _parse_saturate(stop_criteria: Optional[Sequence[str]]) -> Optional[int]:
+    for criterion in stop_criteria or []:
+        name, _, value = criterion.partition("_")
+        if name == "saturate":
+            return int(value)
+    return None
+
+
+class NumpyGA:
+    def __init__(
+        self,
+        num_genes: int,
+        gene_space_size: int,
+        fitness_func: BatchFitness,
+        num_generations: int = 25,
+        sol_per_pop: int = 20,
+        num_parents_mating: int = 8,
+        keep_parents: int = 3,
+        keep_elitism: int = 1,
+        mutation_percent_genes: float = 12,
+        k_tournament: int = 3,
+        allow_duplicate_genes: bool = False,
+        stop_criteria: Optional[Sequence[str]] = ("saturate_5",),
+        initial_population: Optional[np.ndarray] = None,
+        on_generation: Optional[Callable[["NumpyGA"], Any]] = None,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        self.num_genes = num_genes
+        self.gene_space_size = gene_space_size
+        self.fitness_func = fitness_func
+        self.num_generations = num_generations
+        self.sol_per_pop = sol_per_pop
+        self.num_parents_mating = num_parents_mating
+        self.keep_elitism = min(keep_elitism, sol_per_pop)
+        self.keep_parents = min(keep_parents, sol_per_pop)       # hanya bila keep_elitism == 0
+        self.mutation_num_genes = max(1, int(round(num_genes * mutation_percent_genes / 100)))
+        self.k_tournament = k_tournament
+        # Tanpa duplikat hanya mungkin jika pool >= jumlah gene
+        self.unique_genes = not allow_duplicate_genes and gene_space_size >= num_genes
+        self.saturate = _parse_saturate(stop_criteria)
+        self.initial_population = initial_population
+        self.on_generation = on_generation
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.population: Optional[np.ndarray] = None
+        self.last_generation_fitness: Optional[np.ndarray] = None
+        self.best_solutions_fitness: List[float] = []
+        self.generations_completed = 0
+
+    # ──────────────────────────────────────────────────────────
+    # Operator
+    def _random_population(self, n: int) -> np.ndarray:
+        pop = self.rng.integers(0, self.gene_space_size, size=(n, self.num_genes))
+        return self._repair(pop)
+
+    def _repair(self, pop: np.ndarray) -> np.ndarray:
+        """Ganti gene duplikat dalam satu solusi dengan nilai acak yang belum dipakai."""
+        if not self.unique_genes or self.num_genes < 2:
+            return pop
+        ordered = np.sort(pop, axis=1)
+        rows = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if rows.size == 0:
+            return pop
+
+        sub = pop[rows]
+        # gene yang nilainya sudah muncul di posisi sebelumnya
+        same = sub[:, :, None] == sub[:, None, :]
+        dup = np.tril(same, -1).any(axis=2)
+
+        if self.gene_space_size <= _DENSE_REPAIR_LIMIT:
+            keys = self.rng.random((len(rows), self.gene_space_size))
+            keys[np.arange(len(rows))[:, None], sub] = 2.0     # nilai terpakai di akhir
+            unused = np.argsort(keys, axis=1)[:, :self.num_genes]
+            rank = np.cumsum(dup, axis=1) - 1
+            r, c = np.nonzero(dup)
+            sub[r, c] = unused[r, rank[r, c]]
+        else:
+            for i, row in enumerate(sub):
+                used = set(row[~dup[i]].tolist())
+                for j in np.flatnonzero(dup[i]):
+                    value = int(self.rng.integers(self.gene_space_size))
+                    while value in used:
+                        value = int(self.rng.integers(self.gene_space_size))
+                    row[j] = value
+                    used.add(value)
+
+        pop[rows] = sub
+        return pop
+
+    def _select_parents(self, fitness: np.ndarray) -> np.ndarray:
+        """Indeks parent hasil seleksi turnamen."""
+        candidates = self.rng.integers(0, len(fitness), size=(self.num_parents_mating, self.k_tournament))
+        return candidates[np.arange(self.num_parents_mating), fitness[candidates].argmax(axis=1)]
+
+    def _survivors(self, fitness: np.ndarray, parents: np.ndarray) -> np.ndarray:
+        """Indeks solusi yang dibawa ke generasi berikutnya (aturan pygad)."""
+        if self.keep_elitism > 0:
+            return np.argsort(-fitness, kind="stable")[:self.keep_elitism]
+        if self.keep_parents == -1:
+            return parents
+        return np.argsort(-fitness, kind="stable")[:self.keep_parents]
+
+    def _n_survivors(self) -> int:
+        if self.keep_elitism > 0:
+            return self.keep_elitism
+        return self.num_parents_mating if self.keep_parents == -1 else self.keep_parents
+
+    def _crossover(self, parents: np.ndarray, n_offspring: int) -> np.ndarray:
+        idx = np.arange(n_offspring) % len(parents)
+        first, second = parents[idx], parents[(idx + 1) % len(parents)]
+        mask = self.rng.random((n_offspring, self.num_genes)) < 0.5
+        return np.where(mask, first, second)
+
+    def _mutate(self, offspring: np.ndarray) -> np.ndarray:
+        n = len(offspring)
+        positions = np.argsort(self.rng.random((n, self.num_genes)), axis=1)[:, :self.mutation_num_genes]
+        values = self.rng.integers(0, self.gene_space_size, size=positions.shape)
+        offspring[np.arange(n)[:, None], positions] = values
+        return offspring
+
+    # ──────────────────────────────────────────────────────────
+    # Loop utama
+    def run(self) -> None:
+        if self.initial_population is not None:
+            pop = self._repair(np.array(self.initial_population, dtype=np.int64))
+        else:
+            pop = self._random_population(self.sol_per_pop)
+        fitness = np.asarray(self.fitness_func(pop, 0), dtype=float)
+
+        n_offspring = len(pop) - self._n_survivors()
+        for generation in range(self.num_generations):
+            self.best_solutions_fitness.append(float(fitness.max()))
+
+            parents = self._select_parents(fitness)
+            offspring = self._repair(self._mutate(self._crossover(pop[parents], n_offspring)))
+            kept = self._survivors(fitness, parents)
+
+            self.generations_completed = generation + 1
+            # fitness solusi yang dibawa dipakai ulang, hanya offspring yang dinilai
+            pop = np.concatenate([pop[kept], offspring])
+            fitness = np.concatenate([
+                fitness[kept],
+                np.asarray(self.fitness_func(offspring, self.generations_completed), dtype=float),
+            ])
+
+            if self.on_generation is not None and self.on_generation(self) == "stop":
+                break
+            # best_solutions_fitness[g] = terbaik populasi awal generasi g; seperti
+            # pygad, populasi yang baru dinilai belum ikut dibandingkan
+            if self.saturate and self.generations_completed >= self.saturate \
+                    and self.best_solutions_fitness[self.generations_completed - self.saturate] \
+                    == self.best_solutions_fitness[-1]:
+                break
+
+        self.best_solutions_fitness.append(float(fitness.max()))
+        self.population = pop
+        self.last_generation_fitness = fitness
+
+    def best_solution(self):
+        """(gene, fitness, indeks) terbaik di populasi terakhir, seperti pygad."""
+        idx = int(np.argmax(self.last_generation_fitness))
+        return self.population[idx], float(self.last_generation_fitness[idx]), idx
@@ -4,12 +4,31 @@ Parameter GA dan aturan diadopsi dari ipynb versi terbaru.
 Output fungsi hanya daywise_schedule (minimalis untuk backend API).
 """
 
-from typing import Dict, List, Set
+from typing import TYPE_CHECKING, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
 import numpy as np
-import pandas as pd
-import pygad
 import os
 from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from math import comb
+from threading import Condition, Lock
+import multiprocessing
+import random
+import time
+
+from app.config import (
+    EXACT_SEARCH_LIMIT, GA_DAY_PARALLELISM, GA_DAY_WORKERS, GA_ENGINE, GA_FITNESS_MEMO,
+    GA_PROFILE, GA_TIME_BUDGET_MS, GA_WARM_START_SHARE, OPTIMIZER,
+)
+from app.services.catalog_shared import SharedCatalog, register_shared
+from app.services.elite_store import ELITES_PER_KEY, elite_store, pool_key
+from app.services.exercise_catalog import ExerciseCatalog, catalog_store, get_catalog
+from app.services import metrics
+from app.services.ga_engine import NumpyGA
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pygad
 
 # ────────────────────────────────────────────────────────────────
 DEBUG = os.getenv("DEBUG", "0") == "1"
@@ -39,24 +58,24 @@ cardio_priority_keywords = {"run", "walk", "jog"}
 def penalty_duplicate(dup_count: int) -> int:
     return 2 * dup_count
 
+glossary_expected_parts = {
+    "upper": {"neck", "shoulders", "chest", "back", "abs", "biceps", "triceps", "forearms"},
+    "lower": {"glutes", "quadriceps", "hamstrings", "calves"},
+    "push": {"shoulders", "chest", "triceps"},
+    "pull": {"back", "biceps", "forearms", "neck"},
+    "legs": {"glutes", "quadriceps", "hamstrings", "calves", "abs"},
+    "fullbody": {
+        "neck", "shoulders", "chest", "back", "abs", "biceps", "triceps",
+        "forearms", "glutes", "quadriceps", "hamstrings", "calves",
+    },
+}
+
 def check_body_part_variation(seen_parts: List[str], day_focus: str,
-                              injured_parts: Set[str], df_subset: pd.DataFrame) -> int:
+                              injured_parts: Set[str], df_subset: "pd.DataFrame") -> int:
     unique_parts = set(seen_parts)
     part_counts = Counter(seen_parts)
     most_common_count = part_counts.most_common(1)[0][1] if part_counts else 0
 
-    glossary_expected_parts = {
-        "upper": {"neck", "shoulders", "chest", "back", "abs", "biceps", "triceps", "forearms"},
-        "lower": {"glutes", "quadriceps", "hamstrings", "calves"},
-        "push": {"shoulders", "chest", "triceps"},
-        "pull": {"back", "biceps", "forearms", "neck"},
-        "legs": {"glutes", "quadriceps", "hamstrings", "calves", "abs"},
-        "fullbody": {
-            "neck", "shoulders", "chest", "back", "abs", "biceps", "triceps",
-            "forearms", "glutes", "quadriceps", "hamstrings", "calves",
-        },
-    }
-
     penalty = 0
     glossary_parts = glossary_expected_parts.get(day_focus, set())
     available_parts = set(df_subset["body_part"].str.lower().unique())
@@ -80,7 +99,7 @@ def check_body_part_variation(seen_parts: List[str], day_focus: str,
 
     return penalty
 
-def check_muscle_variation(solution_indices: List[int], df_subset: pd.DataFrame,
+def check_muscle_variation(solution_indices: List[int], df_subset: "pd.DataFrame",
                            day_focus: str) -> int:
     primary_muscles, secondary_muscles = [], []
     for idx in solution_indices:
@@ -109,7 +128,7 @@ def is_cardio_exercise(ex_name: str) -> bool:
     return any(k in ex_lower for k in cardio_priority_keywords)
 
 def _make_fitness_func(day_focus: str, injured_parts: Set[str],
-                       df_subset: pd.DataFrame, preferred_parts: Set[str],
+                       df_subset: "pd.DataFrame", preferred_parts: Set[str],
                        bmi: float):
     focus_lower = day_focus.lower()
     is_fokus_split = focus_lower in split_fokus_body_part
@@ -188,6 +207,309 @@ def _make_fitness_func(day_focus: str, injured_parts: Set[str],
 
     return fitness_func
 
+# ================= Konteks numerik per pool (fitness batch) =================
+class _PoolContext(NamedTuple):
+    """
+    Representasi numerik satu pool harian. Semua bagian skor yang hanya
+    bergantung pada satu latihan sudah dijumlahkan di `base`, sehingga
+    fitness satu populasi cukup berupa operasi array.
+    """
+    base: np.ndarray          # skor per latihan (cedera, fokus, preferensi, cardio)
+    code: np.ndarray          # kode integer body part
+    slot: np.ndarray          # bobot slot cardio (4 run, 3 indoor, 1 lainnya)
+    run: np.ndarray           # flag latihan run
+    indoor: np.ndarray        # flag latihan cardio indoor
+    primary: np.ndarray       # bitmask otot primer, shape (n, n_words)
+    secondary: np.ndarray     # bitmask otot sekunder, shape (n, n_words)
+    n_available: int          # jumlah body part glossary yang tersedia di pool
+    exercises_per_day: int
+
+
+def _muscle_list(raw) -> List[str]:
+    items = raw.split("|") if isinstance(raw, str) else (raw or [])
+    return [m.strip().lower() for m in items if m]
+
+
+def _muscle_bitmasks(rows: List[List[str]], vocab: Dict[str, int], n_words: int) -> np.ndarray:
+    masks = np.zeros((len(rows), n_words), dtype=np.uint64)
+    for i, muscles in enumerate(rows):
+        for m in muscles:
+            bit = vocab[m]
+            masks[i, bit // 64] |= np.uint64(1 << (bit % 64))
+    return masks
+
+
+class _ExerciseFeatures(NamedTuple):
+    """Fitur per baris katalog yang tidak bergantung pada request."""
+    code: np.ndarray          # indeks ke `catalog.body_part_names`
+    keyword: np.ndarray       # cardio dengan keyword run/walk/jog
+    slot: np.ndarray
+    run: np.ndarray
+    indoor: np.ndarray
+    primary: np.ndarray
+    secondary: np.ndarray
+
+
+def _build_features(catalog: ExerciseCatalog) -> _ExerciseFeatures:
+    n = catalog.size
+    body_parts = [catalog.body_part_names[c] for c in catalog.body_code]
+    names = [name.lower() for name in catalog.column("exercise_name")]
+
+    keyword = np.zeros(n, dtype=bool)
+    slot = np.ones(n, dtype=np.int64)
+    run = np.zeros(n, dtype=bool)
+    indoor = np.zeros(n, dtype=bool)
+    for i, (bp, name) in enumerate(zip(body_parts, names)):
+        if bp != "cardio":
+            continue
+        keyword[i] = is_cardio_exercise(name)
+        if any(r in name for r in cardio_run_exercises):
+            run[i], slot[i] = True, 4
+        elif any(r in name for r in cardio_indoor_exercises):
+            indoor[i], slot[i] = True, 3
+
+    primary = catalog.column("primary_muscle")
+    secondary = catalog.column("secondary_muscle")
+    primary_rows = [_muscle_list(v) for v in primary] if primary is not None else [[] for _ in range(n)]
+    secondary_rows = [_muscle_list(v) for v in secondary] if secondary is not None else [[] for _ in range(n)]
+    vocab: Dict[str, int] = {}
+    for muscles in primary_rows + secondary_rows:
+        for m in muscles:
+            vocab.setdefault(m, len(vocab))
+    n_words = max(1, -(-len(vocab) // 64))
+
+    return _ExerciseFeatures(
+        code=catalog.body_code,
+        keyword=keyword,
+        slot=slot,
+        run=run,
+        indoor=indoor,
+        primary=_muscle_bitmasks(primary_rows, vocab, n_words),
+        secondary=_muscle_bitmasks(secondary_rows, vocab, n_words),
+    )
+
+
+def _export_features(catalog: ExerciseCatalog) -> Dict[str, np.ndarray]:
+    feats = catalog.derived("ga_features", _build_features)
+    return {name: getattr(feats, name) for name in _ExerciseFeatures._fields if name != "code"}
+
+
+def _attach_features(catalog: SharedCatalog) -> _ExerciseFeatures:
+    return _ExerciseFeatures(code=catalog.body_code, **catalog.field_arrays("ga_features"))
+
+
+register_shared("ga_features", _attach_features, _export_features)
+
+
+def prepare_catalog(catalog: ExerciseCatalog) -> None:
+    """Hitung fitur GA katalog di muka (mis. saat worker start)."""
+    catalog.derived("ga_features", _build_features)
+
+
+# Katalog hasil hot reload sudah punya fitur GA sebelum dipakai request
+catalog_store.on_load(prepare_catalog)
+
+
+def _build_pool_context(day_focus: str, injured_parts: Set[str],
+                        catalog: ExerciseCatalog, rows: np.ndarray,
+                        preferred_parts: Set[str], bmi: float) -> _PoolContext:
+    focus_lower = day_focus.lower()
+    is_fokus_split = focus_lower in split_fokus_body_part
+    is_cardio_split = focus_lower in split_cardio
+    exercises_per_day = 4 if is_fokus_split else 3 if is_cardio_split else 5
+
+    feats: _ExerciseFeatures = catalog.derived("ga_features", _build_features)
+
+    # Skor per body part (cedera, fokus hari, preferensi) sebagai lookup table
+    part_score = np.array([
+        (-5 if bp in injured_parts else 0)
+        + (2 if (bp == day_focus or bp in day_focus) else -3)
+        + (1 if bp in preferred_parts else 0)
+        for bp in catalog.body_part_names
+    ], dtype=np.int64)
+
+    code = feats.code[rows]
+    base = part_score[code]
+    # Skor cardio jika BMI < 30
+    if bmi < 30.0:
+        base = base + 2 * feats.keyword[rows]
+
+    glossary_parts = glossary_expected_parts.get(focus_lower, set())
+    pool_parts = {catalog.body_part_names[c] for c in np.unique(code)}
+
+    return _PoolContext(
+        base=base,
+        code=code,
+        slot=feats.slot[rows],
+        run=feats.run[rows],
+        indoor=feats.indoor[rows],
+        primary=feats.primary[rows],
+        secondary=feats.secondary[rows],
+        n_available=len(glossary_parts & pool_parts),
+        exercises_per_day=exercises_per_day,
+    )
+
+
+def _combine_scores(ctx: _PoolContext, n_genes: int, base_sum, n_unique, most_common,
+                    n_primary, n_secondary, run_cnt, indoor_cnt, slots) -> np.ndarray:
+    """Gabungkan agregat per solusi menjadi skor akhir (tanpa noise)."""
+    score = base_sum.astype(np.int64)
+
+    # Variasi body part
+    if ctx.n_available >= 3:
+        variation = np.where(n_unique < 3, MAX_PENALTY, 0)
+        variation += np.where(most_common >= 4, MAX_PENALTY, 0)
+        variation -= np.select([n_unique == 3, n_unique == 4, n_unique >= 5], [2, 3, 5], 0)
+    else:
+        variation = np.where(n_unique < 2, MAX_PENALTY, 0)
+    score -= variation
+
+    # Variasi otot
+    score -= 3 * np.clip(2 - n_primary.astype(np.int64), 0, None)
+    score -= np.clip(2 - n_secondary.astype(np.int64), 0, None)
+
+    # Duplikat body part
+    score -= penalty_duplicate(n_genes - n_unique)
+
+    # Run/indoor berlebih
+    score -= np.where((run_cnt > 1) | ((run_cnt == 1) & (n_genes > 1)), MAX_PENALTY, 0)
+    score -= np.where((indoor_cnt > 1) | ((indoor_cnt == 1) & (n_genes > 2)), MAX_PENALTY, 0)
+
+    # Slot cardio melebihi ekspektasi
+    score -= np.clip(slots - ctx.exercises_per_day, 0, None) * 2
+
+    return (BASE_SCORE + score).astype(float)
+
+
+def _score_population(ctx: _PoolContext, population: np.ndarray) -> np.ndarray:
+    """
+    Skor tanpa noise untuk seluruh populasi (shape: n_solusi x n_gene).
+    Hasilnya identik dengan `_make_fitness_func` di luar noise generasi 0.
+    """
+    pop = np.asarray(population, dtype=np.int64)
+    codes = ctx.code[pop]
+    codes_sorted = np.sort(codes, axis=1)
+    return _combine_scores(
+        ctx,
+        n_genes=pop.shape[1],
+        base_sum=ctx.base[pop].sum(axis=1),
+        n_unique=1 + (codes_sorted[:, 1:] != codes_sorted[:, :-1]).sum(axis=1),
+        most_common=(codes[:, :, None] == codes[:, None, :]).sum(axis=2).max(axis=1),
+        n_primary=np.bitwise_count(np.bitwise_or.reduce(ctx.primary[pop], axis=1)).sum(axis=1),
+        n_secondary=np.bitwise_count(np.bitwise_or.reduce(ctx.secondary[pop], axis=1)).sum(axis=1),
+        run_cnt=ctx.run[pop].sum(axis=1),
+        indoor_cnt=ctx.indoor[pop].sum(axis=1),
+        slots=ctx.slot[pop].sum(axis=1),
+    )
+
+
+def _score_completions(ctx: _PoolContext, fixed: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """
+    Skor `fixed ∪ {c}` untuk setiap kandidat c. Agregat `fixed` dihitung
+    sekali, lalu tiap kandidat cukup menambah kontribusinya (delta).
+    """
+    fixed = np.asarray(fixed, dtype=np.int64)
+    candidates = np.asarray(candidates, dtype=np.int64)
+    n_words = ctx.primary.shape[1]
+
+    counts = np.bincount(ctx.code[fixed], minlength=int(ctx.code.max()) + 1)
+    cand_counts = counts[ctx.code[candidates]]
+    primary = np.bitwise_or.reduce(ctx.primary[fixed], axis=0) if fixed.size \
+        else np.zeros(n_words, dtype=np.uint64)
+    secondary = np.bitwise_or.reduce(ctx.secondary[fixed], axis=0) if fixed.size \
+        else np.zeros(n_words, dtype=np.uint64)
+
+    return _combine_scores(
+        ctx,
+        n_genes=len(fixed) + 1,
+        base_sum=ctx.base[fixed].sum() + ctx.base[candidates],
+        n_unique=np.count_nonzero(counts) + (cand_counts == 0),
+        most_common=np.maximum(counts.max(initial=0), cand_counts + 1),
+        n_primary=np.bitwise_count(primary | ctx.primary[candidates]).sum(axis=1),
+        n_secondary=np.bitwise_count(secondary | ctx.secondary[candidates]).sum(axis=1),
+        run_cnt=ctx.run[fixed].sum() + ctx.run[candidates],
+        indoor_cnt=ctx.indoor[fixed].sum() + ctx.indoor[candidates],
+        slots=ctx.slot[fixed].sum() + ctx.slot[candidates],
+    )
+
+
+class _FitnessMemo:
+    """
+    Cache skor per run GA, dikunci tuple gene terurut — skor tidak
+    bergantung urutan gene. Elit, offspring kembar, dan hasil mutasi yang
+    kembali ke solusi lama tidak dinilai ulang; hanya solusi baru yang
+    masuk `_score_population` (satu panggilan per populasi).
+
+    Generasi 0 tidak membaca cache (skornya diberi noise), tetapi skor
+    bersihnya tetap disimpan untuk generasi berikutnya.
+    """
+    __slots__ = ("ctx", "scores", "hits", "misses")
+
+    def __init__(self, ctx: _PoolContext):
+        self.ctx = ctx
+        self.scores: Dict[tuple, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def score(self, population: np.ndarray, lookup: bool = True) -> np.ndarray:
+        pop = np.asarray(population, dtype=np.int64)
+        keys = list(map(tuple, np.sort(pop, axis=1).tolist()))
+        out = np.empty(len(keys), dtype=float)
+
+        # kunci baru -> baris pertama yang membawanya (kembar di batch dinilai sekali)
+        todo: Dict[tuple, int] = {}
+        for i, key in enumerate(keys):
+            cached = self.scores.get(key) if lookup else None
+            if cached is not None:
+                out[i] = cached
+            elif key not in todo:
+                todo[key] = i
+        if todo:
+            rows = np.fromiter(todo.values(), dtype=np.int64, count=len(todo))
+            fresh = _score_population(self.ctx, pop[rows])
+            self.scores.update(zip(todo, fresh.tolist()))
+            if len(todo) < len(keys):
+                out[:] = [self.scores[key] for key in keys]
+            else:
+                out[rows] = fresh
+        self.misses += len(todo)
+        self.hits += len(keys) - len(todo)
+        return out
+
+
+# Di atas ukuran ruang kombinasi ini run GA (±120 evaluasi) hampir tidak
+# pernah bertemu solusi yang sama; memo hanya menambah overhead.
+_MEMO_SPACE_LIMIT = 5_000
+
+
+def _use_memo(ctx: _PoolContext, num_genes: int) -> bool:
+    return GA_FITNESS_MEMO and comb(len(ctx.code), num_genes) <= _MEMO_SPACE_LIMIT
+
+
+def _make_batch_fitness_func(ctx: _PoolContext, rng: Optional[np.random.Generator] = None,
+                             memo: Optional[_FitnessMemo] = None):
+    """
+    Versi batch `_make_fitness_func` untuk `fitness_batch_size` pygad.
+    `rng` opsional agar noise generasi pertama bisa direproduksi; `memo`
+    opsional untuk memakai ulang skor solusi yang sudah pernah dinilai.
+    """
+    noise_source = rng if rng is not None else np.random
+
+    def fitness_func(ga_instance, solutions, _solution_indices):
+        solutions = np.atleast_2d(solutions)
+        if memo is not None:
+            scores = memo.score(solutions, lookup=ga_instance.generations_completed > 0)
+        else:
+            scores = _score_population(ctx, solutions)
+
+        # Noise negatif ringan di generasi pertama
+        if ga_instance.generations_completed == 0:
+            scores -= noise_source.uniform(2, 5, size=len(scores))
+
+        return scores
+
+    return fitness_func
+
 def should_add_preference_gene(focus_name: str, preferred_parts: Set[str]) -> bool:
     focus_name = focus_name.lower()
 
@@ -209,89 +531,650 @@ def should_add_preference_gene(focus_name: str, preferred_parts: Set[str]) -> bo
     overlap = preferred_parts & focus_map[focus_name]
     return len(overlap) >= 1
 
-def run_ga_schedule(
-    schedule: Dict[str, str],
-    daily_exercise_pool: Dict[str, pd.DataFrame],
-    injured_body_parts: List[str],
-    preferred_body_parts: List[str] = None,
-    bmi: float = 0.0,
-) -> Dict[str, Dict]:
-    injured_parts_set = set(map(str.lower, injured_body_parts or []))
-    preferred_parts_set = set(map(str.lower, preferred_body_parts or []))
+# ================= Profil GA & budget waktu =================
+class GAProfile(NamedTuple):
+    num_generations: int
+    sol_per_pop: int
+    num_parents_mating: int
+    keep_parents: int         # tanpa efek: kedua engine memakai keep_elitism=1 (default pygad)
+    mutation_percent_genes: int
+    stop_criteria: Optional[List[str]]
+    budget_ms: int            # budget seluruh jadwal, dibagi ke tiap hari
 
-    daywise_schedule: Dict[str, Dict] = {}
 
-    for day_key, focus in schedule.items():
-        df_day = daily_exercise_pool.get(day_key)
-        if df_day is None or df_day.empty:
-            _log(f"[GA] {day_key} pool kosong — dilewati.")
+GA_PROFILES: Dict[str, GAProfile] = {
+    "fast": GAProfile(10, 12, 5, 2, 12, ["saturate_3"], 150),
+    # konfigurasi produksi: 758ms, 584ms, 667ms, 563ms, 439ms via postman hit (local)
+    "balanced": GAProfile(25, 20, 8, 3, 12, ["saturate_5"], 1000),
+    # konfigurasi eksplorasi notebook: 41.81s, 50.54s via postman hit (local) tanpa budget
+    "quality": GAProfile(200, 60, 25, 5, 25, None, 3000),
+}
+
+
+def resolve_profile(name: Optional[str] = None) -> Tuple[str, GAProfile]:
+    name = (name or GA_PROFILE).lower()
+    if name not in GA_PROFILES:
+        raise ValueError(f"GA profile tidak dikenal: {name!r} (pilihan: {', '.join(GA_PROFILES)})")
+    return name, GA_PROFILES[name]
+
+
+def schedule_budget(profile: GAProfile, time_budget_ms: Optional[int] = None) -> Optional[float]:
+    """
+    Budget (detik) seluruh jadwal: budget profil, diperketat oleh budget
+    request dan batas deployment GA_TIME_BUDGET_MS. None = tanpa batas.
+    """
+    limits = [ms for ms in (profile.budget_ms, time_budget_ms, GA_TIME_BUDGET_MS) if ms and ms > 0]
+    return min(limits) / 1000 if limits else None
+
+
+class _Deadline:
+    """
+    Batas waktu satu hari GA. `check` dipasang sebagai `on_generation`
+    (pygad hanya menerima fungsi/method) dan mengembalikan "stop" setelah
+    budget habis; populasi terakhir sudah dinilai, jadi solusi terbaik
+    sejauh ini yang dipakai. Budget dihitung sejak hari mulai dijalankan.
+    """
+    __slots__ = ("at", "hit")
+
+    def __init__(self, budget: Optional[float]):
+        self.at = time.perf_counter() + budget if budget is not None else None
+        self.hit = False
+
+    def check(self, ga_instance) -> Optional[str]:
+        if self.at is not None and time.perf_counter() >= self.at:
+            self.hit = True
+            return "stop"
+        return None
+
+
+def day_gene_count(focus: str, preferred_parts: Set[str]) -> int:
+    """Jumlah latihan per hari: 4 (fokus body part), 3 (cardio), 5 (lainnya), +1 preferensi."""
+    base_genes = 4 if focus.lower() in split_fokus_body_part else 3 if focus.lower() in split_cardio else 5
+    bonus_gene = 1 if should_add_preference_gene(focus, preferred_parts) else 0
+    return base_genes + bonus_gene
+
+
+class _GlobalRngLock:
+    """
+    Lock bersama/eksklusif untuk RNG global NumPy/`random` yang dipakai pygad.
+
+    Run tanpa seed memegangnya bersama (boleh jalan paralel: urutan acak
+    mereka memang tidak perlu bisa diulang). Run ber‑seed memegangnya
+    eksklusif, karena angka yang diambil thread lain di tengah run akan
+    menggeser urutan acaknya — mis. rencana pemanasan tanpa seed yang
+    berjalan bersamaan dengan request pertama. Run ber‑seed yang menunggu
+    didahulukan dari run tanpa seed yang baru datang.
+    """
+
+    def __init__(self):
+        self._cond = Condition(Lock())
+        self._shared = 0
+        self._exclusive = False
+        self._waiting = 0       # run ber‑seed yang menunggu
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            self._cond.wait_for(lambda: not self._exclusive and not self._waiting)
+            self._shared += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._shared -= 1
+                if not self._shared:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._waiting += 1
+            self._cond.wait_for(lambda: not self._exclusive and not self._shared)
+            self._waiting -= 1
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive = False
+                self._cond.notify_all()
+
+
+_GLOBAL_RNG_LOCK = _GlobalRngLock()
+
+
+@contextmanager
+def _seeded_global_rng():
+    """
+    Run ber‑seed pygad (`random_seed`) menyetel RNG global. Run dijalankan
+    eksklusif, lalu state sebelumnya dikembalikan agar run tanpa seed
+    sesudahnya di proses yang sama tidak ikut bisa ditebak.
+    """
+    with _GLOBAL_RNG_LOCK.exclusive():
+        np_state, py_state = np.random.get_state(), random.getstate()
+        try:
+            yield
+        finally:
+            np.random.set_state(np_state)
+            random.setstate(py_state)
+
+
+def _day_seeds(seed: Optional[int], n_days: int) -> List[Optional[int]]:
+    """Seed independen per hari, diturunkan dari seed request."""
+    if seed is None:
+        return [None] * n_days
+    return [int(child.generate_state(1)[0])
+            for child in np.random.SeedSequence(seed).spawn(n_days)]
+
+
+class _DayResult(NamedTuple):
+    best: np.ndarray          # posisi gene terbaik di pool
+    generations: int          # generasi GA selesai (0 untuk optimizer search)
+    evaluations: int          # jumlah solusi yang benar‑benar dinilai fitness
+    exhausted: bool = False   # GA dihentikan karena budget waktu habis
+    memo_hits: int = 0        # solusi yang skornya diambil dari `_FitnessMemo`
+    elites: Optional[np.ndarray] = None        # solusi unik terbaik populasi akhir (posisi pool)
+    elite_scores: Optional[np.ndarray] = None  # skornya, tanpa noise generasi pertama
+
+
+def _optimize_day(ctx: _PoolContext, num_genes: int, day_seed: Optional[int] = None,
+                  engine: str = "pygad", optimizer: str = "ga") -> np.ndarray:
+    """
+    Optimasi satu hari; mengembalikan posisi gene terbaik di pool.
+    Hanya butuh `ctx` (array NumPy) sehingga bisa dikirim ke proses lain.
+    """
+    return _solve_day(ctx, num_genes, day_seed, engine, optimizer).best
+
+
+def _solve_day(ctx: _PoolContext, num_genes: int, day_seed: Optional[int] = None,
+               engine: str = "pygad", optimizer: str = "ga",
+               profile: GAProfile = GA_PROFILES["balanced"],
+               initial: Optional[np.ndarray] = None, keep_elites: bool = False,
+               budget: Optional[float] = None) -> _DayResult:
+    """
+    `initial` = populasi awal warm‑start (lihat `_warm_population`);
+    `keep_elites` mengembalikan solusi terbaik populasi akhir untuk
+    disimpan di `elite_store`.
+    """
+    # Pencarian butuh latihan unik; pool lebih kecil dari slot tetap via GA.
+    # Pencarian tidak dibatasi budget: ukurannya sudah dibatasi EXACT_SEARCH_LIMIT.
+    if optimizer == "search" and len(ctx.code) >= num_genes:
+        return _DayResult(_search_day(ctx, num_genes), 0, 0)
+    deadline = _Deadline(budget)
+    if engine == "numpy":
+        result, ga = _run_numpy_ga(ctx, num_genes, day_seed, profile, deadline, initial)
+    else:
+        result, ga = _run_pygad(ctx, num_genes, day_seed, profile, deadline, initial)
+    if keep_elites:
+        elites, scores = _final_elites(ctx, ga.population, ga.last_generation_fitness)
+        result = result._replace(elites=elites, elite_scores=scores)
+    return result
+
+
+def _day_result(best: np.ndarray, generations: int, evaluations: int, deadline: _Deadline,
+                memo: Optional[_FitnessMemo]) -> _DayResult:
+    if memo is None:
+        return _DayResult(best, generations, evaluations, deadline.hit)
+    _log(f"[GA] memo fitness: {memo.hits} hit / {memo.misses} dinilai "
+         f"({memo.hits / max(memo.hits + memo.misses, 1):.0%} hit)")
+    return _DayResult(best, generations, memo.misses, deadline.hit, memo.hits)
+
+
+# ===== Warm‑start: elite run sebelumnya sebagai sebagian populasi awal =====
+def _final_elites(ctx: _PoolContext, population: np.ndarray,
+                  fitness: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ELITES_PER_KEY solusi unik terbaik populasi akhir (gene terurut).
+    Urutan dari fitness GA; skor yang disimpan dihitung ulang tanpa noise
+    generasi pertama (elite yang bertahan sejak generasi 0 membawanya).
+    """
+    ordered = np.sort(np.asarray(population, dtype=np.int64), axis=1)
+    seen, top = set(), []
+    for i in np.argsort(-np.asarray(fitness), kind="stable"):
+        key = ordered[i].tobytes()
+        if key in seen or (ordered[i, 1:] == ordered[i, :-1]).any():
             continue
+        seen.add(key)
+        top.append(i)
+        if len(top) == ELITES_PER_KEY:
+            break
+    elites = ordered[top]
+    return elites, _score_population(ctx, elites)
+
+
+def _warm_population(elites: np.ndarray, pool_size: int, num_genes: int, sol_per_pop: int) -> np.ndarray:
+    """
+    Populasi awal: GA_WARM_START_SHARE % dari elite tersimpan (minimal
+    satu), sisanya acak dengan gene unik (butuh pool >= num_genes). pygad
+    3.5 gagal memperbaiki duplikat di `initial_population` yang diberikan,
+    jadi baris acak dibuat unik di sini.
+    """
+    n_seed = min(len(elites), max(1, sol_per_pop * GA_WARM_START_SHARE // 100))
+    rng = np.random.default_rng()
+    n_rest = sol_per_pop - n_seed
+    if pool_size <= 64:
+        rest = np.argsort(rng.random((n_rest, pool_size)), axis=1)[:, :num_genes]
+    else:
+        # pool besar: duplikat jarang, cukup acak ulang baris yang kena
+        rest = rng.integers(0, pool_size, size=(n_rest, num_genes))
+        while True:
+            ordered = np.sort(rest, axis=1)
+            dup = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not dup.any():
+                break
+            rest[dup] = rng.integers(0, pool_size, size=(int(dup.sum()), num_genes))
+    return np.concatenate([elites[:n_seed], rest])
+
+
+def _run_numpy_ga(ctx: _PoolContext, num_genes: int, day_seed: Optional[int],
+                  profile: GAProfile, deadline: _Deadline,
+                  initial: Optional[np.ndarray] = None) -> Tuple[_DayResult, NumpyGA]:
+    # RNG milik run ini sendiri — tidak perlu lock RNG global
+    rng = np.random.default_rng(day_seed)
+    memo = _FitnessMemo(ctx) if _use_memo(ctx, num_genes) else None
+    evaluations = 0
+
+    def fitness(population: np.ndarray, generations_completed: int) -> np.ndarray:
+        nonlocal evaluations
+        if memo is not None:
+            scores = memo.score(population, lookup=generations_completed > 0)
+        else:
+            evaluations += len(population)
+            scores = _score_population(ctx, population)
+        # Noise negatif ringan di generasi pertama
+        if generations_completed == 0:
+            scores -= rng.uniform(2, 5, size=len(scores))
+        return scores
+
+    ga = NumpyGA(
+        num_genes=num_genes,
+        gene_space_size=len(ctx.code),
+        fitness_func=fitness,
+        num_generations=profile.num_generations,
+        sol_per_pop=profile.sol_per_pop,
+        num_parents_mating=profile.num_parents_mating,
+        keep_parents=profile.keep_parents,
+        mutation_percent_genes=profile.mutation_percent_genes,
+        stop_criteria=profile.stop_criteria,
+        on_generation=deadline.check,
+        initial_population=initial,
+        rng=rng,
+    )
+    ga.run()
+    best = np.asarray(ga.best_solution()[0], dtype=np.int64)
+    return _day_result(best, ga.generations_completed, evaluations, deadline, memo), ga
+
 
-        gene_space = list(range(len(df_day)))
-
-        base_genes = 4 if focus.lower() in split_fokus_body_part else 3 if focus.lower() in split_cardio else 5
-        bonus_gene = 1 if should_add_preference_gene(focus, preferred_parts_set) else 0
-        num_genes = base_genes + bonus_gene
-
-        # # exploration and experimental purpose 41.81s, 50.54s via postman hit (local)
-        # ga = pygad.GA(
-        #     allow_duplicate_genes=False,
-        #     num_generations=200,              
-        #     sol_per_pop=60,                   
-        #     num_parents_mating=25, 
-        #     fitness_func=_make_fitness_func(
-        #         focus, injured_parts_set, df_day, preferred_parts_set, bmi
-        #     ),
-        #     num_genes=num_genes,
-        #     gene_type=int,
-        #     gene_space=gene_space,
-        #     parent_selection_type="tournament",
-        #     crossover_type="uniform",
-        #     mutation_type="random",
-        #     mutation_percent_genes=25,      
-        #     keep_parents=5,             
-        #     stop_criteria=None,  
-        #     save_solutions=False,
-        #     suppress_warnings=True,
-        #     on_generation=None,      
-        # )
-
-        # production purpose 758ms, 584ms, 667ms, 563ms, 439ms via postman hit (local)
+def _run_pygad(ctx: _PoolContext, num_genes: int, day_seed: Optional[int],
+               profile: GAProfile, deadline: _Deadline,
+               initial: Optional[np.ndarray] = None) -> Tuple[_DayResult, "pygad.GA"]:
+    import pygad    # impor berat (matplotlib); hanya saat engine pygad dipakai
+
+    gene_space = list(range(len(ctx.code)))
+
+    rng = np.random.default_rng(day_seed) if day_seed is not None else None
+    memo = _FitnessMemo(ctx) if _use_memo(ctx, num_genes) else None
+    batch_fitness = _make_batch_fitness_func(ctx, rng, memo)
+    evaluations = 0
+
+    def fitness_func(ga_instance, solutions, solution_indices):
+        nonlocal evaluations
+        if memo is None:
+            evaluations += len(solution_indices)
+        return batch_fitness(ga_instance, solutions, solution_indices)
+
+    with (_seeded_global_rng() if day_seed is not None else _GLOBAL_RNG_LOCK.shared()):
         ga = pygad.GA(
             allow_duplicate_genes=False,
-            num_generations=25,               # Lebih cepat selesai
-            sol_per_pop=20,      
-            num_parents_mating=8,        
-            fitness_func=_make_fitness_func(
-                focus, injured_parts_set, df_day, preferred_parts_set, bmi
-            ),
+            num_generations=profile.num_generations,
+            sol_per_pop=profile.sol_per_pop,
+            num_parents_mating=profile.num_parents_mating,
+            fitness_func=fitness_func,
+            fitness_batch_size=profile.sol_per_pop,     # satu panggilan per populasi
             num_genes=num_genes,
             gene_type=int,
             gene_space=gene_space,
             parent_selection_type="tournament",
             crossover_type="uniform",
             mutation_type="random",
-            mutation_percent_genes=12,   
-            keep_parents=3,
-            stop_criteria=["saturate_5"], 
+            mutation_percent_genes=profile.mutation_percent_genes,
+            keep_parents=profile.keep_parents,
+            stop_criteria=profile.stop_criteria,
             save_solutions=False,
             suppress_warnings=True,
-            on_generation=None,
+            on_generation=deadline.check,
+            initial_population=initial,
+            random_seed=day_seed,
         )
+        ga.run()
 
+    best = np.asarray(ga.best_solution(ga.last_generation_fitness)[0], dtype=np.int64)
+    return _day_result(best, ga.generations_completed, evaluations, deadline, memo), ga
 
 
+# ================= Optimizer pencarian (exact / local search) =================
+# Pool harian umumnya kecil (15–60 latihan, 3–6 slot). Untuk pool kecil
+# optimum dicari dengan branch‑and‑bound; untuk pool besar dipakai greedy +
+# swap local search. Hasil deterministik (tanpa RNG).
+def _set_bonus_bound(ctx: _PoolContext) -> int:
+    # Satu‑satunya suku set‑level yang bisa menambah skor: variasi body part
+    return BASE_SCORE + (5 if ctx.n_available >= 3 else 0)
 
 
-        _log(f"[GA] Running GA for {day_key} ({focus}), pool size: {len(df_day)}")
-        ga.run()
+def _prefix_penalty(ctx: _PoolContext, num_genes: int, prefix: np.ndarray) -> np.ndarray:
+    """
+    Penalti yang hanya bisa bertambah saat latihan ditambahkan (duplikat
+    body part, run/indoor, slot cardio). Batas bawah penalti solusi lengkap
+    mana pun yang berawal dari `prefix`.
+    """
+    codes = np.sort(ctx.code[prefix], axis=1)
+    penalty = penalty_duplicate((codes[:, 1:] == codes[:, :-1]).sum(axis=1))
+    if ctx.n_available >= 3:
+        most_common = (codes[:, :, None] == codes[:, None, :]).sum(axis=2).max(axis=1)
+        penalty += np.where(most_common >= 4, MAX_PENALTY, 0)
+    run_cnt = ctx.run[prefix].sum(axis=1)
+    indoor_cnt = ctx.indoor[prefix].sum(axis=1)
+    penalty += np.where((run_cnt > 1) | ((run_cnt == 1) & (num_genes > 1)), MAX_PENALTY, 0)
+    penalty += np.where((indoor_cnt > 1) | ((indoor_cnt == 1) & (num_genes > 2)), MAX_PENALTY, 0)
+    penalty += np.clip(ctx.slot[prefix].sum(axis=1) - ctx.exercises_per_day, 0, None) * 2
+    return penalty
+
+
+def _local_search(ctx: _PoolContext, num_genes: int, max_rounds: int = 50) -> Tuple[np.ndarray, float]:
+    """Greedy construction lalu best‑improvement swap dengan skor delta."""
+    n = len(ctx.code)
+    chosen = np.empty(0, dtype=np.int64)
+    free = np.ones(n, dtype=bool)
+    for _ in range(num_genes):
+        candidates = np.flatnonzero(free)
+        scores = _score_completions(ctx, chosen, candidates)
+        pick = candidates[int(np.argmax(scores))]
+        chosen = np.append(chosen, pick)
+        free[pick] = False
+    current = float(_score_population(ctx, chosen[None, :])[0])
+
+    for _ in range(max_rounds):
+        best_score, best_move = current, None
+        candidates = np.flatnonzero(free)
+        if candidates.size == 0:
+            break
+        for slot in range(num_genes):
+            scores = _score_completions(ctx, np.delete(chosen, slot), candidates)
+            j = int(np.argmax(scores))
+            if scores[j] > best_score:
+                best_score, best_move = float(scores[j]), (slot, candidates[j])
+        if best_move is None:
+            break
+        slot, new = best_move
+        free[chosen[slot]], free[new] = True, False
+        chosen[slot] = new
+        current = best_score
+
+    return np.sort(chosen), current
+
 
-        best_genes = ga.best_solution()[0]
-        selected = [df_day.iloc[idx].to_dict() for idx in best_genes]
+def _branch_and_bound(ctx: _PoolContext, num_genes: int, incumbent: np.ndarray,
+                      incumbent_score: float) -> Tuple[np.ndarray, float]:
+    """
+    Enumerasi kombinasi level demi level (vektor), memangkas prefix yang
+    batas atas skornya tidak melebihi incumbent.
+    """
+    bonus = _set_bonus_bound(ctx)
+    order = np.argsort(-ctx.base, kind="stable")          # urut skor per latihan desc
+    base_sorted = ctx.base[order]
+    cumsum = np.concatenate([[0], np.cumsum(base_sorted)])
+    n = len(order)
 
+    # prefix = indeks ke `order`, menaik; batas atas = jumlah base prefix +
+    # (num_genes - k) base terbesar sesudah indeks terakhir + bonus set −
+    # penalti monoton prefix
+    prefix = np.arange(n)[:, None]
+    prefix_sum = base_sorted.copy()
+    for k in range(1, num_genes):
+        last = prefix[:, -1]
+        need = num_genes - k
+        ok = last + need < n
+        bound = (prefix_sum + cumsum[np.minimum(last + 1 + need, n)] - cumsum[last + 1] + bonus
+                 - _prefix_penalty(ctx, num_genes, order[prefix]))
+        keep = ok & (bound > incumbent_score)
+        prefix, prefix_sum, last = prefix[keep], prefix_sum[keep], last[keep]
+
+        n_children = n - 1 - last
+        total = int(n_children.sum())
+        if total == 0:
+            return incumbent, incumbent_score
+        parent = np.repeat(np.arange(len(prefix)), n_children)
+        offset = np.arange(total) - np.repeat(np.cumsum(n_children) - n_children, n_children)
+        child = last[parent] + 1 + offset
+        prefix = np.column_stack([prefix[parent], child])
+        prefix_sum = prefix_sum[parent] + base_sorted[child]
+
+    scores = _score_population(ctx, order[prefix])
+    best = int(np.argmax(scores))
+    if scores[best] > incumbent_score:
+        return np.sort(order[prefix[best]]), float(scores[best])
+    return incumbent, incumbent_score
+
+
+def _search_day(ctx: _PoolContext, num_genes: int, limit: int = EXACT_SEARCH_LIMIT) -> np.ndarray:
+    """
+    Pilih strategi dari ukuran ruang kombinasi: exact (branch‑and‑bound)
+    jika C(pool, gene) ≤ `limit`, selain itu greedy + swap local search.
+    Incumbent local search juga dipakai untuk memangkas branch‑and‑bound.
+    """
+    solution, score = _local_search(ctx, num_genes)
+    if comb(len(ctx.code), num_genes) <= limit:
+        solution, score = _branch_and_bound(ctx, num_genes, solution, score)
+    return solution
+
+
+# ================= Edit satu hari =================
+def best_replacement(
+    focus: str,
+    rows: np.ndarray,
+    fixed_rows: np.ndarray,
+    exclude_rows: np.ndarray,
+    injured_body_parts: List[str],
+    preferred_body_parts: List[str] = None,
+    bmi: float = 0.0,
+    catalog: Optional[ExerciseCatalog] = None,
+) -> Optional[int]:
+    """
+    Pengganti terbaik untuk satu slot: latihan lain (`fixed_rows`, baris
+    katalog, harus ada di pool `rows`) tetap, hanya slot bebas yang
+    dioptimasi — satu panggilan `_score_completions` atas seluruh pool.
+    Mengembalikan baris katalog, atau None jika tidak ada kandidat tersisa.
+    """
+    catalog = catalog or get_catalog()
+    ctx = _build_pool_context(focus, set(map(str.lower, injured_body_parts or [])), catalog, rows,
+                              set(map(str.lower, preferred_body_parts or [])), bmi)
+    position = {row: i for i, row in enumerate(rows.tolist())}
+    fixed = np.array([position[row] for row in fixed_rows.tolist()], dtype=np.int64)
+    candidates = np.flatnonzero(~np.isin(rows, np.concatenate([fixed_rows, exclude_rows])))
+    if candidates.size == 0:
+        return None
+    scores = _score_completions(ctx, fixed, candidates)
+    return int(rows[candidates[int(np.argmax(scores))]])
+
+
+# ================= Paralelisme per hari =================
+_day_executor: Optional[Executor] = None
+_day_executor_lock = Lock()
+_in_ga_worker = False
+
+
+def mark_ga_worker() -> None:
+    """
+    Dipanggil initializer worker GA (`app.services.executor`). Di dalam
+    worker proses, "processes" diturunkan ke "threads": pool spawn bersarang
+    di tiap worker memperlambat startup dan menggantung saat shutdown.
+    """
+    global _in_ga_worker
+    _in_ga_worker = True
+
+
+def _get_day_executor(mode: str) -> Executor:
+    global _day_executor
+    with _day_executor_lock:
+        if _day_executor is None:
+            if mode == "processes" and _in_ga_worker:
+                _log("[ga] GA_DAY_PARALLELISM=processes di dalam worker GA → threads")
+                mode = "threads"
+            if mode == "processes":
+                _day_executor = ProcessPoolExecutor(
+                    max_workers=GA_DAY_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                _day_executor = ThreadPoolExecutor(
+                    max_workers=GA_DAY_WORKERS, thread_name_prefix="ga-day",
+                )
+        return _day_executor
+
+
+def _elite_positions(catalog: ExerciseCatalog, rows: np.ndarray,
+                     stored: List[Tuple[float, Tuple[str, ...]]]) -> Optional[np.ndarray]:
+    """
+    Posisi gene elite tersimpan di `rows` (pool terurut dari `build_daily_pool`).
+    Hanya id elite yang di‑lookup; elite yang tidak lagi ada di pool dibuang.
+    """
+    try:
+        found = catalog.rows_for_ids([eid for _, ids in stored for eid in ids])
+    except KeyError:
+        return None
+    found = found.reshape(len(stored), -1)
+    pos = np.minimum(np.searchsorted(rows, found), len(rows) - 1)
+    valid = (rows[pos] == found).all(axis=1)
+    return pos[valid] if valid.any() else None
+
+
+def shutdown_day_executor() -> None:
+    """Hentikan pool paralel per hari (jika pernah dibuat); dipanggil saat shutdown app."""
+    global _day_executor
+    with _day_executor_lock:
+        if _day_executor is not None:
+            _day_executor.shutdown(wait=False, cancel_futures=True)
+            _day_executor = None
+
+
+def run_ga_schedule(
+    schedule: Dict[str, str],
+    daily_exercise_pool: Dict[str, np.ndarray],
+    injured_body_parts: List[str],
+    preferred_body_parts: List[str] = None,
+    bmi: float = 0.0,
+    catalog: Optional[ExerciseCatalog] = None,
+    seed: Optional[int] = None,
+    parallelism: Optional[str] = None,
+    engine: Optional[str] = None,
+    optimizer: Optional[str] = None,
+    profile: Optional[str] = None,
+    time_budget_ms: Optional[int] = None,
+    days: Optional[List[str]] = None,
+    pool_keys: Optional[Dict[str, Hashable]] = None,
+) -> Dict[str, Dict]:
+    """
+    `daily_exercise_pool` berisi array indeks baris `catalog` per hari;
+    gene GA adalah posisi di dalam array tersebut. Dengan `seed`, hasil
+    untuk input yang sama selalu identik.
+
+    `parallelism` ("serial" | "threads" | "processes", default dari
+    GA_DAY_PARALLELISM) menentukan apakah GA tiap hari dijalankan
+    bersamaan. Tiap hari punya seed sendiri, jadi hasilnya sama di semua
+    mode; urutan hari tetap mengikuti `schedule`.
+
+    `engine` ("pygad" | "numpy", default dari GA_ENGINE) memilih
+    implementasi GA; lihat `app.services.ga_engine`.
+
+    `optimizer` ("ga" | "search", default dari OPTIMIZER): "search" memakai
+    branch‑and‑bound untuk pool kecil dan greedy + local search untuk pool
+    besar, dipilih otomatis dari ukuran ruang kombinasi.
+
+    `profile` (nama di GA_PROFILES, default GA_PROFILE) menentukan parameter
+    GA dan budget waktu; `time_budget_ms` hanya bisa memperketatnya. Budget
+    dibagi rata per hari: di mode serial sisa waktu hari sebelumnya
+    terbawa ke hari berikutnya, di mode paralel tiap hari mendapat budget
+    penuh karena berjalan bersamaan. GA yang kehabisan budget berhenti di
+    akhir generasi berjalan dan memakai solusi terbaik sejauh ini;
+    `budget_exhausted` per hari mencatatnya.
+
+    `days` membatasi optimasi ke hari tertentu (endpoint streaming: satu
+    task per hari). Seed hari tetap diturunkan dari seluruh `schedule`,
+    jadi hasilnya sama dengan menjalankan seluruh jadwal sekaligus.
+
+    Run tanpa `seed` dengan optimizer GA memakai warm‑start bila
+    `pool_keys` (`exercise_filter.daily_pool_keys`) diberikan: elite run
+    sebelumnya untuk kunci pool yang sama (`app.services.elite_store`)
+    mengisi sebagian populasi awal, dan elite run ini disimpan kembali.
+    Run ber‑seed tidak membaca maupun menulis store agar tetap reproducible.
+    """
+    catalog = catalog or get_catalog()
+    mode = parallelism or GA_DAY_PARALLELISM
+    engine = engine or GA_ENGINE
+    optimizer = optimizer or OPTIMIZER
+    _, ga_profile = resolve_profile(profile)
+    budget = schedule_budget(ga_profile, time_budget_ms)
+    started = time.perf_counter()
+    injured_parts_set = set(map(str.lower, injured_body_parts or []))
+    preferred_parts_set = set(map(str.lower, preferred_body_parts or []))
+
+    day_seeds = _day_seeds(seed, len(schedule))
+    warm = elite_store is not None and seed is None and optimizer == "ga" and pool_keys is not None
+    tasks = []
+
+    for (day_key, focus), day_seed in zip(schedule.items(), day_seeds):
+        if days is not None and day_key not in days:
+            continue
+        rows = daily_exercise_pool.get(day_key)
+        if rows is None or len(rows) == 0:
+            _log(f"[GA] {day_key} pool kosong — dilewati.")
+            continue
+
+        num_genes = day_gene_count(focus, preferred_parts_set)
+
+        ctx = _build_pool_context(focus, injured_parts_set, catalog, rows, preferred_parts_set, bmi)
+        _log(f"[GA] Running GA for {day_key} ({focus}), pool size: {len(rows)}")
+        key = initial = None
+        if warm and day_key in pool_keys and len(rows) >= num_genes:
+            key = pool_key(pool_keys[day_key], focus, injured_parts_set, preferred_parts_set,
+                           bmi < 30.0, num_genes)
+            stored = elite_store.get(key)
+            metrics.count("warm_start_hit" if stored else "warm_start_miss")
+            elites = _elite_positions(catalog, rows, stored) if stored else None
+            if elites is not None:
+                initial = _warm_population(elites, len(rows), num_genes, ga_profile.sol_per_pop)
+        tasks.append((day_key, focus, rows, key,
+                      (ctx, num_genes, day_seed, engine, optimizer, ga_profile, initial, key is not None)))
+
+    if mode == "serial" or len(tasks) < 2:
+        results = []
+        for i, (*_, args) in enumerate(tasks, 1):
+            # batas hari ke‑i = awal + i/n budget → sisa hari sebelumnya terbawa
+            day_budget = None if budget is None else started + budget * i / len(tasks) - time.perf_counter()
+            results.append(_solve_day(*args, budget=day_budget))
+    else:
+        executor = _get_day_executor(mode)
+        futures = [executor.submit(_solve_day, *args, budget=budget) for *_, args in tasks]
+        results = [f.result() for f in futures]
+
+    daywise_schedule: Dict[str, Dict] = {}
+    for (day_key, focus, rows, key, (ctx, num_genes, *_, initial, _)), result in zip(tasks, results):
+        metrics.observe_day(focus, len(rows), result.generations, result.evaluations,
+                            "warm" if initial is not None else "cold")
+        if result.exhausted:
+            metrics.count("ga_budget_exhausted")
+        if result.generations and _use_memo(ctx, num_genes):
+            metrics.count("fitness_memo_hit", result.memo_hits)
+            metrics.count("fitness_memo_miss", result.evaluations)
+        if key is not None and result.elites is not None:
+            ids = catalog.exercise_ids(rows[result.elites.ravel()])
+            k = result.elites.shape[1]
+            elite_store.add(key, [(float(score), tuple(sorted(ids[i * k:(i + 1) * k])))
+                                  for i, score in enumerate(result.elite_scores)])
         daywise_schedule[day_key] = {
             "focus": focus,
-            "exercises": selected,
+            "exercises": catalog.records(rows[result.best]),
+            "budget_exhausted": result.exhausted,
         }
 
-    return daywise_schedule
\ No newline at end of file
+    return daywise_schedule
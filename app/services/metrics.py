@@ -0,0 +1,237 @@
+"""
+Instrumentasi hot path: timer per tahap + registry Prometheus.
+
+Alur:
+  worker   `begin()` di awal pipeline → `stage("rules")`, `observe_day(...)`
+           … → `end()`; trace selesai diambil `collect()` dan dikirim
+           balik bersama hasil (lihat `app.services.executor`).
+  router   `record(trace, queue_wait)` ke registry proses utama dan
+           `server_timing(...)` untuk header `Server-Timing`.
+  /metrics `render()` dalam format teks Prometheus.
+
+Jika METRICS_ENABLED mati, `begin()` mengembalikan None, `stage()`
+mengembalikan context manager kosong bersama, dan fungsi lain langsung
+return — tidak ada alokasi atau pembacaan jam.
+"""
+
+from contextlib import nullcontext
+from threading import Lock, local
+from typing import Callable, Dict, List, Optional, Tuple
+import time
+
+from app.config import METRICS_ENABLED
+
+_NULL = nullcontext()
+_local = local()
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+# ────────────────────────────────────────────────────────────────
+# Trace per request (sisi worker)
+class Trace:
+    """Durasi tahap (detik) + statistik GA/pool satu request; picklable."""
+    __slots__ = ("stages", "generations", "evaluations", "pools", "counts")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.generations: List[Tuple[int, str]] = []      # (generasi, start warm/cold)
+        self.evaluations = 0
+        self.pools: List[Tuple[str, int]] = []
+        self.counts: Dict[str, int] = {}
+
+    def __getstate__(self):
+        return tuple(getattr(self, s) for s in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+
+class _Stage:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace, self.name = trace, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.trace.stages[self.name] = self.trace.stages.get(self.name, 0.0) + elapsed
+        return False
+
+
+def begin() -> Optional[Trace]:
+    if not METRICS_ENABLED:
+        return None
+    trace = Trace()
+    _local.trace = trace
+    return trace
+
+
+def end(trace: Optional[Trace]) -> None:
+    if trace is None:
+        return
+    _local.trace = None
+    finished = getattr(_local, "finished", None)
+    if finished is None:
+        finished = _local.finished = []
+    finished.append(trace)
+
+
+def collect() -> List[Trace]:
+    """Ambil (dan kosongkan) trace yang selesai di thread ini."""
+    if not METRICS_ENABLED:
+        return []
+    finished = getattr(_local, "finished", None) or []
+    _local.finished = []
+    return finished
+
+
+def _current() -> Optional[Trace]:
+    return getattr(_local, "trace", None) if METRICS_ENABLED else None
+
+
+def stage(name: str):
+    trace = _current()
+    return _Stage(trace, name) if trace is not None else _NULL
+
+
+def observe_day(focus: str, pool_size: int, generations: int, evaluations: int,
+                start: str = "cold") -> None:
+    trace = _current()
+    if trace is None:
+        return
+    trace.pools.append((focus.lower(), pool_size))
+    trace.generations.append((generations, start))
+    trace.evaluations += evaluations
+
+
+def count(name: str, n: int = 1) -> None:
+    trace = _current()
+    if trace is not None:
+        trace.counts[name] = trace.counts.get(name, 0) + n
+
+
+# ────────────────────────────────────────────────────────────────
+# Registry (proses utama)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+GENERATION_BUCKETS = (0, 5, 10, 15, 20, 25, 50, 100)
+EVALUATION_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+POOL_BUCKETS = (0, 5, 10, 25, 50, 100, 250, 1000, 10000)
+
+
+class _Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name, self.help, self.buckets = name, help_text, buckets
+        self.series: Dict[Labels, List] = {}      # labels -> [counts per bucket, sum, count]
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, n) in sorted(self.series.items()):
+            for bound, c in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_fmt_labels(labels + (('le', _fmt_num(bound)),))} {c}")
+            lines.append(f"{self.name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {n}")
+            lines.append(f"{self.name}_sum{_fmt_labels(labels)} {_fmt_num(total)}")
+            lines.append(f"{self.name}_count{_fmt_labels(labels)} {n}")
+        return lines
+
+
+class _Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help = name, help_text
+        self.series: Dict[Labels, float] = {}
+
+    def inc(self, n: float = 1, labels: Labels = ()) -> None:
+        self.series[labels] = self.series.get(labels, 0) + n
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_fmt_labels(l)} {_fmt_num(v)}" for l, v in sorted(self.series.items())]
+        return lines
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def _fmt_num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+_lock = Lock()
+_stage_seconds = _Histogram("fitness_stage_duration_seconds",
+                            "Durasi tahap pipeline rekomendasi", STAGE_BUCKETS)
+_generations = _Histogram("fitness_ga_generations",
+                          "Generasi GA selesai per hari (start warm/cold)", GENERATION_BUCKETS)
+_evaluations = _Histogram("fitness_ga_fitness_evaluations",
+                          "Evaluasi fitness (solusi dinilai) per request", EVALUATION_BUCKETS)
+_pool_size = _Histogram("fitness_pool_size", "Ukuran pool harian per fokus", POOL_BUCKETS)
+_events = _Counter("fitness_events_total", "Kejadian dari worker (cache pool, dll.)")
+_requests = _Counter("fitness_requests_total", "Request rekomendasi per sumber hasil")
+
+# Gauge dari komponen lain: prefix -> fungsi yang mengembalikan {nama: nilai}
+_collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+
+def record(trace: Trace, queue_wait: float) -> None:
+    with _lock:
+        for name, seconds in trace.stages.items():
+            _stage_seconds.observe(seconds, (("stage", name),))
+        _stage_seconds.observe(queue_wait, (("stage", "queue"),))
+        for gens, start in trace.generations:
+            _generations.observe(gens, (("start", start),))
+        if trace.generations:
+            _evaluations.observe(trace.evaluations)
+        for focus, size in trace.pools:
+            _pool_size.observe(size, (("focus", focus),))
+        for name, n in trace.counts.items():
+            _events.inc(n, (("event", name),))
+        _requests.inc(1, (("source", "pipeline"),))
+
+
+def record_cache_hit() -> None:
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        _requests.inc(1, (("source", "response_cache"),))
+
+
+def server_timing(trace: Optional[Trace], queue_wait: float) -> str:
+    parts = [f"queue;dur={queue_wait * 1000:.3f}"]
+    if trace is not None:
+        parts += [f"{name};dur={seconds * 1000:.3f}" for name, seconds in trace.stages.items()]
+    return ", ".join(parts)
+
+
+def register_collector(prefix: str, fn: Callable[[], Dict[str, float]]) -> None:
+    """Tambahkan gauge dari statistik komponen lain (cache, executor); nilai non‑angka diabaikan."""
+    _collectors[prefix] = fn
+
+
+def render() -> str:
+    lines = ["# TYPE fitness_metrics_enabled gauge", f"fitness_metrics_enabled {int(METRICS_ENABLED)}"]
+    with _lock:
+        for metric in (_stage_seconds, _generations, _evaluations, _pool_size, _events, _requests):
+            if metric.series:
+                lines += metric.render()
+    for prefix, fn in _collectors.items():
+        for key, value in fn().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {_fmt_num(value)}")
+    return "\n".join(lines) + "\n"
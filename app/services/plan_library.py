@@ -0,0 +1,172 @@
+"""
+Pustaka rencana hasil precompute offline (`scripts.build_plan_library`).
+
+Ruang input yang sering dipakai praktis terbatas: gender × band BMI ×
+available_days × cedera × preferensi × alat. Rencana untuk kombinasi
+tersebut dihitung offline dengan profil GA berkualitas tinggi dan
+disimpan di file SQLite (stdlib, baca acak tanpa memuat seluruh isi).
+Pipeline mencari di sini lebih dulu; miss → optimasi live.
+
+BMI hanya memengaruhi rencana lewat dua ambang: rule engine (≥ 25) dan
+bonus skor cardio GA (< 30). Tiga band di bawah ini karenanya tepat, dan
+nilai BMI di respons tetap milik request.
+
+File menyimpan versi katalog saat dibangun; bila berbeda dengan katalog
+yang sedang dipakai worker, pustaka diabaikan (semua lookup miss) sampai
+dibangun ulang. File dibuka lazy per proses, read‑only, dan dibuka ulang
+bila mtime/ukurannya berubah.
+"""
+
+from threading import Lock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import json
+import os
+import sqlite3
+
+from app.config import CATALOG_PATH, PLAN_LIBRARY, PLAN_LIBRARY_PATH
+from app.services.csv_loader import DATASET_PATH, file_stamp
+from app.services.exercise_catalog import ExerciseCatalog
+
+# band → BMI wakil yang dipakai saat precompute
+BMI_BANDS: Dict[str, float] = {"lt25": 22.0, "25to30": 27.5, "ge30": 32.5}
+
+_SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE plans (key TEXT PRIMARY KEY, plan TEXT NOT NULL) WITHOUT ROWID;
+"""
+
+
+def library_path(path: str = DATASET_PATH) -> str:
+    if path == CATALOG_PATH and PLAN_LIBRARY_PATH:
+        return PLAN_LIBRARY_PATH
+    return os.path.splitext(path)[0] + ".plans"
+
+
+def bmi_band(bmi: float) -> str:
+    return "lt25" if bmi < 25.0 else "25to30" if bmi < 30.0 else "ge30"
+
+
+def plan_key(gender: str, bmi: float, available_days: int, injuries: Iterable[str],
+             preferred_body_part: Iterable[str], preferred_equipment: Iterable[str]) -> str:
+    """
+    Kunci profil ter‑normalisasi. List hanya diurutkan & di‑dedup (tidak
+    di‑lowercase): rule engine membandingkan cedera/preferensi apa adanya,
+    jadi "Chest" dan "chest" bisa menghasilkan rencana berbeda.
+    """
+    return json.dumps([
+        gender.lower(), bmi_band(bmi), available_days,
+        sorted(set(injuries)), sorted(set(preferred_body_part)), sorted(set(preferred_equipment)),
+    ], separators=(",", ":"))
+
+
+class StoredPlan(NamedTuple):
+    split_type: str
+    schedule: Dict[str, str]
+    days: Dict[str, List[str]]        # day_key → exercise_id (hanya hari yang bisa disusun)
+    ga_profile: str
+
+    def daywise(self, catalog: ExerciseCatalog) -> Dict[str, Dict]:
+        """Bentuk `run_ga_schedule` agar bisa langsung ke `build_response`."""
+        return {
+            day_key: {
+                "focus": self.schedule[day_key],
+                "exercises": catalog.records(catalog.rows_for_ids(ids)),
+                "budget_exhausted": False,
+            }
+            for day_key, ids in self.days.items()
+        }
+
+
+def encode_plan(split_type: str, schedule: Dict[str, str], days: Dict[str, List[str]]) -> str:
+    return json.dumps({"split": split_type, "schedule": schedule, "days": days},
+                      ensure_ascii=False, separators=(",", ":"))
+
+
+def write_library(path: str, meta: Dict[str, str], plans: Iterable[Tuple[str, str]]) -> int:
+    """Tulis pustaka baru secara atomik (file sementara lalu rename); mengembalikan jumlah rencana."""
+    tmp = f"{path}.tmp{os.getpid()}"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", sorted(meta.items()))
+        conn.executemany("INSERT OR REPLACE INTO plans VALUES (?, ?)", plans)
+        count = conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+    return count
+
+
+class PlanLibrary:
+    """Satu file pustaka, read‑only. Aman dipakai beberapa thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = Lock()
+        self.meta: Dict[str, str] = dict(self._conn.execute("SELECT name, value FROM meta"))
+        self.ga_profile = self.meta.get("ga_profile", "")
+
+    def get(self, key: str) -> Optional[StoredPlan]:
+        with self._lock:
+            row = self._conn.execute("SELECT plan FROM plans WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        plan = json.loads(row[0])
+        return StoredPlan(plan["split"], plan["schedule"], plan["days"], self.ga_profile)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ────────────────────────────────────────────────────────────────
+# Pustaka aktif per proses
+_state: Dict[str, object] = {"pid": None, "library": None, "stamp": None, "stale": None}
+_state_lock = Lock()
+
+
+def _current(path: str) -> Optional[PlanLibrary]:
+    """Pustaka untuk `path`, dibuka ulang jika file berubah atau proses di‑fork."""
+    try:
+        stamp = file_stamp(path)
+    except FileNotFoundError:
+        stamp = None
+    with _state_lock:
+        library = _state["library"]
+        if _state["pid"] == os.getpid() and _state["stamp"] == stamp:
+            return library
+        if library is not None and _state["pid"] == os.getpid():
+            library.close()
+        library = None
+        if stamp is not None:
+            try:
+                library = PlanLibrary(path)
+            except sqlite3.Error as exc:
+                print(f"[plans] {path} tidak bisa dibaca: {exc}")
+        _state.update(pid=os.getpid(), library=library, stamp=stamp, stale=None)
+        return library
+
+
+def get_library(catalog: ExerciseCatalog) -> Optional[PlanLibrary]:
+    """Pustaka aktif jika ada dan dibangun dari versi katalog yang sama; selain itu None."""
+    if not PLAN_LIBRARY:
+        return None
+    library = _current(library_path())
+    if library is None:
+        return None
+    if library.meta.get("catalog_version") != catalog.version:
+        if _state["stale"] != catalog.version:
+            _state["stale"] = catalog.version
+            print(f"[plans] {library.path} dibangun untuk katalog {library.meta.get('catalog_version')}, "
+                  f"katalog aktif {catalog.version} — diabaikan sampai dibangun ulang")
+        return None
+    _state["stale"] = None
+    return library
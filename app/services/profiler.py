@@ -0,0 +1,171 @@
+"""
+Sampling profiler opt‑in untuk request rekomendasi.
+
+Router memutuskan per request (`should_profile`): request dengan header
+X-Profile-Token yang cocok dengan PROFILE_TOKEN, atau sampel acak
+sebesar PROFILE_SAMPLE_RATE. Request terpilih dijalankan lewat
+`profiled` di tempat pipeline benar‑benar jalan (worker GA atau
+threadpool). Di sana thread sampler membaca stack thread pipeline tiap
+PROFILE_INTERVAL_MS (`sys._current_frames`, stdlib saja), lalu
+menulis dua file ke PROFILE_DIR:
+
+  <id>.collapsed   satu baris per stack unik: "root;...;leaf <jumlah>",
+                   langsung bisa dipakai flamegraph.pl / speedscope
+  <id>.json        alasan, parameter request ter‑normalisasi, durasi,
+                   jumlah sampel, interval
+
+Direktori dibatasi PROFILE_MAX_FILES profil; yang terlama dihapus.
+Request yang tidak terpilih tidak menyentuh modul ini selain satu cek
+konfigurasi (dan satu `random()` dari RNG milik modul bila rate > 0).
+
+Hanya thread pipeline yang disampel: dengan GA_DAY_PARALLELISM
+threads/processes, waktu GA per hari muncul sebagai menunggu future.
+"""
+
+from collections import Counter
+from threading import Event, Thread, get_ident
+from typing import Any, Callable, Dict, List, Optional
+import glob
+import hmac
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+from app.config import (
+    PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_MAX_FILES, PROFILE_SAMPLE_RATE, PROFILE_TOKEN,
+)
+
+PROFILE_HEADER = "X-Profile-Token"
+MAX_DEPTH = 128
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# RNG sendiri: `random` global dipakai run pygad ber‑seed di thread lain
+_sampling = random.Random()
+
+
+def should_profile(token: Optional[str]) -> Optional[str]:
+    """Alasan profiling ("token" / "sampled") atau None."""
+    if PROFILE_TOKEN and token and hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        return "token"
+    if PROFILE_SAMPLE_RATE > 0 and _sampling.random() < PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def new_profile(reason: str, route: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Spesifikasi profil yang dikirim ke worker; `id` juga dikirim ke client (X-Profile-Id)."""
+    return {
+        "id": f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}",
+        "reason": reason,
+        "route": route,
+        "params": params,
+    }
+
+
+# ────────────────────────────────────────────────────────────────
+# Sampler
+def _location(filename: str) -> str:
+    if filename.startswith(_ROOT + os.sep):
+        return os.path.relpath(filename, _ROOT)
+    marker = f"{os.sep}site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+class StackSampler:
+    """Menghitung stack (collapsed) satu thread tiap `interval` detik dari thread terpisah."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}      # code object → "func (file:line)"
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name}({_location(code.co_filename)}:{code.co_firstlineno})"
+            # ';' dan ' ' adalah pemisah di format collapsed
+            label = self._labels[code] = label.replace(";", ":").replace(" ", "_")
+        return label
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.counts.most_common())
+
+
+# ────────────────────────────────────────────────────────────────
+# Artefak
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:           # dihapus proses lain
+        return 0
+
+
+def _rotate(directory: str, keep: int) -> None:
+    profiles = sorted(glob.glob(os.path.join(directory, "*.collapsed")), key=_mtime)
+    for path in profiles[:max(0, len(profiles) - keep)]:
+        for stale in (path, path[:-len(".collapsed")] + ".json"):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:       # dihapus proses lain
+                pass
+
+
+def write_profile(profile: Dict[str, Any], sampler: StackSampler, duration: float,
+                  error: Optional[str] = None) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, profile["id"])
+    meta = {**profile, "pid": os.getpid(), "duration_ms": round(duration * 1000, 2),
+            "samples": sampler.samples, "interval_ms": PROFILE_INTERVAL_MS, "error": error}
+    with open(base + ".json", "w") as fh:
+        json.dump(meta, fh, indent=2, default=str)
+    # .collapsed terakhir: `_rotate` menghitung profil dari file ini
+    with open(base + ".collapsed.tmp", "w") as fh:
+        fh.write(sampler.collapsed())
+    os.replace(base + ".collapsed.tmp", base + ".collapsed")
+    _rotate(PROFILE_DIR, PROFILE_MAX_FILES)
+    return base + ".collapsed"
+
+
+def profiled(profile: Dict[str, Any], fn: Callable, *args) -> Any:
+    """Jalankan `fn(*args)` di bawah sampler, tulis artefak, kembalikan hasil `fn`."""
+    sampler = StackSampler(get_ident(), max(PROFILE_INTERVAL_MS, 1) / 1000)
+    error = None
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        return fn(*args)
+    except Exception as exc:
+        error = repr(exc)
+        raise
+    finally:
+        sampler.stop()
+        try:
+            write_profile(profile, sampler, time.perf_counter() - start, error)
+        except OSError as exc:
+            print(f"[profile] {profile['id']} gagal ditulis: {exc!r}")
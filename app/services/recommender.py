@@ -0,0 +1,468 @@
+"""
+Pipeline rekomendasi end‑to‑end: BMI → Rule Engine → pool harian → GA →
+respons. Dipisah dari router agar bisa dipakai ulang (cache, worker, dsb.).
+
+Mode deterministik: request dinormalisasi dan seed GA diturunkan dari
+request ter‑normalisasi, sehingga input yang sama selalu menghasilkan
+rencana yang sama dan aman di‑cache.
+
+Profil yang ada di pustaka rencana precompute (`app.services.plan_library`)
+dilayani dari sana tanpa rule engine/GA; miss → pipeline live.
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+from math import pow
+import hashlib
+import json
+
+import numpy as np
+
+from app.schemas.recommendation import (
+    DayEditRequest, RecommendationDay, RecommendationRequest, RecommendationResponse,
+    RegenerateDayRequest, SwapExerciseRequest,
+)
+from app.services import metrics
+from app.services.exercise_catalog import ExerciseCatalog, catalog_store, get_catalog
+from app.services.exercise_filter import build_daily_pool, daily_pool_keys
+from app.services.plan_library import StoredPlan, get_library, plan_key
+from app.services.genetic_optimizer import (
+    best_replacement, day_gene_count, prepare_catalog, resolve_profile, run_ga_schedule,
+    schedule_budget,
+)
+from app.services.serialization import (
+    build_day, build_response, header_event, prepare_serialization,
+)
+from app.config import RULE_ENGINE, WARMUP_PLAN
+from app.rules.decision_table import decide
+
+
+def calc_bmi(height_cm: float, weight_kg: float) -> float:
+    return round(weight_kg / pow(height_cm / 100, 2), 2)
+
+
+def bmi_category(b: float) -> str:
+    return ("Underweight" if b < 18.5 else
+            "Normal"      if b < 25   else
+            "Overweight"  if b < 30   else
+            "Obese I"     if b < 35   else
+            "Obese II"    if b < 40   else
+            "Obese III")
+
+
+# ────────────────────────────────────────────────────────────────
+# Normalisasi & seed
+def _norm_list(values: List[str]) -> List[str]:
+    return sorted({v.strip().lower() for v in values if v.strip()})
+
+
+_Req = TypeVar("_Req", RecommendationRequest, DayEditRequest)
+
+
+def normalize_request(req: _Req) -> _Req:
+    """Lowercase + urutkan (dan dedup) semua list; gender lowercase."""
+    return req.model_copy(update={
+        "gender": req.gender.lower(),
+        "injuries": _norm_list(req.injuries),
+        "preferred_body_part": _norm_list(req.preferred_body_part),
+        "preferred_equipment": _norm_list(req.preferred_equipment),
+    })
+
+
+def _profile_key(req) -> Dict[str, Any]:
+    key = {
+        "gender": req.gender,
+        "bmi": calc_bmi(req.height_cm, req.weight_kg),
+        "injuries": req.injuries,
+        "preferred_body_part": req.preferred_body_part,
+        "preferred_equipment": req.preferred_equipment,
+    }
+    if req.ga_profile is not None:
+        key["ga_profile"] = req.ga_profile
+    if req.time_budget_ms is not None:
+        key["time_budget_ms"] = req.time_budget_ms
+    return key
+
+
+def request_key(req: RecommendationRequest) -> str:
+    """
+    Kunci kanonik request ter‑normalisasi. Tinggi/berat cukup diwakili BMI
+    2 desimal — nilai yang dipakai Rule Engine, GA, dan respons. Profil &
+    budget GA hanya masuk kunci bila diisi, agar kunci (dan seed) request
+    lama tidak berubah.
+    """
+    key = {**_profile_key(req), "available_days": req.available_days}
+    return json.dumps(key, sort_keys=True, separators=(",", ":"))
+
+
+def regenerate_key(req: RegenerateDayRequest) -> str:
+    """
+    Kunci kanonik reroll ter‑normalisasi: profil seperti `request_key` +
+    hari yang diedit + latihan saat ini (urutan tidak memengaruhi hasil).
+    """
+    key = {**_profile_key(req), "day": req.day, "day_focus": req.day_focus,
+           "exercise_ids": sorted(req.exercise_ids)}
+    return json.dumps(key, sort_keys=True, separators=(",", ":"))
+
+
+def request_seed(key: str) -> int:
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:4], "big")
+
+
+# ────────────────────────────────────────────────────────────────
+# Rule engine
+def run_rules(gender: str, bmi: float, injuries: List[str], available_days: int,
+              preferred_body_part: List[str]) -> Tuple[str, Dict[str, str]]:
+    """(split_type, schedule); engine dipilih lewat RULE_ENGINE."""
+    if RULE_ENGINE != "experta":
+        return decide(gender, bmi, injuries, available_days, preferred_body_part)
+
+    from app.rules.rule_engine import FitnessRuleEngine, UserInput   # ← UserInput = Fact
+    engine = FitnessRuleEngine()
+    engine.reset()
+    engine.declare(UserInput(
+        gender=gender,
+        bmi=bmi,
+        injuries=injuries,
+        available_days=available_days,
+        preferred_body_part=preferred_body_part,
+    ))
+    engine.run()
+    split_type, schedule = engine.get_result()
+    return split_type, dict(schedule)
+
+
+# ────────────────────────────────────────────────────────────────
+# Pipeline
+# Profil tetap untuk rencana pemanasan: 5 hari agar semua fokus split tersentuh
+_WARMUP_REQUEST = RecommendationRequest(
+    gender="male", height_cm=170, weight_kg=70, available_days=5,
+)
+
+
+def warm_up(plan: bool = WARMUP_PLAN) -> None:
+    """
+    Muat katalog + indeks + fitur GA + fragmen JSON lebih awal, jalankan
+    satu rencana pemanasan (impor engine GA/rule engine, setup pertama,
+    cache pool), lalu mulai pemantau reload katalog.
+    """
+    catalog = get_catalog()
+    prepare_catalog(catalog)
+    prepare_serialization(catalog)
+    if plan:
+        # lewat `_run_stages` langsung: tanpa trace metrics yang ikut terkirim;
+        # pustaka rencana dilewati agar engine GA tetap terpanaskan. Tanpa
+        # seed: run ber‑seed pygad menyetel RNG global, dan semua proses akan
+        # memulai GA produksi dari state RNG yang sama.
+        _run_stages(_WARMUP_REQUEST, None, run_rules, use_library=False)
+    catalog_store.start()
+
+
+def build_recommendation(req: RecommendationRequest,
+                         seed: Optional[int] = None) -> Optional[RecommendationResponse]:
+    """Mengembalikan None jika tidak ada satu hari pun yang bisa disusun."""
+    return _build(req, seed, run_rules)
+
+
+def build_recommendation_batch(
+    reqs: List[RecommendationRequest],
+    seeds: List[Optional[int]],
+) -> List[Optional[RecommendationResponse]]:
+    """
+    Beberapa request dalam satu panggilan (satu task worker). Profil yang
+    identik memakai satu hasil Rule Engine; pool dengan (fokus, cedera,
+    alat) yang sama dipakai ulang lewat cache pool.
+    """
+    memo: Dict[tuple, Tuple[str, Dict[str, str]]] = {}
+
+    def rules(gender, bmi, injuries, available_days, preferred_body_part):
+        key = (gender, bmi, tuple(injuries), available_days, tuple(preferred_body_part))
+        if key not in memo:
+            memo[key] = run_rules(gender, bmi, injuries, available_days, preferred_body_part)
+        return memo[key]
+
+    return [_build(req, seed, rules) for req, seed in zip(reqs, seeds)]
+
+
+def _build(req: RecommendationRequest, seed: Optional[int],
+           rules: Callable[..., Tuple[str, Dict[str, str]]]) -> Optional[RecommendationResponse]:
+    return _traced(_run_stages, req, seed, rules)
+
+
+def _traced(fn: Callable[..., Any], *args) -> Any:
+    trace = metrics.begin()
+    try:
+        with metrics.stage("pipeline"):
+            return fn(*args)
+    finally:
+        metrics.end(trace)
+
+
+def _run_stages(req: RecommendationRequest, seed: Optional[int],
+                rules: Callable[..., Tuple[str, Dict[str, str]]],
+                use_library: bool = True) -> Optional[RecommendationResponse]:
+    # 1️⃣  Hitung BMI
+    bmi = calc_bmi(req.height_cm, req.weight_kg)
+    bmi_cat = bmi_category(bmi)
+
+    # Pustaka rencana precompute lebih dulu — satu lookup, tanpa rule engine/GA
+    catalog = get_catalog()
+    stored = None
+    if use_library:
+        with metrics.stage("library"):
+            stored = _stored_plan(req, bmi, catalog)
+    if stored is not None:
+        with metrics.stage("format"):
+            return build_response(catalog, bmi, bmi_cat, stored.split_type, stored.schedule,
+                                  stored.daywise(catalog), stored.ga_profile)
+
+    # 2️⃣  Jalankan Rule‑Based Engine
+    with metrics.stage("rules"):
+        split_type, schedule = rules(          # schedule dict {day_1: 'upper', ...}
+            req.gender, bmi, req.injuries, req.available_days, req.preferred_body_part,
+        )
+
+    # 3️⃣  Build exercise pool & GA — satu snapshot katalog untuk seluruh request
+    profile, _ = resolve_profile(req.ga_profile)
+    with metrics.stage("pool"):
+        daily_pool = build_daily_pool(
+            schedule=schedule,
+            catalog=catalog,
+            injuries=req.injuries,
+            preferred_equipment=req.preferred_equipment,
+        )
+    with metrics.stage("ga"):
+        daywise = run_ga_schedule(
+            schedule,
+            daily_pool,
+            injured_body_parts=req.injuries,
+            preferred_body_parts=req.preferred_body_part,
+            bmi=bmi,
+            catalog=catalog,
+            seed=seed,
+            profile=profile,
+            time_budget_ms=req.time_budget_ms,
+            pool_keys=daily_pool_keys(schedule, catalog, req.injuries, req.preferred_equipment),
+        )
+    if not daywise:
+        return None
+
+    # 4️⃣  Format response — ExerciseOut & fragmen JSON sudah dibuat per katalog
+    with metrics.stage("format"):
+        return build_response(catalog, bmi, bmi_cat, split_type, schedule, daywise, profile)
+
+
+def _stored_plan(req: RecommendationRequest, bmi: float, catalog: ExerciseCatalog) -> Optional[StoredPlan]:
+    library = get_library(catalog)
+    if library is None:
+        return None
+    stored = library.get(plan_key(req.gender, bmi, req.available_days, req.injuries,
+                                  req.preferred_body_part, req.preferred_equipment))
+    metrics.count("plan_library_hit" if stored is not None else "plan_library_miss")
+    return stored
+
+
+# ────────────────────────────────────────────────────────────────
+# Streaming: header setelah rule engine, lalu satu task per hari
+class PlanHeader(NamedTuple):
+    event: bytes                          # baris NDJSON header
+    schedule: Dict[str, str]
+    days: List[Tuple[int, str]]           # (nomor hari di respons, day_key) — hari yang perlu GA
+    day_budget_ms: Optional[int]          # budget per task hari
+    catalog_version: str                  # katalog yang dipakai header; `plan_day` harus sama
+    ready: List[RecommendationDay]        # hari yang sudah jadi (pustaka rencana)
+
+
+class CatalogChangedError(RuntimeError):
+    """Katalog di‑reload di antara `plan_header` dan `plan_day` (stream dihentikan)."""
+
+
+def plan_header(req: RecommendationRequest, seed: Optional[int] = None) -> Optional[PlanHeader]:
+    """
+    Tahap sebelum GA untuk endpoint streaming: BMI, rule engine, dan pool
+    (untuk tahu hari mana yang bisa disusun). Profil yang tercakup pustaka
+    rencana langsung membawa semua hari di `ready`, sama dengan
+    `build_recommendation`. None jika tidak ada satu hari pun.
+    """
+    return _traced(_plan_header, req, seed)
+
+
+def plan_day(req: RecommendationRequest, seed: Optional[int], schedule: Dict[str, str],
+             day: int, day_key: str, budget_ms: Optional[int],
+             catalog_version: str) -> Tuple[Optional[RecommendationDay], bool]:
+    """
+    GA satu hari dari `plan_header` → (`RecommendationDay`, budget habis?).
+    Seed hari diturunkan dari seluruh `schedule`, jadi hasilnya sama
+    dengan hari yang sama di `build_recommendation`. `CatalogChangedError`
+    bila katalog aktif bukan lagi `catalog_version` milik header.
+    """
+    return _traced(_plan_day, req, seed, schedule, day, day_key, budget_ms, catalog_version)
+
+
+def _plan_header(req: RecommendationRequest, seed: Optional[int]) -> Optional[PlanHeader]:
+    bmi = calc_bmi(req.height_cm, req.weight_kg)
+    # satu snapshot katalog untuk header; tiap `plan_day` memeriksa versinya
+    catalog = get_catalog()
+    with metrics.stage("library"):
+        stored = _stored_plan(req, bmi, catalog)
+    if stored is not None:
+        with metrics.stage("format"):
+            ready = [build_day(catalog, day, stored.schedule[key], ids)
+                     for day, (key, ids) in enumerate(stored.days.items(), 1)]
+        if not ready:
+            return None
+        return PlanHeader(
+            event=header_event(bmi, bmi_category(bmi), stored.split_type, stored.schedule,
+                               stored.ga_profile, len(ready)),
+            schedule=stored.schedule,
+            days=[],
+            day_budget_ms=None,
+            catalog_version=catalog.version,
+            ready=ready,
+        )
+
+    with metrics.stage("rules"):
+        split_type, schedule = run_rules(
+            req.gender, bmi, req.injuries, req.available_days, req.preferred_body_part,
+        )
+    profile, ga_profile = resolve_profile(req.ga_profile)
+    with metrics.stage("pool"):
+        pools = build_daily_pool(schedule, catalog, req.injuries, req.preferred_equipment)
+    day_keys = [key for key in schedule if len(pools.get(key, ())) > 0]
+    if not day_keys:
+        return None
+
+    budget = schedule_budget(ga_profile, req.time_budget_ms)
+    return PlanHeader(
+        event=header_event(bmi, bmi_category(bmi), split_type, schedule, profile, len(day_keys)),
+        schedule=schedule,
+        days=list(enumerate(day_keys, 1)),
+        day_budget_ms=None if budget is None else max(1, int(budget * 1000 / len(day_keys))),
+        catalog_version=catalog.version,
+        ready=[],
+    )
+
+
+def _plan_day(req: RecommendationRequest, seed: Optional[int], schedule: Dict[str, str],
+              day: int, day_key: str, budget_ms: Optional[int],
+              catalog_version: str) -> Tuple[Optional[RecommendationDay], bool]:
+    catalog = get_catalog()
+    if catalog.version != catalog_version:
+        # hari lain di stream ini disusun dari katalog lama: jangan campur
+        raise CatalogChangedError("Exercise catalog changed during streaming, retry the request")
+    with metrics.stage("pool"):
+        pools = build_daily_pool({day_key: schedule[day_key]}, catalog, req.injuries, req.preferred_equipment)
+    with metrics.stage("ga"):
+        daywise = run_ga_schedule(
+            schedule,
+            pools,
+            injured_body_parts=req.injuries,
+            preferred_body_parts=req.preferred_body_part,
+            bmi=calc_bmi(req.height_cm, req.weight_kg),
+            catalog=catalog,
+            seed=seed,
+            profile=req.ga_profile,
+            time_budget_ms=budget_ms,
+            days=[day_key],
+            pool_keys=daily_pool_keys({day_key: schedule[day_key]}, catalog, req.injuries,
+                                      req.preferred_equipment),
+        )
+    if not daywise:
+        return None, False
+    info = daywise[day_key]
+    with metrics.stage("format"):
+        day_model = build_day(catalog, day, info["focus"], [str(e["exercise_id"]) for e in info["exercises"]])
+    return day_model, info["budget_exhausted"]
+
+
+# ────────────────────────────────────────────────────────────────
+# Edit satu hari: tanpa rule engine dan tanpa hari lain
+class PlanEditError(ValueError):
+    """Request edit tidak cocok dengan katalog / pool hari itu (router: 422)."""
+
+
+def regenerate_day(req: RegenerateDayRequest, seed: Optional[int] = None) -> Optional[RecommendationDay]:
+    """
+    Susun ulang satu hari: pool hari itu + GA untuk hari itu saja. Latihan
+    saat ini dikeluarkan dari pool selama sisanya masih cukup, agar hasil
+    reroll benar‑benar berbeda. None jika pool hari itu kosong.
+    """
+    return _traced(_regenerate_day, req, seed)
+
+
+def swap_exercise(req: SwapExerciseRequest) -> Optional[RecommendationDay]:
+    """
+    Ganti satu latihan: latihan lain hari itu tetap, slot yang dilepas
+    diisi kandidat terbaik dari pool (`best_replacement`). None jika tidak
+    ada kandidat tersisa.
+    """
+    return _traced(_swap_exercise, req)
+
+
+def _day_rows(req: DayEditRequest, catalog: ExerciseCatalog) -> Tuple[np.ndarray, np.ndarray]:
+    """(pool hari yang diedit, baris katalog latihan hari itu saat ini)."""
+    try:
+        current = catalog.rows_for_ids(req.exercise_ids)
+    except KeyError as exc:
+        raise PlanEditError(f"Unknown exercise_id {exc.args[0]!r}") from None
+    with metrics.stage("pool"):
+        rows = build_daily_pool({"day": req.day_focus}, catalog, req.injuries, req.preferred_equipment)["day"]
+    return rows, current
+
+
+def _regenerate_day(req: RegenerateDayRequest, seed: Optional[int]) -> Optional[RecommendationDay]:
+    bmi = calc_bmi(req.height_cm, req.weight_kg)
+    catalog = get_catalog()
+    rows, current = _day_rows(req, catalog)
+    fresh = rows[~np.isin(rows, current)]
+    if len(fresh) >= day_gene_count(req.day_focus, set(map(str.lower, req.preferred_body_part))):
+        rows = fresh
+
+    with metrics.stage("ga"):
+        daywise = run_ga_schedule(
+            {"day": req.day_focus},
+            {"day": rows},
+            injured_body_parts=req.injuries,
+            preferred_body_parts=req.preferred_body_part,
+            bmi=bmi,
+            catalog=catalog,
+            seed=seed,
+            profile=req.ga_profile,
+            time_budget_ms=req.time_budget_ms,
+        )
+    if not daywise:
+        return None
+    with metrics.stage("format"):
+        ids = [str(e["exercise_id"]) for e in daywise["day"]["exercises"]]
+        return build_day(catalog, req.day, req.day_focus, ids)
+
+
+def _swap_exercise(req: SwapExerciseRequest) -> Optional[RecommendationDay]:
+    if req.exercise_id not in req.exercise_ids:
+        raise PlanEditError(f"exercise_id {req.exercise_id!r} is not part of day {req.day}")
+    bmi = calc_bmi(req.height_cm, req.weight_kg)
+    catalog = get_catalog()
+    rows, current = _day_rows(req, catalog)
+    try:
+        rejected = catalog.rows_for_ids(req.exclude)
+    except KeyError as exc:
+        raise PlanEditError(f"Unknown exercise_id {exc.args[0]!r}") from None
+
+    slot = req.exercise_ids.index(req.exercise_id)
+    fixed = np.delete(current, slot)
+    if not np.isin(fixed, rows).all():
+        raise PlanEditError(f"exercise_ids do not match the {req.day_focus!r} pool for this profile")
+
+    with metrics.stage("ga"):
+        row = best_replacement(
+            req.day_focus, rows, fixed, np.concatenate([current[slot:slot + 1], rejected]),
+            injured_body_parts=req.injuries,
+            preferred_body_parts=req.preferred_body_part,
+            bmi=bmi,
+            catalog=catalog,
+        )
+    if row is None:
+        return None
+    with metrics.stage("format"):
+        ids = list(req.exercise_ids)
+        ids[slot] = str(catalog.records([row])[0]["exercise_id"])
+        return build_day(catalog, req.day, req.day_focus, ids)
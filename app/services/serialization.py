@@ -0,0 +1,208 @@
+"""
+Serialisasi respons rekomendasi tanpa validasi ulang per request.
+
+Record katalog sudah dinormalisasi `csv_loader`, jadi `ExerciseOut`
+cukup divalidasi sekali per versi katalog (memo `catalog.derived`,
+dikunci `exercise_id`). Dari objek itu juga disimpan fragmen JSON per
+latihan; respons dirakit dengan menggabungkan fragmen, dan router
+mengirim byte tersebut apa adanya (`PreEncodedJSONResponse`) sehingga
+FastAPI tidak memvalidasi / meng‑encode `RecommendationResponse` lagi.
+
+Byte yang dihasilkan identik dengan `JSONResponse` FastAPI atas
+`response_model` (alias, separator ringkas, ensure_ascii=False).
+
+Pada katalog bersama (`catalog_shared`), fragmen disimpan di segmen dan
+`ExerciseOut` baru divalidasi dari fragmennya saat latihan itu pertama
+kali dikirim.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import json
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.schemas.exercise import ExerciseOut
+from app.schemas.recommendation import RecommendationDay, RecommendationResponse
+from app.services.catalog_binary import encode_strings
+from app.services.catalog_shared import SharedCatalog, register_shared
+from app.services.exercise_catalog import ExerciseCatalog, catalog_store
+
+
+def _dumps(value: Any) -> str:
+    # sama dengan JSONResponse.render milik Starlette/FastAPI
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+def _fragment(exercise: ExerciseOut) -> str:
+    return _dumps(exercise.model_dump(mode="json", by_alias=True))
+
+
+# ────────────────────────────────────────────────────────────────
+# Memo per katalog
+def _build_models(catalog: ExerciseCatalog) -> Dict[str, ExerciseOut]:
+    models: Dict[str, ExerciseOut] = {}
+    for record in catalog.records(range(catalog.size)):
+        exercise = ExerciseOut.model_validate(record)
+        models.setdefault(exercise.exercise_id, exercise)
+    return models
+
+
+def _build_fragments(catalog: ExerciseCatalog) -> Dict[str, str]:
+    return {eid: _fragment(ex) for eid, ex in exercise_models(catalog).items()}
+
+
+def exercise_models(catalog: ExerciseCatalog) -> Mapping[str, ExerciseOut]:
+    """exercise_id → `ExerciseOut` tervalidasi (jangan dimutasi; dibagi antar request)."""
+    return catalog.derived("exercise_out", _build_models)
+
+
+def exercise_fragments(catalog: ExerciseCatalog) -> Mapping[str, str]:
+    """exercise_id → JSON `ExerciseOut` (by_alias)."""
+    return catalog.derived("exercise_json", _build_fragments)
+
+
+# ────────────────────────────────────────────────────────────────
+# Katalog bersama: fragmen di segmen, model lazy
+class _SegmentMapping(Mapping):
+    def __init__(self, catalog: SharedCatalog):
+        self._catalog = catalog
+
+    def __iter__(self):
+        return iter(dict.fromkeys(self._catalog.exercise_ids(self._catalog.all_rows)))
+
+    def __len__(self) -> int:
+        return len(dict.fromkeys(self._catalog.exercise_ids(self._catalog.all_rows)))
+
+
+class _SharedFragments(_SegmentMapping):
+    """exercise_id → fragmen JSON, dibaca dari segmen per akses."""
+
+    def __getitem__(self, exercise_id: str) -> str:
+        row = int(self._catalog.rows_for_ids([exercise_id])[0])
+        return self._catalog.segment.string("exercise_json", row)
+
+
+class _LazyModels(_SegmentMapping):
+    """exercise_id → `ExerciseOut`, divalidasi dari fragmen saat pertama dipakai."""
+
+    def __init__(self, catalog: SharedCatalog):
+        super().__init__(catalog)
+        self._models: Dict[str, ExerciseOut] = {}
+
+    def __getitem__(self, exercise_id: str) -> ExerciseOut:
+        model = self._models.get(exercise_id)
+        if model is None:
+            model = ExerciseOut.model_validate_json(exercise_fragments(self._catalog)[exercise_id])
+            self._models[exercise_id] = model
+        return model
+
+
+def _export_fragments(catalog: ExerciseCatalog) -> Dict[str, Any]:
+    fragments = exercise_fragments(catalog)
+    # satu fragmen per baris (id duplikat memakai fragmen id tersebut)
+    return encode_strings([fragments[eid] for eid in catalog.exercise_ids(catalog.all_rows)])
+
+
+register_shared("exercise_json", _SharedFragments, _export_fragments)
+register_shared("exercise_out", _LazyModels)
+
+
+def prepare_serialization(catalog: ExerciseCatalog) -> None:
+    exercise_fragments(catalog)
+
+
+catalog_store.on_load(prepare_serialization)
+
+
+# ────────────────────────────────────────────────────────────────
+# Rakit respons
+def _day(catalog: ExerciseCatalog, day: int, focus: str, ids: List[str]) -> Tuple[RecommendationDay, str]:
+    models = exercise_models(catalog)
+    fragments = exercise_fragments(catalog)
+    model = RecommendationDay.model_construct(
+        day=day, day_focus=focus, exercises=[models[eid] for eid in ids],
+    )
+    return model, (f'{{"day":{day},"day_focus":{_dumps(focus)},'
+                   f'"exercises":[{",".join(fragments[eid] for eid in ids)}]}}')
+
+
+def build_day(catalog: ExerciseCatalog, day: int, focus: str, ids: List[str]) -> RecommendationDay:
+    """Satu `RecommendationDay` (endpoint edit hari), dengan JSON siap kirim di `_json`."""
+    model, text = _day(catalog, day, focus, ids)
+    model._json = text.encode("utf-8")
+    return model
+
+
+def build_response(catalog: ExerciseCatalog, bmi: float, bmi_category: str, split_type: str,
+                   schedule: Dict[str, str], daywise: Dict[str, Dict],
+                   ga_profile: str) -> RecommendationResponse:
+    """
+    `RecommendationResponse` dari hasil GA memakai objek `ExerciseOut`
+    yang sudah divalidasi (model_construct, tanpa validator), plus JSON
+    siap kirim di `_json`.
+    """
+    days: List[RecommendationDay] = []
+    day_json: List[str] = []
+    for i, info in enumerate(daywise.values(), 1):
+        model, text = _day(catalog, i, info["focus"], [str(e["exercise_id"]) for e in info["exercises"]])
+        days.append(model)
+        day_json.append(text)
+
+    exhausted = any(info.get("budget_exhausted", False) for info in daywise.values())
+    response = RecommendationResponse.model_construct(
+        bmi=bmi, bmi_category=bmi_category, split_type=split_type,
+        schedule=schedule, days=days, ga_profile=ga_profile, budget_exhausted=exhausted,
+    )
+    response._catalog_version = catalog.version
+    response._json = (
+        f'{{"bmi":{_dumps(bmi)},"bmi_category":{_dumps(bmi_category)},'
+        f'"split_type":{_dumps(split_type)},"schedule":{_dumps(schedule)},'
+        f'"days":[{",".join(day_json)}],'
+        f'"ga_profile":{_dumps(ga_profile)},"budget_exhausted":{_dumps(exhausted)}}}'
+    ).encode("utf-8")
+    return response
+
+
+def response_json(response: Optional[BaseModel]) -> bytes:
+    if response is None:
+        return b"null"
+    if response._json is None:        # dibangun di luar `build_response`
+        response._json = _dumps(response.model_dump(mode="json", by_alias=True)).encode("utf-8")
+    return response._json
+
+
+def batch_json(responses: List[Optional[RecommendationResponse]]) -> bytes:
+    return b"[" + b",".join(response_json(r) for r in responses) + b"]"
+
+
+# ────────────────────────────────────────────────────────────────
+# Event NDJSON (endpoint streaming), satu objek JSON per baris
+def header_event(bmi: float, bmi_category: str, split_type: str, schedule: Dict[str, str],
+                 ga_profile: str, n_days: int) -> bytes:
+    return (
+        f'{{"event":"header","bmi":{_dumps(bmi)},"bmi_category":{_dumps(bmi_category)},'
+        f'"split_type":{_dumps(split_type)},"schedule":{_dumps(schedule)},'
+        f'"ga_profile":{_dumps(ga_profile)},"days":{n_days}}}\n'
+    ).encode("utf-8")
+
+
+def day_event(day: RecommendationDay) -> bytes:
+    # {"day":..} → {"event":"day","day":..}; isi sama dengan `days[i]` respons biasa
+    return b'{"event":"day",' + response_json(day)[1:] + b"\n"
+
+
+def end_event(budget_exhausted: bool) -> bytes:
+    return f'{{"event":"end","budget_exhausted":{_dumps(budget_exhausted)}}}\n'.encode("utf-8")
+
+
+def error_event(detail: str) -> bytes:
+    return f'{{"event":"error","detail":{_dumps(detail)}}}\n'.encode("utf-8")
+
+
+class PreEncodedJSONResponse(Response):
+    """Body sudah berupa byte JSON; tidak ada encode ulang."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content
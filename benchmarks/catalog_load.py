@@ -0,0 +1,177 @@
+"""
+Benchmark startup worker: katalog dari CSV vs artefak biner vs segmen bersama.
+
+Tiap kombinasi (katalog, jalur) dijalankan di proses Python baru agar
+waktu & memori mencerminkan worker yang baru di‑spawn. Dicatat:
+  load_ms      CSV: `read_exercises`; biner: `BinaryCatalog` (mmap + indeks
+               dari array kolom, tanpa DataFrame); shared: `load_shared`
+               (segmen sudah ada, dibuat sebelum run)
+  catalog_ms   `ExerciseCatalog` + fitur GA + fragmen JSON (worker siap kirim)
+  rss_mb       RSS setelah katalog siap; rss_delta_mb = selisih vs setelah import
+  pss_mb       PSS (/proc/self/smaps_rollup): halaman bersama dibagi rata
+               antar proses yang memetakannya — angka jujur untuk mode shared
+  served_*     RSS/PSS setelah melayani `--requests` rekomendasi
+               (rule → pool → GA numpy/fast → JSON), halaman yang disentuh
+               request ikut terhitung
+
+Artefak dibuat dulu dengan `python -m scripts.compile_catalog <csv>`.
+`--workers N` menjalankan N proses shared sekaligus agar PSS
+memperlihatkan pembagian segmen.
+
+    python -m benchmarks.catalog_load --catalog data/fitness_dataset.csv \\
+        --catalog benchmarks/data/fitness_100000.csv --json load.json
+"""
+
+from typing import Dict, List
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+MODES = ("csv", "binary", "shared")
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _pss_mb() -> float:
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            for line in fh:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def _serve(catalog, requests: int) -> None:
+    from app.rules.decision_table import decide
+    from app.services.exercise_filter import build_daily_pool
+    from app.services.genetic_optimizer import run_ga_schedule
+    from app.services.serialization import build_response, response_json
+    from benchmarks.stages import cases
+
+    for i, case in enumerate(cases(requests, seed=1)):
+        split_type, schedule = decide(case["gender"], case["bmi"], case["injuries"], case["available_days"], [])
+        pools = build_daily_pool(schedule, catalog, case["injuries"], case["preferred_equipment"])
+        daywise = run_ga_schedule(schedule, pools, injured_body_parts=case["injuries"], bmi=case["bmi"],
+                                  catalog=catalog, seed=i, parallelism="serial", engine="numpy",
+                                  optimizer="ga", profile="fast")
+        if daywise:
+            response_json(build_response(catalog, case["bmi"], "", split_type, schedule, daywise, "fast"))
+
+
+def _child(mode: str, path: str, hold: float = 0.0, requests: int = 0) -> Dict:
+    from app.services.catalog_binary import CompiledCatalog
+    from app.services.catalog_shared import load_shared
+    from app.services.csv_loader import binary_path, read_exercises
+    from app.services.exercise_catalog import BinaryCatalog, ExerciseCatalog
+    from app.services.genetic_optimizer import prepare_catalog
+    from app.services.serialization import prepare_serialization
+
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    df = None
+    if mode == "csv":
+        df = read_exercises(path)
+    elif mode == "binary":
+        catalog = BinaryCatalog(CompiledCatalog(binary_path(path)))
+    else:
+        catalog = load_shared(path)
+    loaded = time.perf_counter()
+    if df is not None:
+        catalog = ExerciseCatalog(df)
+    prepare_catalog(catalog)
+    prepare_serialization(catalog)
+    done = time.perf_counter()
+    time.sleep(hold)            # proses saudara sempat memetakan segmen yang sama
+    rss_after, pss_after = _rss_mb(), _pss_mb()
+    _serve(catalog, requests)
+    time.sleep(hold)
+    return {
+        "rows": catalog.size,
+        "load_ms": round((loaded - start) * 1000, 2),
+        "catalog_ms": round((done - loaded) * 1000, 2),
+        "total_ms": round((done - start) * 1000, 2),
+        "rss_mb": round(rss_after, 1),
+        "rss_delta_mb": round(rss_after - rss_before, 1),
+        "pss_mb": round(pss_after, 1),
+        "served_rss_mb": round(_rss_mb(), 1),
+        "served_pss_mb": round(_pss_mb(), 1),
+    }
+
+
+def _spawn(mode: str, path: str, workers: int, requests: int) -> List[Dict]:
+    hold = "2" if workers > 1 else "0"
+    procs = [subprocess.Popen([sys.executable, "-m", "benchmarks.catalog_load", "--child", mode, path,
+                               "--hold", hold, "--requests", str(requests)],
+                              stdout=subprocess.PIPE, text=True)
+             for _ in range(workers)]
+    outs = []
+    for proc in procs:
+        stdout, _ = proc.communicate()
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        outs.append(json.loads(stdout.strip().splitlines()[-1]))
+    return outs
+
+
+def run(paths: List[str], runs: int, workers: int = 1, requests: int = 0) -> List[Dict]:
+    from app.services.catalog_shared import load_shared
+
+    results = []
+    for path in paths:
+        load_shared(path)           # segmen dibuat sekali, di luar pengukuran
+        for mode in MODES:
+            samples = []
+            for _ in range(runs):
+                group = _spawn(mode, path, workers, requests)
+                # per run: worker tercepat untuk waktu, rata‑rata untuk memori
+                sample = min(group, key=lambda s: s["total_ms"])
+                for field in ("rss_mb", "rss_delta_mb", "pss_mb", "served_rss_mb", "served_pss_mb"):
+                    sample[field] = round(sum(s[field] for s in group) / len(group), 1)
+                samples.append(sample)
+            best = min(samples, key=lambda s: s["total_ms"])
+            results.append({"catalog": path, "mode": mode, "runs": runs, "workers": workers,
+                            "requests": requests, **best})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", action="append", help="CSV katalog (boleh berulang)")
+    parser.add_argument("--runs", type=int, default=3, help="proses per kombinasi; diambil yang tercepat")
+    parser.add_argument("--workers", type=int, default=1, help="proses serentak per run (memori dirata‑rata)")
+    parser.add_argument("--requests", type=int, default=50, help="rekomendasi yang dilayani sebelum served_*")
+    parser.add_argument("--json", help="tulis hasil ke file JSON")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "CSV"), help=argparse.SUPPRESS)
+    parser.add_argument("--hold", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(*args.child, hold=args.hold, requests=args.requests)))
+        return
+
+    from app.services.csv_loader import DATASET_PATH
+    results = run(args.catalog or [DATASET_PATH], args.runs, args.workers, args.requests)
+    print(f"{'rows':>8}  {'mode':<7}{'load ms':>10}{'catalog ms':>12}{'total ms':>10}"
+          f"{'rss MB':>9}{'Δrss MB':>9}{'pss MB':>9}{'served rss':>12}{'served pss':>12}")
+    for r in results:
+        print(f"{r['rows']:>8}  {r['mode']:<7}{r['load_ms']:>10}{r['catalog_ms']:>12}"
+              f"{r['total_ms']:>10}{r['rss_mb']:>9}{r['rss_delta_mb']:>9}{r['pss_mb']:>9}"
+              f"{r['served_rss_mb']:>12}{r['served_pss_mb']:>12}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
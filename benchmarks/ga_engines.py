@@ -0,0 +1,98 @@
+"""
+Benchmark engine GA: pygad vs NumPy (`app.services.ga_engine`), plus
+optimizer "search" (branch‑and‑bound / local search, tanpa RNG).
+
+Untuk beberapa pool harian yang representatif, tiap engine dijalankan
+`--runs` kali dengan seed berbeda. Dicatat latensi per run (p50/p95/mean)
+dan skor terbaik yang dicapai (tanpa noise generasi 0).
+
+    python -m benchmarks.ga_engines --runs 30 --json results.json
+"""
+
+from typing import Dict, List
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.services.exercise_catalog import get_catalog
+from app.services.exercise_filter import build_daily_pool
+from app.services.genetic_optimizer import (
+    _build_pool_context, _optimize_day, _score_population, prepare_catalog,
+)
+
+ENGINES = ("pygad", "numpy", "search")
+
+# (fokus, cedera, alat, jumlah gene)
+SCENARIOS = [
+    ("push", [], [], 5),
+    ("upper", ["chest"], ["dumbbell"], 6),
+    ("legs", [], ["barbell"], 5),
+    ("cardio", [], [], 3),
+    ("hamstrings", [], [], 4),
+    ("fullbody", ["back"], [], 6),
+]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    arr = np.asarray(values)
+    return {
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+    }
+
+
+def _optimize(ctx, num_genes: int, seed: int, engine: str) -> np.ndarray:
+    if engine == "search":
+        return _optimize_day(ctx, num_genes, optimizer="search")
+    return _optimize_day(ctx, num_genes, seed, engine)
+
+
+def run(runs: int) -> List[Dict]:
+    catalog = get_catalog()
+    prepare_catalog(catalog)
+    results = []
+    for focus, injuries, equipment, num_genes in SCENARIOS:
+        rows = build_daily_pool({"day_1": focus}, catalog, injuries, equipment)["day_1"]
+        ctx = _build_pool_context(focus, set(injuries), catalog, rows, set(), 24.0)
+        for engine in ENGINES:
+            _optimize(ctx, num_genes, 0, engine)          # warm-up
+            latencies, scores = [], []
+            for seed in range(runs):
+                start = time.perf_counter()
+                best = _optimize(ctx, num_genes, seed + 1, engine)
+                latencies.append((time.perf_counter() - start) * 1000)
+                scores.append(float(_score_population(ctx, best[None, :])[0]))
+            results.append({
+                "focus": focus,
+                "pool_size": int(len(rows)),
+                "num_genes": num_genes,
+                "engine": engine,
+                "latency_ms": _summary(latencies),
+                "best_score": _summary(scores),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--json", help="tulis hasil ke file JSON")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    print(f"{'focus':<12}{'pool':>5}{'genes':>6}  {'engine':<7}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'score mean':>12}{'score p50':>11}")
+    for r in results:
+        print(f"{r['focus']:<12}{r['pool_size']:>5}{r['num_genes']:>6}  {r['engine']:<7}"
+              f"{r['latency_ms']['p50']:>9}{r['latency_ms']['p95']:>9}"
+              f"{r['best_score']['mean']:>12}{r['best_score']['p50']:>11}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Load test end‑to‑end `/api/v1/recommendation/` dengan concurrency bertahap.
+
+App dijalankan tanpa jaringan keluar:
+  asgi      in‑process lewat `httpx.ASGITransport` (lifespan ikut
+            dijalankan: executor GA + warm‑up), client & server satu loop
+  uvicorn   `python -m uvicorn app.main:app` di 127.0.0.1 port acak,
+            `--server-workers` proses; client di proses ini
+
+Tiap tahap concurrency (`--concurrency 1,2,4,...`) adalah closed loop:
+N client mengirim request berikutnya begitu respons sebelumnya tiba,
+selama `--duration` detik. Request diambil bergiliran dari campuran
+`--unique` profil acak (seed tetap): gender, BMI (bobot per band),
+available_days, cedera, preferensi body part, dan alat. Dicatat per
+tahap:
+  throughput_rps   respons sukses per detik
+  p50/p95/p99_ms   latensi request sukses
+  queue_p95_ms     X-Queue-Wait-Ms (antrean executor GA / threadpool)
+  errors           per status HTTP (atau nama exception)
+Titik saturasi = tahap pertama yang throughput‑nya naik < `--knee`
+dibanding tahap terbaik sebelumnya.
+
+Baseline: `--write-baseline FILE` menyimpan p99, throughput, dan error
+rate per tahap + toleransi; `--baseline FILE` membandingkan run ini dan
+keluar dengan status 1 bila p99 naik / throughput turun melebihi
+toleransi atau error rate melebihi batas.
+
+    python -m benchmarks.load --concurrency 1,2,4,8 --duration 10 \\
+        --write-baseline benchmarks/load_baseline.json
+    python -m benchmarks.load --concurrency 1,2,4,8 --duration 10 \\
+        --baseline benchmarks/load_baseline.json --json load.json
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from app import config
+
+ENDPOINT = "/api/v1/recommendation/"
+BODY_PARTS = ("abs", "back", "biceps", "calves", "chest", "forearms", "glutes",
+              "hamstrings", "neck", "quadriceps", "shoulders", "triceps")
+EQUIPMENT = ("dumbbell", "barbell", "body weight", "cable", "smith machine", "kettlebell")
+# (BMI min, BMI max, bobot)
+BMI_MIX = ((16.5, 18.5, 0.10), (18.5, 25.0, 0.45), (25.0, 30.0, 0.30), (30.0, 38.0, 0.15))
+DAYS_MIX = (0.05, 0.15, 0.35, 0.30, 0.15)
+DEFAULT_TOLERANCE = {"p99": 0.25, "throughput": 0.15, "error_rate": 0.0}
+
+
+# ────────────────────────────────────────────────────────────────
+# Campuran request
+def _pick(rng: random.Random, items, weights) -> Any:
+    return rng.choices(items, weights=weights, k=1)[0]
+
+
+def request_mix(unique: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(unique):
+        low, high, _ = _pick(rng, BMI_MIX, [w for *_, w in BMI_MIX])
+        height = rng.uniform(150.0, 195.0)
+        weight = rng.uniform(low, high) * (height / 100) ** 2
+        injuries = rng.sample(BODY_PARTS, _pick(rng, (0, 1, 2), (0.6, 0.3, 0.1)))
+        preferred = rng.sample([b for b in BODY_PARTS if b not in injuries], _pick(rng, (0, 1), (0.8, 0.2)))
+        equipment = rng.sample(EQUIPMENT, _pick(rng, (0, 1, 2), (0.4, 0.4, 0.2)))
+        out.append({
+            "gender": rng.choice(("male", "female")),
+            "height_cm": round(height, 1),
+            "weight_kg": round(weight, 1),
+            "available_days": _pick(rng, (1, 2, 3, 4, 5), DAYS_MIX),
+            "injuries": injuries,
+            "preferred_body_part": preferred,
+            "preferred_equipment": equipment,
+        })
+    return out
+
+
+# ────────────────────────────────────────────────────────────────
+# Target: ASGI in‑process atau uvicorn lokal
+async def _wait_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"app not ready after {timeout:.0f}s")
+        await asyncio.sleep(0.2)
+
+
+@asynccontextmanager
+async def asgi_target(timeout: float) -> AsyncIterator[httpx.AsyncClient]:
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest",
+                                     timeout=timeout) as client:
+            await _wait_ready(client, timeout)
+            yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_target(timeout: float, workers: int) -> AsyncIterator[httpx.AsyncClient]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.getcwd(),
+    )
+    try:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout,
+                                     limits=limits) as client:
+            await _wait_ready(client, timeout)
+            yield client
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# ────────────────────────────────────────────────────────────────
+# Satu tahap concurrency
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    return round(float(np.percentile(values, q)), 2) if values else None
+
+
+async def run_stage(client: httpx.AsyncClient, bodies: List[Dict], concurrency: int,
+                    duration: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    queue_waits: List[float] = []
+    errors: Dict[str, int] = {}
+    cursor = {"next": 0}
+    deadline = time.perf_counter() + duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            body = bodies[cursor["next"] % len(bodies)]
+            cursor["next"] += 1
+            start = time.perf_counter()
+            try:
+                resp = await client.post(ENDPOINT, json=body)
+            except httpx.HTTPError as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            # 404 = profil yang memang tidak bisa disusun, bukan kegagalan server
+            if resp.status_code in (200, 201, 404):
+                latencies.append(elapsed)
+                wait = resp.headers.get("X-Queue-Wait-Ms")
+                if wait is not None:
+                    queue_waits.append(float(wait))
+            else:
+                errors[str(resp.status_code)] = errors.get(str(resp.status_code), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    total = len(latencies) + sum(errors.values())
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": len(latencies),
+        "errors": errors,
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "max_ms": round(max(latencies), 2) if latencies else None,
+        "queue_p50_ms": _percentile(queue_waits, 50),
+        "queue_p95_ms": _percentile(queue_waits, 95),
+    }
+
+
+def saturation(stages: List[Dict], knee: float) -> Optional[int]:
+    """Concurrency tahap pertama yang throughput‑nya naik < `knee` dari yang terbaik sebelumnya."""
+    best = 0.0
+    for stage in stages:
+        if best and stage["throughput_rps"] < best * (1 + knee):
+            return stage["concurrency"]
+        best = max(best, stage["throughput_rps"])
+    return None
+
+
+async def run(mode: str, levels: List[int], duration: float, unique: int, warmup: int,
+              timeout: float, server_workers: int, seed: int = 0) -> List[Dict]:
+    bodies = request_mix(unique, seed)
+    target = asgi_target(timeout) if mode == "asgi" else uvicorn_target(timeout, server_workers)
+    stages = []
+    async with target as client:
+        for body in bodies[:warmup]:
+            await client.post(ENDPOINT, json=body)
+        for level in levels:
+            stage = await run_stage(client, bodies, level, duration)
+            stages.append(stage)
+            print(f"  c={level:<4} {stage['throughput_rps']:>8} rps  p50 {stage['p50_ms']} ms  "
+                  f"p99 {stage['p99_ms']} ms  errors {sum(stage['errors'].values())}", flush=True)
+    return stages
+
+
+# ────────────────────────────────────────────────────────────────
+# Baseline
+def make_baseline(report: Dict, tolerance: Dict[str, float]) -> Dict:
+    return {
+        "meta": report["meta"],
+        "tolerance": tolerance,
+        "stages": {
+            str(s["concurrency"]): {"p99_ms": s["p99_ms"], "throughput_rps": s["throughput_rps"],
+                                    "error_rate": s["error_rate"]}
+            for s in report["stages"]
+        },
+    }
+
+
+def compare(report: Dict, baseline: Dict, tolerance: Dict[str, float]) -> List[str]:
+    """Daftar regresi (kosong = lolos) untuk tahap yang ada di run ini dan di baseline."""
+    failures = []
+    for stage in report["stages"]:
+        base = baseline["stages"].get(str(stage["concurrency"]))
+        if base is None:
+            continue
+        c = stage["concurrency"]
+        if stage["p99_ms"] is not None and base["p99_ms"] is not None \
+                and stage["p99_ms"] > base["p99_ms"] * (1 + tolerance["p99"]):
+            failures.append(f"c={c}: p99 {stage['p99_ms']} ms > {base['p99_ms']} ms "
+                            f"+{tolerance['p99']:.0%}")
+        if stage["throughput_rps"] < base["throughput_rps"] * (1 - tolerance["throughput"]):
+            failures.append(f"c={c}: throughput {stage['throughput_rps']} rps < "
+                            f"{base['throughput_rps']} rps -{tolerance['throughput']:.0%}")
+        if stage["error_rate"] > max(base["error_rate"], tolerance["error_rate"]):
+            failures.append(f"c={c}: error rate {stage['error_rate']:.2%} > "
+                            f"{max(base['error_rate'], tolerance['error_rate']):.2%}")
+    return failures
+
+
+def _tolerance(base: Dict[str, float], args: argparse.Namespace) -> Dict[str, float]:
+    overrides = {"p99": args.tolerance_p99, "throughput": args.tolerance_throughput,
+                 "error_rate": args.max_error_rate}
+    return {**DEFAULT_TOLERANCE, **base, **{k: v for k, v in overrides.items() if v is not None}}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", default="asgi", choices=("asgi", "uvicorn"))
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="tahap concurrency, dipisah koma")
+    parser.add_argument("--duration", type=float, default=10.0, help="detik per tahap")
+    parser.add_argument("--unique", type=int, default=500, help="jumlah profil berbeda di campuran request")
+    parser.add_argument("--warmup", type=int, default=10, help="request sebelum tahap pertama (tidak diukur)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="timeout per request & start app (detik)")
+    parser.add_argument("--server-workers", type=int, default=1, help="worker uvicorn (mode uvicorn)")
+    parser.add_argument("--knee", type=float, default=0.10, help="kenaikan throughput minimum sebelum dianggap jenuh")
+    parser.add_argument("--seed", type=int, default=0, help="seed campuran request")
+    parser.add_argument("--baseline", help="bandingkan dengan file baseline; status 1 bila regresi")
+    parser.add_argument("--write-baseline", help="tulis hasil run ini sebagai baseline")
+    parser.add_argument("--tolerance-p99", type=float, help="kenaikan p99 yang masih diterima (0.25 = 25%%)")
+    parser.add_argument("--tolerance-throughput", type=float, help="penurunan throughput yang masih diterima")
+    parser.add_argument("--max-error-rate", type=float, help="error rate maksimum per tahap")
+    parser.add_argument("--json", help="tulis hasil ke file JSON")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    print(f"load test {args.mode}: concurrency {levels}, {args.duration:.0f}s per tahap")
+    stages = asyncio.run(run(args.mode, levels, args.duration, args.unique, args.warmup,
+                             args.timeout, args.server_workers, args.seed))
+
+    from benchmarks.stages import _git_commit
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "mode": args.mode,
+            "server_workers": args.server_workers if args.mode == "uvicorn" else 1,
+            "duration_s": args.duration,
+            "unique": args.unique,
+            "cpus": os.cpu_count(),
+            "ga_workers": config.GA_WORKERS,
+            "ga_engine": config.GA_ENGINE,
+            "ga_profile": config.GA_PROFILE,
+            "deterministic": config.DETERMINISTIC,
+        },
+        "stages": stages,
+        "saturation_concurrency": saturation(stages, args.knee),
+    }
+
+    print(f"{'conc':>5}{'req':>7}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'max ms':>10}{'queue p95':>11}{'errors':>8}")
+    for s in stages:
+        print(f"{s['concurrency']:>5}{s['requests']:>7}{s['throughput_rps']:>9}{s['p50_ms']!s:>10}"
+              f"{s['p95_ms']!s:>10}{s['p99_ms']!s:>10}{s['max_ms']!s:>10}{s['queue_p95_ms']!s:>11}"
+              f"{sum(s['errors'].values()):>8}")
+    print(f"saturasi: concurrency {report['saturation_concurrency'] or '-'}")
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        tolerance = _tolerance(baseline.get("tolerance", {}), args)
+        failures = compare(report, baseline, tolerance)
+        report["baseline"] = {"path": args.baseline, "tolerance": tolerance, "failures": failures}
+        for line in failures:
+            print(f"REGRESI {line}")
+        print(f"baseline {args.baseline}: {'GAGAL' if failures else 'lolos'}")
+        status = 1 if failures else 0
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as fh:
+            json.dump(make_baseline(report, _tolerance({}, args)), fh, indent=2)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
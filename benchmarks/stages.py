@@ -0,0 +1,236 @@
+"""
+Benchmark per tahap pipeline rekomendasi, per katalog.
+
+Tahap katalog (sekali per katalog, diulang `--runs` kali):
+  load_exercises   baca + parse CSV (`read_exercises`, tanpa lru_cache)
+  catalog_index    bangun `ExerciseCatalog`
+  ga_features      `prepare_catalog` (fitur GA per latihan)
+
+Tahap per kasus, atas matriks gender × band BMI × available_days ×
+cedera × alat:
+  rules            decision table (`decide`)
+  rules_experta    `FitnessRuleEngine` (dilewati jika experta tidak ada)
+  build_daily_pool semua hari, cache pool dikosongkan dulu
+  fitness_call     satu panggilan fitness untuk satu solusi (hari pertama)
+  run_ga_schedule  seluruh jadwal, seed tetap per kasus
+  serialize        `build_response` + JSON respons (fragmen per katalog)
+
+Katalog sintetis dibuat dengan `benchmarks.synth_catalog`. Hasil JSON
+memuat commit & konfigurasi agar bisa dibandingkan antar commit.
+
+    python -m benchmarks.stages --catalog data/fitness_dataset.csv \\
+        --catalog benchmarks/data/fitness_10000.csv --json stages.json
+"""
+
+from itertools import product
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+
+import numpy as np
+
+from app import config
+from app.rules.decision_table import decide
+from app.services.csv_loader import DATASET_PATH, file_version, read_exercises
+from app.services.exercise_catalog import ExerciseCatalog
+from app.services.exercise_filter import build_daily_pool, clear_pool_cache
+from app.services.genetic_optimizer import (
+    _build_pool_context, _make_batch_fitness_func, prepare_catalog, run_ga_schedule,
+)
+from app.services.serialization import build_response, prepare_serialization, response_json
+
+GENDERS = ("male", "female")
+BMI_BANDS = {"underweight": 17.5, "normal": 22.0, "overweight": 27.5, "obese": 33.0}
+DAYS = (1, 2, 3, 4, 5)
+INJURIES = ((), ("chest",), ("back", "glutes"))
+EQUIPMENT = ((), ("dumbbell",), ("barbell", "cable"))
+
+CATALOG_STAGES = ("load_exercises", "catalog_index", "ga_features")
+CASE_STAGES = ("rules", "rules_experta", "build_daily_pool", "fitness_call",
+               "run_ga_schedule", "serialize")
+
+
+def _ms(fn: Callable, repeat: int = 1) -> float:
+    """Rata‑rata ms per panggilan atas `repeat` panggilan."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    arr = np.asarray(values)
+    return {
+        "n": int(arr.size),
+        "mean": round(float(arr.mean()), 4),
+        "p50": round(float(np.percentile(arr, 50)), 4),
+        "p95": round(float(np.percentile(arr, 95)), 4),
+        "max": round(float(arr.max()), 4),
+    }
+
+
+def _experta_runner():
+    try:
+        from app.rules.rule_engine import FitnessRuleEngine, UserInput
+    except Exception:            # experta tidak terpasang / tidak kompatibel
+        return None
+
+    def run(gender, bmi, injuries, days, preferred):
+        engine = FitnessRuleEngine()
+        engine.reset()
+        engine.declare(UserInput(gender=gender, bmi=bmi, injuries=injuries,
+                                 available_days=days, preferred_body_part=preferred))
+        engine.run()
+        return engine.get_result()
+
+    return run
+
+
+def cases(sample: int = 0, seed: int = 0) -> List[Dict]:
+    matrix = [
+        {"gender": g, "bmi_band": band, "bmi": bmi, "available_days": d,
+         "injuries": list(inj), "preferred_equipment": list(eq)}
+        for g, (band, bmi), d, inj, eq in product(GENDERS, BMI_BANDS.items(), DAYS, INJURIES, EQUIPMENT)
+    ]
+    if 0 < sample < len(matrix):
+        matrix = random.Random(seed).sample(matrix, sample)
+    return matrix
+
+
+def load_catalog(path: str) -> Dict:
+    """Tahap katalog; mengembalikan katalog terakhir + waktu tiap tahap."""
+    df = read_exercises(path)
+    catalog = ExerciseCatalog(df, version=file_version(path))
+    timings = {
+        "load_exercises": _ms(lambda: read_exercises(path)),
+        "catalog_index": _ms(lambda: ExerciseCatalog(df, version=catalog.version)),
+        "ga_features": _ms(lambda: prepare_catalog(ExerciseCatalog(df, version=catalog.version))),
+    }
+    prepare_catalog(catalog)
+    prepare_serialization(catalog)
+    return {"catalog": catalog, "timings": timings}
+
+
+def run_case(catalog: ExerciseCatalog, case: Dict, seed: int, experta) -> Dict[str, float]:
+    gender, bmi, days = case["gender"], case["bmi"], case["available_days"]
+    injuries, equipment = case["injuries"], case["preferred_equipment"]
+    timings: Dict[str, float] = {}
+
+    timings["rules"] = _ms(lambda: decide(gender, bmi, injuries, days, []), repeat=200)
+    if experta is not None:
+        timings["rules_experta"] = _ms(lambda: experta(gender, bmi, injuries, days, []))
+    split_type, schedule = decide(gender, bmi, injuries, days, [])
+
+    clear_pool_cache()
+    start = time.perf_counter()
+    pools = build_daily_pool(schedule, catalog, injuries, equipment)
+    timings["build_daily_pool"] = (time.perf_counter() - start) * 1000
+
+    first_day = next(iter(schedule))
+    rows = pools[first_day]
+    if len(rows):
+        ctx = _build_pool_context(schedule[first_day], set(injuries), catalog, rows, set(), bmi)
+        fitness = _make_batch_fitness_func(ctx)
+        solution = np.random.default_rng(seed).integers(0, len(rows), size=(1, ctx.exercises_per_day))
+        ga_stub = SimpleNamespace(generations_completed=1)
+        timings["fitness_call"] = _ms(lambda: fitness(ga_stub, solution, None), repeat=100)
+
+    start = time.perf_counter()
+    daywise = run_ga_schedule(schedule, pools, injured_body_parts=injuries, bmi=bmi,
+                              catalog=catalog, seed=seed)
+    timings["run_ga_schedule"] = (time.perf_counter() - start) * 1000
+
+    def serialize():
+        response_json(build_response(catalog, bmi, "", split_type, schedule, daywise, config.GA_PROFILE))
+
+    if daywise:
+        timings["serialize"] = _ms(serialize, repeat=5)
+    return timings
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run(paths: List[str], runs: int, sample: int, with_cases: bool = False) -> Dict:
+    experta = _experta_runner()
+    matrix = cases(sample)
+    results = []
+    for path in paths:
+        catalog_timings: Dict[str, List[float]] = {s: [] for s in CATALOG_STAGES}
+        for _ in range(runs):
+            loaded = load_catalog(path)
+            for stage, value in loaded["timings"].items():
+                catalog_timings[stage].append(value)
+        catalog = loaded["catalog"]
+
+        case_timings: Dict[str, List[float]] = {s: [] for s in CASE_STAGES}
+        records = []
+        for i, case in enumerate(matrix):
+            timings = run_case(catalog, case, seed=i + 1, experta=experta)
+            for stage, value in timings.items():
+                case_timings[stage].append(value)
+            if with_cases:
+                records.append({**case, "timings_ms": {k: round(v, 4) for k, v in timings.items()}})
+
+        entry = {
+            "path": path,
+            "size": catalog.size,
+            "version": catalog.version,
+            "stages_ms": {
+                **{s: _summary(v) for s, v in catalog_timings.items()},
+                **{s: _summary(v) for s, v in case_timings.items() if v},
+            },
+        }
+        if with_cases:
+            entry["cases"] = records
+        results.append(entry)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "cases": len(matrix),
+            "runs": runs,
+            "ga_engine": config.GA_ENGINE,
+            "optimizer": config.OPTIMIZER,
+            "ga_profile": config.GA_PROFILE,
+            "ga_day_parallelism": config.GA_DAY_PARALLELISM,
+        },
+        "catalogs": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", action="append", help="CSV katalog (boleh berulang)")
+    parser.add_argument("--runs", type=int, default=3, help="ulangan tahap katalog")
+    parser.add_argument("--sample", type=int, default=0, help="ambil N kasus acak dari matriks (0 = semua)")
+    parser.add_argument("--cases", action="store_true", help="sertakan waktu per kasus di JSON")
+    parser.add_argument("--json", help="tulis hasil ke file JSON")
+    args = parser.parse_args()
+
+    report = run(args.catalog or [DATASET_PATH], args.runs, args.sample, args.cases)
+    print(f"{'catalog':<10}{'stage':<18}{'n':>5}{'mean ms':>11}{'p50 ms':>11}{'p95 ms':>11}{'max ms':>11}")
+    for entry in report["catalogs"]:
+        for stage, s in entry["stages_ms"].items():
+            print(f"{entry['size']:<10}{stage:<18}{s['n']:>5}{s['mean']:>11}{s['p50']:>11}"
+                  f"{s['p95']:>11}{s['max']:>11}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Generator katalog sintetis: memperbesar `data/fitness_dataset.csv` ke N
+latihan untuk melihat di mana pipeline berhenti scaling.
+
+Baris asli disalin apa adanya, sisanya adalah salinan baris acak dengan
+exercise_id baru, nama bersufiks, dan (sebagian) alat / otot sekunder
+diambil dari latihan lain dengan body part yang sama — distribusi body
+part tetap seperti dataset asli sehingga ukuran pool per fokus ikut
+membesar secara proporsional.
+
+    python -m benchmarks.synth_catalog --size 10000 --size 100000
+"""
+
+from typing import List
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.services.csv_loader import DATASET_PATH
+
+OUT_DIR = "benchmarks/data"
+
+
+def synth_path(size: int, out_dir: str = OUT_DIR) -> str:
+    return os.path.join(out_dir, f"fitness_{size}.csv")
+
+
+def generate(size: int, seed: int = 0, source: str = DATASET_PATH) -> pd.DataFrame:
+    # Dibaca mentah (tanpa parse list) agar kolom multi‑value tetap "a|b"
+    base = pd.read_csv(source, dtype=str, keep_default_na=False)
+    if size <= len(base):
+        return base.iloc[:size].reset_index(drop=True)
+
+    rng = np.random.default_rng(seed)
+    n_extra = size - len(base)
+    extra = base.iloc[rng.integers(0, len(base), size=n_extra)].reset_index(drop=True)
+
+    start_id = int(pd.to_numeric(base["exercise_id"]).max()) + 1
+    extra["exercise_id"] = np.arange(start_id, start_id + n_extra).astype(str)
+    extra["exercise_name"] = extra["exercise_name"] + " #" + (np.arange(n_extra) // len(base) + 1).astype(str)
+
+    # Variasi: alat & otot sekunder dari latihan lain dengan body part sama
+    for col in ("equipment", "secondary_muscle"):
+        swap = rng.random(n_extra) < 0.5
+        for part, donors in base.groupby("body_part")[col]:
+            rows = np.flatnonzero(swap & (extra["body_part"] == part).to_numpy())
+            extra.loc[rows, col] = donors.to_numpy()[rng.integers(0, len(donors), size=len(rows))]
+
+    return pd.concat([base, extra], ignore_index=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, action="append", help="jumlah latihan (boleh berulang)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    args = parser.parse_args()
+
+    sizes: List[int] = args.size or [10_000, 100_000]
+    os.makedirs(args.out_dir, exist_ok=True)
+    for size in sizes:
+        path = synth_path(size, args.out_dir)
+        generate(size, args.seed).to_csv(path, index=False)
+        print(f"{path}: {size} latihan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark warm‑start GA: generasi & waktu per hari, cold vs warm.
+
+Tiap kasus (matriks `benchmarks.stages`) dijalankan `--repeat` kali
+tanpa seed. Run pertama selalu cold (store dikosongkan per kasus); run
+berikutnya memakai elite run sebelumnya. Dicatat per profil × engine:
+  hit_rate      hari warm / semua hari di run ulangan (ke‑2 dst.)
+  generations   rata‑rata generasi selesai per hari (cold vs warm)
+  score         rata‑rata skor solusi terbaik tanpa noise (cold vs warm)
+  ms            rata‑rata waktu `_solve_day` per hari
+
+Butuh GA_WARM_START_SIZE > 0.
+
+    python -m benchmarks.warm_start --catalog benchmarks/data/fitness_10000.csv \\
+        --profile fast --profile balanced --json warm.json
+"""
+
+from typing import Dict, List
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.rules.decision_table import decide
+from app.services import genetic_optimizer as go
+from app.services.csv_loader import DATASET_PATH
+from app.services.elite_store import elite_store
+from app.services.exercise_filter import build_daily_pool, daily_pool_keys
+from benchmarks.stages import cases, load_catalog
+
+
+def _observe(samples: List[Dict], state: Dict[str, int]):
+    """Bungkus `_solve_day` agar tiap hari dicatat (run, start, generasi, skor, ms)."""
+    solve = go._solve_day
+
+    def wrapped(ctx, num_genes, *args, **kwargs):
+        start = time.perf_counter()
+        result = solve(ctx, num_genes, *args, **kwargs)
+        samples.append({
+            "run": state["run"],
+            "start": "warm" if args[4] is not None else "cold",
+            "generations": result.generations,
+            "score": float(go._score_population(ctx, result.best[None, :])[0]),
+            "ms": (time.perf_counter() - start) * 1000,
+        })
+        return result
+
+    return wrapped
+
+
+def run(path: str, profiles: List[str], engines: List[str], repeat: int, sample: int) -> List[Dict]:
+    catalog = load_catalog(path)["catalog"]
+    matrix = cases(sample)
+    results = []
+    solve = go._solve_day
+    try:
+        for profile in profiles:
+            for engine in engines:
+                samples: List[Dict] = []
+                state = {"run": 0}
+                go._solve_day = _observe(samples, state)
+                for case in matrix:
+                    injuries = case["injuries"]
+                    _, schedule = decide(case["gender"], case["bmi"], injuries, case["available_days"], [])
+                    pools = build_daily_pool(schedule, catalog, injuries, case["preferred_equipment"])
+                    keys = daily_pool_keys(schedule, catalog, injuries, case["preferred_equipment"])
+                    elite_store.clear()
+                    for state["run"] in range(repeat):
+                        go.run_ga_schedule(schedule, pools, injured_body_parts=injuries, bmi=case["bmi"],
+                                           catalog=catalog, engine=engine, optimizer="ga", profile=profile,
+                                           pool_keys=keys)
+                go._solve_day = solve
+
+                by_start = {s: [x for x in samples if x["start"] == s] for s in ("cold", "warm")}
+                repeats = sum(1 for x in samples if x["run"] > 0)
+                entry = {"catalog": path, "profile": profile, "engine": engine, "cases": len(matrix),
+                         "hit_rate": round(len(by_start["warm"]) / max(repeats, 1), 3)}
+                for start, rows in by_start.items():
+                    for field in ("generations", "score", "ms"):
+                        values = [r[field] for r in rows]
+                        entry[f"{start}_{field}"] = round(float(np.mean(values)), 3) if values else None
+                results.append(entry)
+    finally:
+        go._solve_day = solve
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog", default=DATASET_PATH, help="CSV katalog")
+    parser.add_argument("--profile", action="append", help="profil GA (boleh berulang; default balanced)")
+    parser.add_argument("--engine", action="append", help="pygad | numpy (boleh berulang; default keduanya)")
+    parser.add_argument("--repeat", type=int, default=5, help="run per kasus; run pertama cold")
+    parser.add_argument("--sample", type=int, default=30, help="ambil N kasus acak dari matriks (0 = semua)")
+    parser.add_argument("--json", help="tulis hasil ke file JSON")
+    args = parser.parse_args()
+
+    if elite_store is None:
+        parser.error("GA_WARM_START_SIZE=0: warm-start nonaktif")
+    results = run(args.catalog, args.profile or ["balanced"], args.engine or ["pygad", "numpy"],
+                  args.repeat, args.sample)
+    print(f"{'profile':<10}{'engine':<8}{'hit':>6}{'gen cold':>10}{'gen warm':>10}"
+          f"{'score cold':>12}{'score warm':>12}{'ms cold':>9}{'ms warm':>9}")
+    for r in results:
+        print(f"{r['profile']:<10}{r['engine']:<8}{r['hit_rate']:>6}{r['cold_generations']:>10}"
+              f"{r['warm_generations']!s:>10}{r['cold_score']:>12}{r['warm_score']!s:>12}"
+              f"{r['cold_ms']:>9}{r['warm_ms']!s:>9}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
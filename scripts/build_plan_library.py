@@ -0,0 +1,164 @@
+"""
+Precompute pustaka rencana (`app.services.plan_library`) secara offline.
+
+Ruang profil yang dienumerasi: gender × band BMI × available_days ×
+subset cedera & preferensi (body part di `muscle_to_body_part`, sampai
+`--max-injuries` / `--max-preferences` item) × set alat (`--equipment`).
+Tiap profil melewati rule engine → `build_daily_pool` → GA dengan
+profil `--profile` (default quality). Hari dengan input GA yang sama
+(fokus, pool, cedera, preferensi, bonus cardio) hanya dioptimasi sekali,
+dengan seed yang diturunkan dari input tersebut, dan dibagi ke semua
+core lewat process pool.
+
+Pustaka ditulis atomik ke `--out` (default PLAN_LIBRARY_PATH /
+<katalog>.plans) dan mencatat versi katalog; worker mengabaikannya
+begitu katalog berubah.
+
+Jalankan dari root repo:
+    python -m scripts.build_plan_library [--profile quality] [--workers N] \\
+        [--max-injuries 1] [--max-preferences 1] [--equipment dumbbell,barbell ...]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, product
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from app.services.exercise_catalog import get_catalog
+from app.services.exercise_filter import build_daily_pool, muscle_to_body_part
+from app.services.genetic_optimizer import GA_PROFILES, prepare_catalog, run_ga_schedule
+from app.services.plan_library import BMI_BANDS, encode_plan, library_path, plan_key, write_library
+from app.services.recommender import run_rules
+
+GENDERS = ("male", "female")
+BODY_PARTS = tuple(sorted(set(muscle_to_body_part.values())))
+# "" = tanpa preferensi alat (semua alat)
+DEFAULT_EQUIPMENT = ("", "dumbbell", "barbell", "cable", "barbell,dumbbell")
+
+# (fokus, pool, cedera, preferensi, bmi wakil) — input GA satu hari
+DayJob = Tuple[str, Tuple[int, ...], Tuple[str, ...], Tuple[str, ...], float]
+
+
+def _subsets(items: Sequence[str], max_size: int) -> List[List[str]]:
+    return [list(c) for k in range(max_size + 1) for c in combinations(items, k)]
+
+
+def profiles(max_injuries: int, max_preferences: int, equipment: Sequence[str]) -> List[Dict]:
+    return [
+        {"gender": g, "bmi": bmi, "available_days": d, "injuries": inj,
+         "preferred_body_part": pref, "preferred_equipment": sorted(filter(None, eq.split(",")))}
+        for g, bmi, d, inj, pref, eq in product(
+            GENDERS, BMI_BANDS.values(), range(1, 6),
+            _subsets(BODY_PARTS, max_injuries), _subsets(BODY_PARTS, max_preferences), equipment,
+        )
+    ]
+
+
+def _job_seed(job: DayJob) -> int:
+    return int.from_bytes(hashlib.sha256(repr(job).encode()).digest()[:4], "big")
+
+
+def _init_worker() -> None:
+    prepare_catalog(get_catalog())
+
+
+def _solve(args: Tuple[DayJob, str, str]) -> List[str]:
+    (focus, rows, injuries, preferred, bmi), profile, engine = args
+    catalog = get_catalog()
+    daywise = run_ga_schedule(
+        {"day": focus}, {"day": np.asarray(rows, dtype=np.int64)},
+        injured_body_parts=list(injuries), preferred_body_parts=list(preferred), bmi=bmi,
+        catalog=catalog, seed=_job_seed(args[0]), parallelism="serial", engine=engine,
+        optimizer="ga", profile=profile,
+    )
+    return [str(e["exercise_id"]) for e in daywise["day"]["exercises"]]
+
+
+def build(profile_list: List[Dict], ga_profile: str, engine: str,
+          workers: int) -> Tuple[Dict[str, str], int]:
+    """Mengembalikan ({plan_key: plan JSON}, jumlah hari unik yang dioptimasi)."""
+    catalog = get_catalog()
+    prepare_catalog(catalog)
+
+    jobs: Dict[DayJob, int] = {}
+    drafts = []               # (profil, split, schedule, {day_key: indeks job})
+    for p in profile_list:
+        split_type, schedule = run_rules(p["gender"], p["bmi"], p["injuries"],
+                                         p["available_days"], p["preferred_body_part"])
+        pools = build_daily_pool(schedule, catalog, p["injuries"], p["preferred_equipment"])
+        days = {}
+        for day_key, focus in schedule.items():
+            rows = pools.get(day_key)
+            if rows is None or len(rows) == 0:
+                continue
+            job = (focus, tuple(int(r) for r in rows),
+                   tuple(sorted({i.lower() for i in p["injuries"]})),
+                   tuple(sorted({b.lower() for b in p["preferred_body_part"]})),
+                   # GA hanya membedakan BMI < 30 (bonus cardio)
+                   BMI_BANDS["ge30"] if p["bmi"] >= 30.0 else BMI_BANDS["lt25"])
+            days[day_key] = jobs.setdefault(job, len(jobs))
+        if days:
+            drafts.append((p, split_type, schedule, days))
+
+    tasks = [(job, ga_profile, engine) for job in jobs]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            solved = list(pool.map(_solve, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+    else:
+        solved = [_solve(t) for t in tasks]
+
+    plans = {}
+    for p, split_type, schedule, days in drafts:
+        key = plan_key(p["gender"], p["bmi"], p["available_days"], p["injuries"],
+                       p["preferred_body_part"], p["preferred_equipment"])
+        plans[key] = encode_plan(split_type, schedule, {k: solved[j] for k, j in days.items()})
+    return plans, len(jobs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", help="path pustaka (default: PLAN_LIBRARY_PATH / <katalog>.plans)")
+    parser.add_argument("--profile", default="quality", choices=sorted(GA_PROFILES))
+    # numpy ~15× lebih cepat dari pygad untuk profil quality; operator & stop criterion
+    # sama, tetapi rencana per seed berbeda (RNG berbeda)
+    parser.add_argument("--engine", default="numpy", choices=("pygad", "numpy"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-injuries", type=int, default=1, help="ukuran subset cedera maksimum")
+    parser.add_argument("--max-preferences", type=int, default=1, help="ukuran subset preferensi maksimum")
+    parser.add_argument("--equipment", action="append",
+                        help='set alat dipisah koma, "" = tanpa preferensi (boleh berulang)')
+    args = parser.parse_args(argv)
+
+    catalog = get_catalog()
+    out = args.out or library_path()
+    profile_list = profiles(args.max_injuries, args.max_preferences, args.equipment or DEFAULT_EQUIPMENT)
+
+    start = time.perf_counter()
+    plans, n_jobs = build(profile_list, args.profile, args.engine, args.workers)
+    elapsed = time.perf_counter() - start
+
+    meta = {
+        "catalog_version": catalog.version,
+        "catalog_rows": str(catalog.size),
+        "ga_profile": args.profile,
+        "engine": args.engine,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "space": json.dumps({"max_injuries": args.max_injuries, "max_preferences": args.max_preferences,
+                             "equipment": args.equipment or list(DEFAULT_EQUIPMENT)}),
+    }
+    count = write_library(out, meta, sorted(plans.items()))
+    print(f"{out}: {count} rencana dari {len(profile_list)} profil, {n_jobs} hari unik dioptimasi "
+          f"({args.profile}, {args.engine}, {args.workers} worker), "
+          f"{os.path.getsize(out) / 1024:.1f} KiB, {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Cek ekuivalensi decision table (`app.rules.decision_table.decide`) dengan
+engine experta (`FitnessRuleEngine`) di seluruh ruang input yang
+memengaruhi hasil:
+
+  gender (male/female/lainnya, beda kapital) × bmi di sekitar ambang 25 ×
+  available_days 0–6 × semua subset cedera × semua subset preferensi
+  (termasuk item di luar opsi fokus, yang hanya mengubah "preferensi
+  kosong / tidak").
+
+Jalankan dari root repo:
+    python -m scripts.check_rule_table
+Exit code 1 jika ada perbedaan.
+"""
+
+from itertools import chain, combinations
+from typing import Iterator, List, Tuple
+import sys
+import time
+
+from app.rules.decision_table import FEMALE_FOCUS_OPTIONS, MALE_FOCUS_OPTIONS, decide
+from app.rules.rule_engine import FitnessRuleEngine, UserInput
+
+GENDERS = ("male", "female", "Female", "MALE", "unknown")
+BMIS = (18.0, 24.99, 25.0, 31.5)
+EXTRA_ITEM = "calves"      # body part valid tapi bukan opsi fokus
+
+
+def _subsets(items) -> Iterator[List[str]]:
+    return (list(c) for c in chain.from_iterable(
+        combinations(items, r) for r in range(len(items) + 1)))
+
+
+def _experta(gender, bmi, injuries, days, preferred) -> Tuple[str, dict]:
+    engine = FitnessRuleEngine()
+    engine.reset()
+    engine.declare(UserInput(
+        gender=gender, bmi=bmi, injuries=injuries,
+        available_days=days, preferred_body_part=preferred,
+    ))
+    engine.run()
+    split, schedule = engine.get_result()
+    return split, dict(schedule)
+
+
+def _cases():
+    for gender in GENDERS:
+        options = FEMALE_FOCUS_OPTIONS if gender.lower() == "female" else MALE_FOCUS_OPTIONS
+        for bmi in BMIS:
+            # Ranking fokus hanya dipakai di 5 hari; hari lain cukup sampel list
+            for days in (0, 1, 2, 3, 4, 6):
+                for injuries, preferred in (([], []), (list(options[:2]), [options[-1]])):
+                    yield gender, bmi, injuries, days, preferred
+            for injuries in _subsets(options):
+                for preferred in _subsets(options):
+                    yield gender, bmi, injuries, 5, preferred
+                    yield gender, bmi, injuries, 5, preferred + [EXTRA_ITEM]
+
+
+def main() -> int:
+    start = time.perf_counter()
+    checked, mismatches = 0, []
+    for case in _cases():
+        checked += 1
+        expected, actual = _experta(*case), decide(*case)
+        if expected != actual:
+            mismatches.append((case, expected, actual))
+
+    for case, expected, actual in mismatches[:20]:
+        print(f"MISMATCH {case}: experta={expected} table={actual}")
+    print(f"{checked} cases, {len(mismatches)} mismatches "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
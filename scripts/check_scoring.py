@@ -0,0 +1,108 @@
+"""
+Cek fitness vektor (`_score_population`, `_score_completions`) terhadap
+fitness skalar referensi (`_make_fitness_func`, per solusi lewat
+DataFrame pool).
+
+Ruang yang dicek: gender × BMI (di bawah/di atas ambang cardio 30) ×
+available_days 1–5 × beberapa set cedera & preferensi. Untuk tiap pool
+harian dinilai solusi acak tanpa gene kembar, solusi dengan gene kembar
+(penalti duplikat body part), dan untuk `_score_completions` satu set
+latihan tetap + semua kandidat pool sekaligus.
+
+Jalankan dari root repo:
+    python -m scripts.check_scoring [--solutions 40]
+Exit code 1 jika ada skor yang berbeda.
+"""
+
+from itertools import product
+from typing import Iterator, List, Tuple
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.rules.decision_table import decide
+from app.services.exercise_catalog import get_catalog
+from app.services.exercise_filter import build_daily_pool
+from app.services.genetic_optimizer import (
+    _build_pool_context, _make_fitness_func, _score_completions, _score_population, day_gene_count,
+)
+
+GENDERS = ("male", "female")
+BMIS = (21.0, 29.9, 30.0, 34.0)
+DAYS = (1, 2, 3, 4, 5)
+INJURIES = ([], ["back"], ["knee", "shoulders"])
+PREFERENCES = ([], ["chest"], ["glutes", "biceps"])
+
+
+class _Generation:
+    """Pengganti ga_instance: generasi > 0 agar fitness skalar tanpa noise."""
+    generations_completed = 1
+
+
+def _cases() -> Iterator[Tuple[str, float, List[str], int, List[str]]]:
+    for gender, bmi, days in product(GENDERS, BMIS, DAYS):
+        for injuries, preferred in ((INJURIES[0], PREFERENCES[0]), (INJURIES[1], PREFERENCES[1]),
+                                    (INJURIES[2], PREFERENCES[2])):
+            yield gender, bmi, injuries, days, preferred
+
+
+def _solutions(rng: np.random.Generator, pool_size: int, num_genes: int, n: int) -> np.ndarray:
+    unique = [rng.permutation(pool_size)[:num_genes] for _ in range(n)] if pool_size >= num_genes else []
+    repeated = [rng.integers(0, pool_size, size=num_genes) for _ in range(max(1, n // 4))]
+    return np.array(unique + repeated, dtype=np.int64)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--solutions", type=int, default=40, help="solusi acak per pool harian")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    catalog = get_catalog()
+    rng = np.random.default_rng(0)
+    checked, mismatches = 0, []
+    for case in _cases():
+        gender, bmi, injuries, days, preferred = case
+        _, schedule = decide(gender, bmi, injuries, days, preferred)
+        pools = build_daily_pool(schedule, catalog, injuries, [])
+        injured, liked = set(injuries), set(preferred)
+        for day_key, rows in pools.items():
+            if len(rows) == 0:
+                continue
+            focus = schedule[day_key]
+            num_genes = day_gene_count(focus, liked)
+            ctx = _build_pool_context(focus, injured, catalog, rows, liked, bmi)
+            scalar = _make_fitness_func(focus, injured, pd.DataFrame(catalog.records(rows)), liked, bmi)
+
+            population = _solutions(rng, len(rows), num_genes, args.solutions)
+            vector = _score_population(ctx, population)
+            for solution, score in zip(population, vector):
+                checked += 1
+                expected = scalar(_Generation, solution, 0)
+                if not np.isclose(score, expected):
+                    mismatches.append((case, focus, "population", solution.tolist(), expected, score))
+
+            if len(rows) < num_genes:
+                continue
+            fixed = population[0][:num_genes - 1]
+            candidates = np.setdiff1d(np.arange(len(rows)), fixed)
+            completions = _score_completions(ctx, fixed, candidates)
+            for candidate, score in zip(candidates, completions):
+                checked += 1
+                expected = scalar(_Generation, np.append(fixed, candidate), 0)
+                if not np.isclose(score, expected):
+                    mismatches.append((case, focus, "completion", fixed.tolist() + [int(candidate)],
+                                       expected, score))
+
+    for case, focus, kind, solution, expected, actual in mismatches[:20]:
+        print(f"MISMATCH {case} {focus} {kind} {solution}: skalar={expected} vektor={actual}")
+    print(f"{checked} solutions, {len(mismatches)} mismatches "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
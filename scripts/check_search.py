@@ -0,0 +1,102 @@
+"""
+Cek optimizer exact (`_branch_and_bound`) terhadap brute force: skor
+terbaik hasil branch‑and‑bound harus sama dengan maksimum
+`_score_population` atas semua kombinasi pool.
+
+Pool diambil dari rule engine → `build_daily_pool` untuk beberapa profil
+(gender × BMI × available_days × cedera/preferensi). Pool yang terlalu
+besar untuk brute force diganti sub‑pool acak, agar tiap fokus tetap
+tercakup. Tiap pool dicek dua kali: dengan incumbent local search (seperti
+`_search_day`) dan dengan incumbent lemah (kombinasi pertama), sehingga
+pemangkasan juga diuji saat hampir tidak ada yang bisa dipangkas.
+
+Jalankan dari root repo:
+    python -m scripts.check_search [--max-combinations 200000]
+Exit code 1 jika branch‑and‑bound tidak menemukan optimum.
+"""
+
+from itertools import combinations, product
+from math import comb
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.rules.decision_table import decide
+from app.services.exercise_catalog import get_catalog
+from app.services.exercise_filter import build_daily_pool
+from app.services.genetic_optimizer import (
+    _branch_and_bound, _build_pool_context, _local_search, _score_population, day_gene_count,
+)
+
+GENDERS = ("male", "female")
+BMIS = (22.0, 32.0)
+DAYS = (1, 3, 5)
+PROFILES = (([], []), (["back"], ["chest"]), (["knee"], ["glutes", "biceps"]))
+
+
+def _brute_force(ctx, num_genes: int) -> float:
+    best = -np.inf
+    # per blok agar memori tetap kecil
+    block = []
+    for combo in combinations(range(len(ctx.code)), num_genes):
+        block.append(combo)
+        if len(block) == 50_000:
+            best = max(best, float(_score_population(ctx, np.array(block)).max()))
+            block = []
+    if block:
+        best = max(best, float(_score_population(ctx, np.array(block)).max()))
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-combinations", type=int, default=200_000,
+                        help="pool lebih besar diganti sub‑pool acak seukuran ini")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    catalog = get_catalog()
+    rng = np.random.default_rng(0)
+    checked, failures, seen = 0, [], set()
+    for gender, bmi, days, (injuries, preferred) in product(GENDERS, BMIS, DAYS, PROFILES):
+        _, schedule = decide(gender, bmi, injuries, days, preferred)
+        pools = build_daily_pool(schedule, catalog, injuries, [])
+        injured, liked = set(injuries), set(preferred)
+        for day_key, rows in pools.items():
+            focus = schedule[day_key]
+            num_genes = day_gene_count(focus, liked)
+            if len(rows) < num_genes:
+                continue
+            size = len(rows)
+            while comb(size, num_genes) > args.max_combinations:
+                size -= 1
+            if size < len(rows):
+                rows = np.sort(rng.choice(rows, size=size, replace=False))
+            key = (focus, bmi < 30.0, frozenset(injured), frozenset(liked), tuple(rows.tolist()))
+            if key in seen:
+                continue
+            seen.add(key)
+
+            ctx = _build_pool_context(focus, injured, catalog, rows, liked, bmi)
+            optimum = _brute_force(ctx, num_genes)
+            local, local_score = _local_search(ctx, num_genes)
+            weak = np.arange(num_genes)
+            weak_score = float(_score_population(ctx, weak[None, :])[0])
+            for name, incumbent, score in (("local", local, local_score), ("weak", weak, weak_score)):
+                checked += 1
+                _, found = _branch_and_bound(ctx, num_genes, incumbent, score)
+                if found != optimum:
+                    failures.append((gender, bmi, days, focus, len(rows), name, optimum, found))
+
+    for gender, bmi, days, focus, size, name, optimum, found in failures[:20]:
+        print(f"FAIL {gender} bmi={bmi} days={days} {focus} pool={size} incumbent={name}: "
+              f"brute force={optimum} branch‑and‑bound={found}")
+    print(f"{checked} searches over {len(seen)} pools, {len(failures)} failures "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Kompilasi CSV katalog latihan ke artefak biner (`app.services.catalog_binary`).
+
+Artefak ditulis atomik di samping CSV (<nama>.frscat) kecuali `--out`
+diberikan, lalu dibaca balik dan dicek sama persis dengan hasil parse
+CSV — baik sebagai DataFrame maupun sebagai `BinaryCatalog` (indeks,
+exercise_id, record, dan kolom sama dengan `ExerciseCatalog` dari CSV).
+Worker memakai artefak otomatis selama hash CSV sumber cocok.
+
+Jalankan dari root repo:
+    python -m scripts.compile_catalog [data/fitness_dataset.csv] [--out path]
+Exit code 1 jika hasil baca balik berbeda.
+"""
+
+from typing import List
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.catalog_binary import CompiledCatalog, compile_csv
+from app.services.csv_loader import DATASET_PATH, binary_path, read_exercises
+from app.services.exercise_catalog import BinaryCatalog, ExerciseCatalog
+
+
+def _same_index(a, b) -> bool:
+    return a.keys() == b.keys() and all(np.array_equal(a[k], b[k]) for k in a)
+
+
+def catalog_differences(binary: ExerciseCatalog, parsed: ExerciseCatalog) -> List[str]:
+    """Bagian `BinaryCatalog` yang berbeda dengan `ExerciseCatalog` dari DataFrame."""
+    out = []
+    if binary.body_part_names != parsed.body_part_names or not np.array_equal(binary.body_code, parsed.body_code):
+        out.append("body_code")
+    for name in ("body_part_index", "focus_index", "equipment_index"):
+        if not _same_index(getattr(binary, name), getattr(parsed, name)):
+            out.append(name)
+    if binary.exercise_ids(binary.all_rows) != parsed.exercise_ids(parsed.all_rows):
+        out.append("exercise_ids")
+    # NaN != NaN: bandingkan lewat DataFrame
+    if not pd.DataFrame(binary.records(binary.all_rows)).equals(pd.DataFrame(parsed.records(parsed.all_rows))):
+        out.append("records")
+    for column in parsed.df.columns:
+        if not pd.Series(binary.column(column), dtype=object).equals(pd.Series(parsed.column(column), dtype=object)):
+            out.append(f"column {column}")
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("csv", nargs="?", default=DATASET_PATH)
+    parser.add_argument("--out", help="path artefak (default: CATALOG_BINARY_PATH / <csv>.frscat)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    out = compile_csv(args.csv, args.out or binary_path(args.csv))
+    elapsed = time.perf_counter() - start
+
+    compiled = CompiledCatalog(out)
+    df = read_exercises(args.csv)
+    if not compiled.to_dataframe().equals(df):
+        print(f"{out}: hasil baca balik berbeda dengan {args.csv}")
+        return 1
+    diff = catalog_differences(BinaryCatalog(compiled), ExerciseCatalog(df))
+    if diff:
+        print(f"{out}: BinaryCatalog berbeda dengan katalog dari CSV: {', '.join(diff)}")
+        return 1
+    print(f"{out}: {compiled.rows} latihan, versi {compiled.version}, "
+          f"{os.path.getsize(out) / 1024:.1f} KiB (CSV {os.path.getsize(args.csv) / 1024:.1f} KiB), "
+          f"{elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Laporan waktu impor (`python -X importtime`) untuk cold start.
+
+Modul target diimpor di proses Python baru; hasilnya diringkas per
+modul (kumulatif & self) dan per paket top‑level, plus daftar
+dependensi berat yang ikut termuat. Dependensi di luar jalur serving
+(pygad/matplotlib, experta, pandas di proses utama bila GA_WORKERS > 0)
+seharusnya tidak muncul di sini — semuanya dimuat saat warm‑up.
+
+Jalankan dari root repo:
+    python -m scripts.import_report [--module app.main] [--top 20] [--json out.json]
+"""
+
+from typing import Dict, List
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY = ("pandas", "numpy", "pygad", "matplotlib", "experta", "scipy")
+
+
+def measure(module: str) -> List[Dict]:
+    """Baris importtime: nama, self_us, cumulative_us, depth (0 = impor langsung)."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return rows
+
+
+def summarize(rows: List[Dict], top: int) -> Dict:
+    packages: Dict[str, int] = {}
+    for r in rows:
+        root = r["module"].split(".")[0]
+        packages[root] = packages.get(root, 0) + r["self_us"]
+    loaded = {r["module"] for r in rows}
+    return {
+        "total_ms": round(sum(r["self_us"] for r in rows) / 1000, 1),
+        "modules": len(rows),
+        "heavy_loaded": [m for m in HEAVY if m in loaded],
+        "by_package_ms": {k: round(v / 1000, 1)
+                          for k, v in sorted(packages.items(), key=lambda kv: -kv[1])[:top]},
+        "top_cumulative": sorted(rows, key=lambda r: -r["cumulative_us"])[:top],
+        "top_self": sorted(rows, key=lambda r: -r["self_us"])[:top],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", help="tulis ringkasan ke file JSON")
+    args = parser.parse_args()
+
+    report = summarize(measure(args.module), args.top)
+    print(f"import {args.module}: {report['total_ms']} ms, {report['modules']} modul")
+    print(f"dependensi berat termuat: {', '.join(report['heavy_loaded']) or '-'}\n")
+    print(f"{'paket':<28}{'self ms':>10}")
+    for name, ms in report["by_package_ms"].items():
+        print(f"{name:<28}{ms:>10}")
+    print(f"\n{'modul (kumulatif)':<48}{'cum ms':>10}{'self ms':>10}")
+    for r in report["top_cumulative"]:
+        print(f"{r['module']:<48}{r['cumulative_us'] / 1000:>10.1f}{r['self_us'] / 1000:>10.1f}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"module": args.module, **report}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()